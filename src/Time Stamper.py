@@ -1,6 +1,8 @@
 #-*- coding: utf-8 -*-
 """A person who wants to run the Time Stamper program should execute this script in Python 3."""
 
+from multiprocessing import freeze_support
+
 from classes import time_stamper
 
 # Time Stamper: Run a timer and write automatically timestamped notes.
@@ -21,4 +23,8 @@ from classes import time_stamper
 
 # Contact: github.cqrde@simplelogin.com
 
-time_stamper.run()
+# Only run the program from the main process (output files may be parsed in
+# separate processes, which import this script without running the program).
+if __name__ == "__main__":
+    freeze_support()
+    time_stamper.run()
@@ -0,0 +1,84 @@
+#-*- coding: utf-8 -*-
+"""This script runs the benchmarks for the Time Stamper program. It does not open any windows,
+so it can be run without a display. Run it from the folder containing "Time Stamper.py":
+
+    python -m benchmarks                         (run every benchmark and print the results)
+    python -m benchmarks --save NAME             (also save the results as the baseline NAME)
+    python -m benchmarks --compare NAME          (compare the results against the baseline NAME)
+    python -m benchmarks --filter timing.        (only run benchmarks whose names contain this)
+
+When comparing against a baseline, this script exits with a status of 1 if any benchmark is
+more than --threshold (10% by default) slower than in the baseline. Baselines are saved in
+the "baselines" folder next to this script (which git ignores, since baselines are specific
+to a machine) and should be recorded on the same machine that they are later compared on."""
+
+from argparse import ArgumentParser
+from sys import exit as sys_exit
+
+from benchmarks import benchmarks_runner
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+def main():
+    """This method parses the command line arguments, runs the requested
+    benchmarks and prints (and potentially saves) their results."""
+
+    parser = ArgumentParser(prog="python -m benchmarks", \
+        description="Run the benchmarks for the Time Stamper program.")
+    parser.add_argument("--filter", default="", \
+        help="only run the benchmarks whose names contain this text")
+    parser.add_argument("--repeat", type=int, default=5, \
+        help="the number of times to time each benchmark (5 by default)")
+    parser.add_argument("--save", metavar="NAME", help="save the results as the baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", \
+        help="compare the results against the baseline NAME")
+    parser.add_argument("--threshold", type=float, default=10.0, \
+        help="the percentage by which a benchmark must be slower to count as a regression")
+    args = parser.parse_args()
+
+    # Load the baseline to compare against before running anything, in case it does not exist.
+    baseline = None
+    if args.compare:
+        baseline = benchmarks_runner.load_baseline(args.compare)
+        if baseline is None:
+            parser.error(f"there is no baseline named \"{args.compare}\"")
+
+    # Run the benchmarks.
+    results = benchmarks_runner.run_benchmarks(args.filter, args.repeat, \
+        lambda name: print(f"Running {name}...", flush=True))
+    if not results:
+        parser.error(f"no benchmarks match \"{args.filter}\"")
+
+    # Print the results (compared against the baseline if one was requested).
+    report, regressions = benchmarks_runner.compare_results(\
+        results, baseline, args.threshold / 100)
+    print()
+    print(report)
+
+    # Save the results as a baseline if requested.
+    if args.save:
+        print(f"\nSaved the baseline \"{args.save}\" to " \
+            f"{benchmarks_runner.save_baseline(args.save, results)}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys_exit(main())
@@ -0,0 +1,105 @@
+#-*- coding: utf-8 -*-
+"""This module contains the benchmarks for reading and reconciling output files."""
+
+from os.path import join
+
+from benchmarks import benchmarks_timing
+import methods.macros.methods_macros_output as methods_output
+import methods.output.methods_output_merge as methods_merge
+from methods.timing import methods_timing_helper
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The number of notes in the output file that store_timestamper_output reads.
+OUTPUT_NOTE_COUNT = 5000
+
+
+def write_output_file(temp_dir):
+    """This method writes an output file with a header line and OUTPUT_NOTE_COUNT notes (every
+    tenth of which spans two lines) to temp_dir and returns the path to that output file."""
+
+    file_path = join(temp_dir, "benchmark_output.txt")
+    timestamps = benchmarks_timing.make_timestamps()
+
+    with open(file_path, "w", encoding="utf-8") as out_file:
+        out_file.write("Benchmark output file\n")
+        for i in range(OUTPUT_NOTE_COUNT):
+            out_file.write(f"{timestamps[i % len(timestamps)]} Note number {i}.\n")
+            if i % 10 == 0:
+                out_file.write("A second line belonging to the same note.\n")
+
+    return file_path
+
+
+def bench_make_timestamp_formats_consistent(*_):
+    """make_timestamp_formats_consistent for timestamps of mixed precision."""
+
+    original_h_m_s = [methods_timing_helper.timestamp_to_h_m_s(timestamp, pad=2) \
+        for timestamp in benchmarks_timing.make_timestamps()]
+
+    def run():
+        methods_output.make_timestamp_formats_consistent(\
+            [list(h_m_s) for h_m_s in original_h_m_s])
+
+    return run, len(original_h_m_s)
+
+
+def bench_store_timestamper_output(temp_dir):
+    """store_timestamper_output for an output file of OUTPUT_NOTE_COUNT notes."""
+
+    file_path = write_output_file(temp_dir)
+
+    def run():
+        methods_output.store_timestamper_output([file_path])
+
+    return run, OUTPUT_NOTE_COUNT
+
+
+def bench_merge_output_files(temp_dir):
+    """merge_output_files for two copies of an output file of OUTPUT_NOTE_COUNT notes."""
+
+    file_path = write_output_file(temp_dir)
+    destination_path = join(temp_dir, "benchmark_merged.txt")
+
+    def run():
+        methods_merge.merge_output_files([file_path, file_path], destination_path)
+
+    return run, OUTPUT_NOTE_COUNT * 2
+
+
+def bench_stream_merge_output_files(temp_dir):
+    """stream_merge_output_files (the heap merge that merge_output_files uses for output files
+    too large to sort in memory) for two copies of an output file of OUTPUT_NOTE_COUNT notes."""
+
+    file_path = write_output_file(temp_dir)
+    destination_path = join(temp_dir, "benchmark_merged.txt")
+
+    def run():
+        methods_merge.stream_merge_output_files([file_path, file_path], destination_path)
+
+    return run, OUTPUT_NOTE_COUNT * 2
+
+
+# The benchmarks in this module, by name (see BENCHMARKS in benchmarks_timing).
+BENCHMARKS = {
+    "output.make_timestamp_formats_consistent": bench_make_timestamp_formats_consistent,
+    "output.store_timestamper_output": bench_store_timestamper_output,
+    "output.merge_output_files": bench_merge_output_files,
+    "output.stream_merge_output_files": bench_stream_merge_output_files
+}
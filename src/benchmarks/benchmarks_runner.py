@@ -0,0 +1,171 @@
+#-*- coding: utf-8 -*-
+"""This module contains methods for running benchmarks, saving their
+results as baselines and comparing later results against those baselines."""
+
+from datetime import datetime
+from json import dump, load
+from os import makedirs
+from os.path import dirname, exists, join
+from platform import platform, python_version
+from statistics import median
+from tempfile import TemporaryDirectory
+from timeit import Timer
+
+import classes
+from benchmarks import benchmarks_output, benchmarks_timing
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+def get_benchmarks(name_filter=""):
+    """This method returns every benchmark whose name contains name_filter, by name."""
+
+    all_benchmarks = {**benchmarks_timing.BENCHMARKS, **benchmarks_output.BENCHMARKS}
+    return {name: setup for name, setup in all_benchmarks.items() if name_filter in name}
+
+
+def get_baseline_path(baseline_name):
+    """This method returns the path to the baseline file for the baseline named baseline_name."""
+
+    return join(dirname(__file__), "baselines", f"{baseline_name}.json")
+
+
+def use_default_settings():
+    """This method makes the program use its default settings (without saving them), so that
+    the results of the benchmarks do not depend on the settings of the person running them."""
+
+    classes.settings.user = classes.settings.load_json(classes.settings.default_json_path)
+    classes.timestamp_formatter.compile()
+
+
+def time_benchmark(setup, temp_dir, repeat):
+    """This method sets up and times a single benchmark. The benchmark is called enough times
+    in a row to take at least 0.2 seconds, and this is repeated repeat times. A dictionary
+    holding the shortest and the median time per operation (in seconds) over those repeats,
+    along with the number of calls in each repeat, is returned."""
+
+    run, operations = setup(temp_dir)
+    timer = Timer(run)
+
+    # Find a number of calls that takes long enough to be timed reliably.
+    number, _ = timer.autorange()
+    timings = [total / (number * operations) for total in timer.repeat(repeat, number)]
+
+    return {"min": min(timings), "median": median(timings), "number": number}
+
+
+def run_benchmarks(name_filter="", repeat=5, progress_callback=None):
+    """This method runs every benchmark whose name contains name_filter and returns their results
+    by name (see time_benchmark). If progress_callback is provided, it is called with the name
+    of each benchmark before that benchmark runs."""
+
+    use_default_settings()
+    results = {}
+
+    with TemporaryDirectory() as temp_dir:
+        for name, setup in get_benchmarks(name_filter).items():
+            if progress_callback is not None:
+                progress_callback(name)
+            results[name] = time_benchmark(setup, temp_dir, repeat)
+
+    return results
+
+
+def save_baseline(baseline_name, results):
+    """This method saves results (as returned by run_benchmarks) as the baseline named
+    baseline_name, along with a description of the machine that they were recorded on."""
+
+    baseline_path = get_baseline_path(baseline_name)
+    makedirs(dirname(baseline_path), exist_ok=True)
+
+    baseline = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": python_version(),
+        "platform": platform(),
+        "results": results
+    }
+
+    with open(baseline_path, "w", encoding="utf-8") as baseline_file:
+        dump(baseline, baseline_file, indent=4)
+
+    return baseline_path
+
+
+def load_baseline(baseline_name):
+    """This method loads the baseline named baseline_name, or returns None if it does not exist."""
+
+    baseline_path = get_baseline_path(baseline_name)
+    if not exists(baseline_path):
+        return None
+
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        return load(baseline_file)
+
+
+def format_time(seconds):
+    """This method formats a time per operation in seconds using a readable unit."""
+
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def compare_results(results, baseline, threshold=0.1):
+    """This method compares results (as returned by run_benchmarks) against baseline (as returned
+    by load_baseline) and returns a tuple of the form (report, regressions), where report is a
+    printable table and regressions is a list of the names of the benchmarks whose shortest time
+    is more than threshold (a fraction) slower than in the baseline. If baseline is None, the
+    report only lists the results. Shortest times are compared because they are the least
+    affected by anything else running on the machine at the same time."""
+
+    baseline_results = baseline["results"] if baseline is not None else {}
+    name_width = max((len(name) for name in results), default=0)
+    regressions = []
+
+    header = f"{'benchmark':<{name_width}}  {'min':>10}  {'median':>10}"
+    if baseline is not None:
+        header = f"{header}  {'baseline':>10}  {'change':>8}"
+    lines = [header, "-" * len(header)]
+
+    for name, result in results.items():
+
+        line = f"{name:<{name_width}}  {format_time(result['min']):>10}  " \
+            f"{format_time(result['median']):>10}"
+
+        # Compare against the baseline if the baseline includes this benchmark.
+        if name in baseline_results:
+            change = result["min"] / baseline_results[name]["min"] - 1
+            line = f"{line}  {format_time(baseline_results[name]['min']):>10}  {change:>+8.1%}"
+            if change > threshold:
+                regressions.append(name)
+                line = f"{line}  SLOWER"
+        elif baseline is not None:
+            line = f"{line}  {'(new)':>10}"
+
+        lines.append(line)
+
+    # Describe the baseline that the results were compared against.
+    if baseline is not None:
+        lines.append("")
+        lines.append(f"Baseline recorded {baseline['created']} with Python {baseline['python']} "
+            f"on {baseline['platform']}.")
+        lines.append(f"{len(regressions)} benchmark(s) more than {threshold:.0%} slower.")
+
+    return "\n".join(lines), regressions
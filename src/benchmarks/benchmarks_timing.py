@@ -0,0 +1,164 @@
+#-*- coding: utf-8 -*-
+"""This module contains the benchmarks for the timestamp helpers in methods_timing_helper
+and for the timer's core (run headlessly on a virtual clock)."""
+
+from random import Random
+
+from classes.timing.schedulers import TimeStamperVirtualScheduler
+from classes.timing.timer_core import TimeStamperTimerCore
+from methods.timing import methods_timing_helper
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The number of inputs that each benchmark in this module runs through per call.
+BATCH_SIZE = 1000
+
+
+def make_seconds():
+    """This method returns BATCH_SIZE times in seconds (with centisecond precision) spread
+    across the range of the timer. The same times are returned every time this is called."""
+
+    random = Random(0)
+    return [random.randrange(36000000) / 100 for _ in range(BATCH_SIZE)]
+
+
+def make_timestamps():
+    """This method returns BATCH_SIZE timestamps in the formats that appear in output files
+    (with and without hours and with zero, one or two subsecond digits)."""
+
+    timestamps = []
+    for i, seconds in enumerate(make_seconds()):
+        timestamps.append(methods_timing_helper.seconds_to_timestamp(seconds, pad=2, \
+            force_include_hours=i % 2 == 0, include_subseconds=i % 3 != 0))
+    return timestamps
+
+
+def bench_seconds_to_h_m_s(*_):
+    """seconds_to_h_m_s with padding, as the timer uses it to display the time."""
+
+    seconds_list = make_seconds()
+
+    def run():
+        for seconds in seconds_list:
+            methods_timing_helper.seconds_to_h_m_s(seconds, pad=2)
+
+    return run, BATCH_SIZE
+
+
+def bench_seconds_to_timestamp(*_):
+    """seconds_to_timestamp without subseconds, as the media time labels use it."""
+
+    seconds_list = make_seconds()
+
+    def run():
+        for seconds in seconds_list:
+            methods_timing_helper.seconds_to_timestamp(seconds, pad=2, \
+                force_include_hours=False, include_subseconds=False, include_brackets=False)
+
+    return run, BATCH_SIZE
+
+
+def bench_h_m_s_to_timestamp(*_):
+    """h_m_s_to_timestamp for padded values, with and without hours."""
+
+    h_m_s_list = [methods_timing_helper.seconds_to_h_m_s(seconds, pad=2) \
+        for seconds in make_seconds()]
+    for i, h_m_s in enumerate(h_m_s_list):
+        if i % 2:
+            h_m_s[0] = None
+
+    def run():
+        for h_m_s in h_m_s_list:
+            methods_timing_helper.h_m_s_to_timestamp(*h_m_s)
+
+    return run, BATCH_SIZE
+
+
+def bench_timestamp_to_h_m_s(*_):
+    """timestamp_to_h_m_s with padding, as it is used to read the timestamps of notes."""
+
+    timestamps = make_timestamps()
+
+    def run():
+        for timestamp in timestamps:
+            methods_timing_helper.timestamp_to_h_m_s(timestamp, pad=2, pad_subseconds=False)
+
+    return run, BATCH_SIZE
+
+
+def bench_pad_number(*_):
+    """pad_number padding before and after, as it is used for the timer's time fields."""
+
+    numbers = [str(number % 100) for number in range(BATCH_SIZE)]
+
+    def run():
+        for number in numbers:
+            methods_timing_helper.pad_number(number, 2, True)
+            methods_timing_helper.pad_number(number, 2, False)
+
+    return run, BATCH_SIZE * 2
+
+
+def bench_modify_subsecond_representation(*_):
+    """modify_subsecond_representation for every rounding setting."""
+
+    subseconds_list = [f"{number % 100:02d}" for number in range(BATCH_SIZE)]
+
+    def run():
+        for subseconds in subseconds_list:
+            methods_timing_helper.modify_subsecond_representation(subseconds, "second")
+            methods_timing_helper.modify_subsecond_representation(subseconds, "decisecond")
+            methods_timing_helper.modify_subsecond_representation(subseconds, "centisecond")
+
+    return run, BATCH_SIZE * 3
+
+
+def bench_simulated_session(*_):
+    """A headless playback session on a virtual clock: playing, skipping, fast-forwarding,
+    rewinding and pausing through 30 seconds of timer time at a display refresh rate of 60."""
+
+    def run():
+        scheduler = TimeStamperVirtualScheduler(lateness_ms=1)
+        timer = TimeStamperTimerCore(scheduler, max_time=600.0, display_refresh_rate=60)
+
+        timer.start(1.0)
+        scheduler.advance(10000)
+        timer.adjust_timer(30)
+        timer.start(4.0)
+        scheduler.advance(2500)
+        timer.start(-2.0)
+        scheduler.advance(5000)
+        timer.pause(play_delay=0.5)
+        scheduler.advance(5000)
+        timer.pause()
+
+    return run, 1
+
+
+# The benchmarks in this module, by name. Each benchmark is set up by calling it with a temporary
+# directory and returns the function to time along with the number of operations it performs.
+BENCHMARKS = {
+    "timing.seconds_to_h_m_s": bench_seconds_to_h_m_s,
+    "timing.seconds_to_timestamp": bench_seconds_to_timestamp,
+    "timing.h_m_s_to_timestamp": bench_h_m_s_to_timestamp,
+    "timing.timestamp_to_h_m_s": bench_timestamp_to_h_m_s,
+    "timing.pad_number": bench_pad_number,
+    "timing.modify_subsecond_representation": bench_modify_subsecond_representation,
+    "timing.simulated_session": bench_simulated_session
+}
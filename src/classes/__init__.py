@@ -20,17 +20,33 @@ will be used throughout the Time Stamper program."""
 
 # Contact: github.cqrde@simplelogin.com
 
+import classes.startup_report
 import classes.settings.settings
 import classes.template.template
 import classes.widgets.widgets
 import classes.timing.timing
+import classes.timing.timestamp_formatter
 import classes.macros.macros
+import classes.output.output
+import classes.output.log_view
+import classes.output.timestamp_index
+import classes.media.player_pool
+import classes.media.media_probe
+import classes.media.media_cache
 import classes.time_stamper
 
+startup_report = classes.startup_report.TimeStamperStartupReport()
 settings = classes.settings.settings.TimeStamperSettings()
 template = classes.template.template.TimeStamperTemplate()
 widgets = classes.widgets.widgets.Widgets()
 timer = classes.timing.timing.TimeStamperTimer()
+timestamp_formatter = classes.timing.timestamp_formatter.TimeStamperTimestampFormatter()
 macros = classes.macros.macros.Macros()
+output_writer = classes.output.output.TimeStamperOutputWriter()
+log_view = classes.output.log_view.TimeStamperLogView()
+timestamp_index = classes.output.timestamp_index.TimeStamperTimestampIndex()
+player_pool = classes.media.player_pool.TimeStamperPlayerPool()
+media_probe = classes.media.media_probe.TimeStamperMediaProbe()
+media_cache = classes.media.media_cache.TimeStamperMediaCache()
 
 time_stamper = classes.time_stamper.TimeStamper()
@@ -8,6 +8,7 @@ from dataclasses import dataclass
 import classes.macros.macros_widgets.macros_checkbuttons as check
 import classes.macros.macros_widgets.macros_comboboxes as comboboxes
 import classes.macros.macros_widgets.macros_entries as entries
+import classes.macros.macros_widgets.macros_menus as menus
 import classes.macros.macros_widgets.macros_scales as scales
 import classes.macros.macros_widgets.macros_spinboxes as spinboxes
 import classes.macros.macros_widgets.macros_texts as texts
@@ -98,6 +99,12 @@ class Macros():
             "scale_media_volume": scales.scale_media_volume_macro,
             "scale_media_volume_ONMOUSEWHEEL": scales.scale_media_volume_mousewheel_macro,
 
+            # Menus
+            "file_menu_merge": menus.file_menu_merge_macro,
+            "debug_menu_tick_latency": menus.debug_menu_tick_latency_macro,
+            "debug_menu_media_probe": menus.debug_menu_media_probe_macro,
+            "debug_menu_startup_report": menus.debug_menu_startup_report_macro,
+
             # Spinboxes
             "spinbox_rewind": spinboxes.spinbox_rewind_macro,
             "spinbox_rewind_ONMOUSEWHEEL": spinboxes.spinbox_rewind_mousehweel_macro,
@@ -108,6 +115,7 @@ class Macros():
             "text_current_note_ONRETURN": texts.text_current_note_return_key_macro,
 
             # Windows
+            "window_main_ONCLOSE": windows.on_close_window_main_macro,
             "window_video_ONCLOSE": windows.on_close_window_video_macro,
             "window_help_ONCLOSE": windows.on_close_window_help_macro,
 
@@ -125,6 +133,11 @@ class Macros():
             "button_help_right_arrow": info.button_help_right_arrow_macro,
             "button_license": info.button_license_macro,
             "button_attribution": info.button_attribution_macro,
+            "button_tick_latency_refresh": info.button_tick_latency_refresh_macro,
+            "button_tick_latency_reset": info.button_tick_latency_reset_macro,
+            "button_tick_latency_save": info.button_tick_latency_save_macro,
+            "button_media_probe_refresh": info.button_media_probe_refresh_macro,
+            "button_startup_report_refresh": info.button_startup_report_refresh_macro,
 
             # Media buttons
             "button_pause": media.button_pause_macro,
@@ -79,6 +79,9 @@ def button_cancel_output_macro(*_):
     # Reset the output path in the TimeStamper class.
     classes.time_stamper.output_path = ""
 
+    # Flush and close the handle to the output file.
+    classes.output_writer.close()
+
     # Configure the relevant widgets to reflect that a valid output
     # file IS NOT active (distinct from enabling/disabling widgets).
     methods_output.reset_output_widgets()
@@ -136,7 +139,8 @@ def button_cancel_media_macro(*_):
         and classes.widgets.mapping["window_video"].winfo_exists():
         classes.widgets["window_video"].destroy()
 
-    # Try to release the current media player.
+    # Try to release the current media player (which also
+    # clears the duration of the media cached by the timer).
     methods_media.attempt_media_player_release()
     classes.time_stamper.media_player = None
 
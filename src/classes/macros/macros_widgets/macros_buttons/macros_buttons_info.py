@@ -2,8 +2,12 @@
 """This module stores the functions that are executed when
 info buttons in the Time Stamper program are pressed."""
 
+from tkinter import filedialog
+
 import classes
 import methods.macros.methods_macros_helper as methods_helper
+import methods.macros.methods_macros_media as methods_media
+import methods.macros.methods_macros_timing as methods_timing
 
 # Time Stamper: Run a timer and write automatically timestamped notes.
 # Copyright (C) 2022 Benjamin Fertig
@@ -83,3 +87,46 @@ def button_attribution_macro(*_):
 
         window_attribution = classes.widgets.create_entire_window("window_attribution")
         window_attribution.mainloop()
+
+
+def button_tick_latency_refresh_macro(*_):
+    """This method will be executed when the "Refresh" button in the tick latency window is
+    pressed."""
+
+    methods_timing.refresh_tick_latency_report()
+
+
+def button_tick_latency_reset_macro(*_):
+    """This method will be executed when the "Reset" button in the tick latency window
+    is pressed. It clears the histogram of how late the timer's ticks have been."""
+
+    classes.timer.tick_latency.reset()
+    methods_timing.refresh_tick_latency_report()
+
+
+def button_tick_latency_save_macro(*_):
+    """This method will be executed when the "Save..." button in the tick latency window is
+    pressed. It saves the histogram of how late the timer's ticks have been to a JSON file,
+    along with a description of the current machine, so that machines can be compared."""
+
+    file_full_path = filedialog.asksaveasfilename(title="Save the tick latency report", \
+        initialdir=classes.template.starting_dir, defaultextension=".json", \
+        filetypes=(("JSON files", "*.json"), ('All files', '*.*')), \
+        parent=classes.widgets["window_tick_latency"])
+
+    if file_full_path:
+        classes.timer.tick_latency.dump(file_full_path)
+
+
+def button_media_probe_refresh_macro(*_):
+    """This method will be executed when the "Refresh" button in the media load timings
+    window is pressed."""
+
+    methods_media.refresh_media_probe_report()
+
+
+def button_startup_report_refresh_macro(*_):
+    """This method will be executed when the "Refresh" button in the startup timings window is
+    pressed."""
+
+    methods_helper.refresh_startup_report()
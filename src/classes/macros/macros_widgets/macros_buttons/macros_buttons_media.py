@@ -51,6 +51,9 @@ def button_pause_macro(*_, force_suppress_message=False):
     # Pause the timer.
     classes.timer.pause()
 
+    # Flush any notes that have not yet been written to the output file.
+    classes.output_writer.flush()
+
 
 def button_play_press_macro(*_):
     """This method will be executed AS SOON AS THE LEFT-MOUSE-BUTTON IS PRESSED
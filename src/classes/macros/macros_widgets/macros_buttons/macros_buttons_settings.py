@@ -115,7 +115,8 @@ def button_save_settings_macro(*_):
     classes.settings.dump_dict_to_json(\
         classes.settings.user, classes.settings.user_json_path, indent=4)
 
-    # Update the current timestamp.
+    # Rebuild the timestamp formatter from the changed settings and update the current timestamp.
+    classes.timestamp_formatter.compile()
     classes.timer.update_timestamp(truncate_to=2)
 
     # If the current settings are the same as the default
@@ -0,0 +1,147 @@
+#-*- coding: utf-8 -*-
+"""This module stores the functions that are executed when
+menu buttons in the Time Stamper program are pressed."""
+
+from ntpath import sep as ntpath_sep
+from posixpath import sep as posixpath_sep
+from sys import platform
+from tkinter import filedialog
+
+import classes
+import methods.macros.methods_macros_helper as methods_helper
+import methods.macros.methods_macros_media as methods_media
+import methods.macros.methods_macros_output as methods_output
+import methods.macros.methods_macros_timing as methods_timing
+import methods.output.methods_output_merge as methods_merge
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+def file_menu_merge_macro(*_):
+    """This method will be executed when the "Merge output files..." menu button is pressed.
+    The user selects any number of output files and then a file in which to save the merged
+    timeline of their notes. If the merged timeline is saved to the current output file, the
+    notes log is refreshed. Otherwise, the merged timeline becomes the current output file."""
+
+    file_types = (("Text files", "*.txt"), ('All files', '*.*'))
+
+    # Get the paths to the output files that should be merged.
+    output_file_paths = filedialog.askopenfilenames(title="Select the text files to merge", \
+        initialdir=classes.template.starting_dir, filetypes=file_types)
+
+    # Get the path to the file in which the merged notes should be saved.
+    if not output_file_paths:
+        return
+    file_full_path = filedialog.asksaveasfilename(title="Save the merged text file", \
+        initialdir=classes.template.starting_dir, filetypes=file_types, defaultextension=".txt")
+    if not file_full_path:
+        return
+
+    # Change the file paths to the Windows format if we are on a Windows computer.
+    if platform.startswith("win"):
+        output_file_paths = [path.replace(posixpath_sep, ntpath_sep) for path in output_file_paths]
+        file_full_path = file_full_path.replace(posixpath_sep, ntpath_sep)
+
+    # Only merge the output files if they can all be read as text files.
+    if not all(methods_output.verify_text_file(path, True, False) for path in output_file_paths):
+        return
+
+    # Make sure that every note written so far to any of the output files being merged
+    # (which may still be held in the output writer's buffers) ends up in the merged notes.
+    if any(path in classes.output_writer for path in output_file_paths):
+        classes.output_writer.flush()
+
+    # If the merged notes will replace the current output file, close the handle to the
+    # current output file so that it can be replaced (and make sure it has been flushed).
+    is_output_path = file_full_path == classes.time_stamper.output_path
+    if is_output_path:
+        classes.output_writer.close(file_full_path)
+
+    try:
+        methods_merge.merge_output_files(list(output_file_paths), file_full_path)
+
+    finally:
+
+        # Reopen the handle to the current output file, whether or not the merge succeeded.
+        if is_output_path:
+            classes.output_writer.open(file_full_path, close_others=False)
+
+    # Now that the merge has succeeded, display the merged file in the notes log (reindexing
+    # the current output file if it was replaced) or make it the current output file.
+    if is_output_path:
+        classes.timestamp_index.ensure_current(file_full_path)
+        classes.log_view.reload()
+    else:
+        methods_output.validate_output_file(file_full_path)
+
+
+def debug_menu_tick_latency_macro(*_):
+    """This method will be executed when the "Tick latency..." menu button is pressed. It
+    displays a window containing a histogram of how late the timer's ticks have been."""
+
+    # If the tick latency window is already open, bring it forward and refresh its report.
+    if "window_tick_latency" in classes.widgets.mapping \
+        and classes.widgets.mapping["window_tick_latency"].winfo_exists():
+
+        classes.widgets.mapping["window_tick_latency"].lift()
+        methods_timing.refresh_tick_latency_report()
+
+    else:
+
+        classes.template["text_tick_latency"]["text"] = \
+            classes.timer.tick_latency.format_report()
+        window_tick_latency = classes.widgets.create_entire_window("window_tick_latency")
+        window_tick_latency.mainloop()
+
+
+def debug_menu_media_probe_macro(*_):
+    """This method will be executed when the "Media load timings..." menu button is pressed. It
+    displays a window containing the time taken by each stage of the most recent media check."""
+
+    # If the media load timings window is already open, bring it forward and refresh its report.
+    if "window_media_probe" in classes.widgets.mapping \
+        and classes.widgets.mapping["window_media_probe"].winfo_exists():
+
+        classes.widgets.mapping["window_media_probe"].lift()
+        methods_media.refresh_media_probe_report()
+
+    else:
+
+        classes.template["text_media_probe"]["text"] = classes.media_probe.format_report()
+        window_media_probe = classes.widgets.create_entire_window("window_media_probe")
+        window_media_probe.mainloop()
+
+
+def debug_menu_startup_report_macro(*_):
+    """This method will be executed when the "Startup timings..." menu button is pressed. It
+    displays a window containing the time taken by each stage of the program's startup, along
+    with the time taken by the work that was deferred until it was first needed."""
+
+    # If the startup timings window is already open, bring it forward and refresh its report.
+    if "window_startup_report" in classes.widgets.mapping \
+        and classes.widgets.mapping["window_startup_report"].winfo_exists():
+
+        classes.widgets.mapping["window_startup_report"].lift()
+        methods_helper.refresh_startup_report()
+
+    else:
+
+        classes.template["text_startup_report"]["text"] = classes.startup_report.format_report()
+        window_startup_report = classes.widgets.create_entire_window("window_startup_report")
+        window_startup_report.mainloop()
@@ -60,13 +60,17 @@ def scale_media_time_macro(scale_value, called_from_scroll_function=False):
 def scale_media_time_release_macro(*_):
     """This method will be executed when the user releases the left, middle
     or right mouse button from the media slider (but not when the user
-    presses the left, middle or right mouse button on the media slider)."""
+    presses the left, middle or right mouse button on the media slider).
+    The notes log is scrolled to the notes at the slider's new position."""
 
     # If the timer was previously paused when the user
     # dragged the media slider, resume the timer.
     if classes.timer.temporary_pause:
         classes.timer.play(playback_type="prev")
 
+    # Scroll the notes log to the first note at or after the new position of the slider.
+    classes.log_view.show_time(round(classes.timer.get_current_seconds() * 100))
+
 
 def scale_media_time_mousewheel_macro(event):
     """This method will be executed when the mousewheel is moved over the media time slider."""
@@ -81,8 +85,7 @@ def scale_media_time_mousewheel_macro(event):
         event_delta = event.delta if platform.startswith("darwin") else event.delta / 120
 
         # Calculate the amount that the media time slider should be adjusted by.
-        media = classes.time_stamper.media_player.get_media()
-        scroll_sensitivity = (media.get_duration() / 1000) / 180
+        scroll_sensitivity = classes.timer.get_max_time() / 180
         scroll_amount = event_delta * float(scroll_sensitivity) * \
             (-1 if scale_template["reverse_scroll_direction"] else 1)
 
@@ -5,8 +5,6 @@ windows in the Time Stamper program are manipulated."""
 from os.path import basename
 from tkinter import filedialog
 
-from vlc import MediaPlayer
-
 import classes
 import methods.macros.methods_macros_helper as methods_helper
 import methods.macros.methods_macros_media as methods_media
@@ -31,6 +29,21 @@ import methods.macros.methods_macros_output as methods_output
 # Contact: github.cqrde@simplelogin.com
 
 
+def on_close_window_main_macro(window_main):
+    """This method will be executed when the main window is closed."""
+
+    # Flush and close the handles to all output files.
+    classes.output_writer.close()
+
+    # Release the media players and the libvlc instance.
+    methods_media.attempt_media_player_release()
+    classes.time_stamper.media_player = None
+    classes.player_pool.release()
+
+    # Destroy the main window.
+    window_main.destroy()
+
+
 def on_close_window_video_macro(window_video):
     """This method will be executed when the video window is closed."""
 
@@ -38,7 +51,7 @@ def on_close_window_video_macro(window_video):
     classes.macros["button_pause"]()
 
     # Stop the media player.
-    if isinstance(classes.time_stamper.media_player, MediaPlayer):
+    if classes.time_stamper.media_player:
         classes.time_stamper.media_player.stop()
 
     # Destroy the video window.
@@ -0,0 +1,133 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperMediaCache class which remembers the properties of
+media files that have been validated, so that they do not have to be validated before use."""
+
+from json import JSONDecodeError, dump, load
+from os import stat
+from os.path import dirname, exists, join
+
+import classes
+import methods.output.methods_output_files as methods_files
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The version of the layout of the media cache file (a cache file with any other version is
+# ignored), and the greatest number of media files that are remembered.
+CACHE_VERSION = 1
+MAX_ENTRIES = 50
+
+
+class TimeStamperMediaCache():
+    """This class keeps a small cache (in media_cache.json, next to settings_user.json) of the
+    properties that were found for each media file that was recently validated: the duration
+    of its media in milliseconds and whether it has video. Each media file is remembered
+    together with its size and modification time, so that the cached properties are only used
+    while the media file has not changed since it was validated. The least recently validated
+    media files are forgotten once more than MAX_ENTRIES media files are remembered."""
+
+    def __init__(self):
+
+        self.entries = None
+
+    def get_cache_path(self):
+        """This method returns the path to the media cache file."""
+
+        return join(dirname(classes.settings.user_json_path), "media_cache.json")
+
+    def load(self):
+        """This method loads the media cache file (the first time that it is needed). If the
+        media cache file does not exist or cannot be read, the cache starts out empty."""
+
+        if self.entries is not None:
+            return
+
+        self.entries = {}
+        cache_path = self.get_cache_path()
+        if exists(cache_path):
+            try:
+                with open(cache_path, encoding="utf-8") as cache_file:
+                    cache = load(cache_file)
+                if cache.get("version") == CACHE_VERSION:
+                    self.entries = cache["media"]
+            except (OSError, JSONDecodeError, AttributeError, KeyError):
+                self.entries = {}
+
+    def save(self):
+        """This method writes the cache to the media cache file (through a temporary
+        file, so that the media cache file is never left half-written)."""
+
+        try:
+            with methods_files.rewrite_file_atomically(self.get_cache_path(), "utf-8") \
+                as cache_file:
+                dump({"version": CACHE_VERSION, "media": self.entries}, cache_file, indent=4)
+        except OSError:
+            pass
+
+    @staticmethod
+    def get_file_key(file_full_path):
+        """This method returns the size and modification time (in nanoseconds) of the file at
+        file_full_path as a list, or None if the file cannot be found."""
+
+        try:
+            file_stat = stat(file_full_path)
+        except OSError:
+            return None
+
+        return [file_stat.st_size, file_stat.st_mtime_ns]
+
+    def lookup(self, file_full_path):
+        """This method returns the cached properties of the media file at file_full_path as a
+        dictionary (with the keys "duration_ms" and "has_video"), or None if the media file is not
+        in the cache or has changed since its properties were cached."""
+
+        self.load()
+        entry = self.entries.get(file_full_path)
+
+        if entry is None or entry["file_key"] != self.get_file_key(file_full_path):
+            return None
+
+        return entry
+
+    def store(self, file_full_path, duration_ms, has_video):
+        """This method caches the properties of the media file at file_full_path (which
+        has just been validated) and saves the cache."""
+
+        file_key = self.get_file_key(file_full_path)
+        if file_key is None:
+            return
+
+        self.load()
+
+        # Move the media file to the end of the cache (as the most recently validated media
+        # file) and forget the least recently validated media files if there are too many.
+        self.entries.pop(file_full_path, None)
+        self.entries[file_full_path] = \
+            {"file_key": file_key, "duration_ms": duration_ms, "has_video": has_video}
+        while len(self.entries) > MAX_ENTRIES:
+            del self.entries[next(iter(self.entries))]
+
+        self.save()
+
+    def remove(self, file_full_path):
+        """This method forgets the media file at file_full_path (e.g., because it could not be
+        validated) and saves the cache."""
+
+        self.load()
+        if self.entries.pop(file_full_path, None) is not None:
+            self.save()
@@ -0,0 +1,184 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperMediaProbe class which collects the log messages of
+libvlc in memory while a media file is checked and times each stage of that check."""
+
+from collections import deque
+from ctypes import CDLL, c_char_p, c_int, c_size_t, c_void_p, create_string_buffer
+from ctypes.util import find_library
+from sys import platform
+from time import perf_counter_ns
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The beginnings of the log messages which show that a media file is not an audio/video file.
+BAD_MESSAGE_STARTS = ("garbage at input from", "VLC could not identify the audio or video codec")
+
+# The greatest number of log messages that are kept (the oldest messages are discarded first).
+MAX_MESSAGES = 500
+
+# The greatest length in bytes of a formatted log message.
+MESSAGE_BUFFER_SIZE = 1024
+
+
+def load_vsnprintf():
+    """This method returns the vsnprintf function of the C library (which is used to format the
+    log messages of libvlc), or None if it cannot be loaded on the current platform."""
+
+    try:
+        if platform.startswith("win"):
+            vsnprintf = CDLL("msvcrt")._vsnprintf
+        elif platform.startswith("darwin"):
+            vsnprintf = CDLL("libc.dylib").vsnprintf
+        else:
+            vsnprintf = CDLL(find_library("c")).vsnprintf
+    except (AttributeError, OSError):
+        return None
+
+    vsnprintf.restype = c_int
+    vsnprintf.argtypes = (c_char_p, c_size_t, c_char_p, c_void_p)
+    return vsnprintf
+
+
+class TimeStamperMediaProbe():
+    """This class collects the log messages of a libvlc instance in memory (through a log
+    callback, rather than a log file) while a media file is being checked, and notes the first
+    message which shows that the media file is not an audio/video file. It also records how
+    long after the media file was selected each stage of the check was reached, so that a
+    report of those timings can be displayed (see format_report)."""
+
+    def __init__(self):
+
+        self.instance = None
+        self.log_callback = None
+        self.vsnprintf = load_vsnprintf()
+
+        self.file_full_path = None
+        self.messages = deque(maxlen=MAX_MESSAGES)
+        self.bad_message = None
+        self.expects_video = True
+
+        self.start_ns = None
+        self.stages = []
+        self.result = None
+
+    def start(self, instance, file_full_path):
+        """This method starts collecting the log messages of the libvlc instance instance
+        while the media file at file_full_path is checked, and starts timing the check."""
+
+        self.stop()
+
+        self.file_full_path = file_full_path
+        self.messages.clear()
+        self.bad_message = None
+        self.expects_video = True
+
+        self.start_ns = perf_counter_ns()
+        self.stages = [("selected", 0)]
+        self.result = None
+
+        # Keep a reference to the log callback for as long as libvlc may call it (vlc
+        # has already been loaded by now, since instance was created from it).
+        from vlc import CallbackDecorators
+        self.log_callback = CallbackDecorators.LogCb(self.log_handler)
+        instance.log_set(self.log_callback, None)
+        self.instance = instance
+
+    def stop(self):
+        """This method stops collecting log messages (if they are being collected). It must not
+        be called from within a log callback, as libvlc waits for log callbacks to return."""
+
+        if self.instance is not None:
+            self.instance.log_unset()
+            self.instance = None
+            self.log_callback = None
+
+    def finish(self, result):
+        """This method records that the check has finished with the result result (e.g.,
+        "accepted" or "rejected") and stops collecting log messages."""
+
+        self.mark(result)
+        self.result = result
+        self.stop()
+
+    def mark(self, stage):
+        """This method records that the check has reached the stage stage (if it has not
+        already reached it), along with how long after the media file was selected it did so."""
+
+        if self.start_ns is not None and not self.has_reached(stage):
+            self.stages.append((stage, perf_counter_ns() - self.start_ns))
+
+    def has_reached(self, stage):
+        """This method returns whether the check has reached the stage stage."""
+
+        return any(reached_stage == stage for reached_stage, _ in self.stages)
+
+    def is_checking(self, file_full_path):
+        """This method returns whether the media file at file_full_path is being checked."""
+
+        return self.instance is not None and self.file_full_path == file_full_path
+
+    def log_handler(self, _data, _level, _context, fmt, args):
+        """This method is called by libvlc (on any of its threads) with each of its log
+        messages, as a printf format string fmt along with its arguments args."""
+
+        message = self.format_message(fmt, args)
+        self.messages.append(message)
+
+        if self.bad_message is None and message.startswith(BAD_MESSAGE_STARTS):
+            self.bad_message = message
+
+    def format_message(self, fmt, args):
+        """This method formats a log message of libvlc from its printf format string fmt and its
+        arguments args. If the C library's vsnprintf is not available, fmt itself is returned
+        (the beginnings of the messages in BAD_MESSAGE_STARTS do not depend on the arguments)."""
+
+        if fmt is None:
+            return ""
+
+        if self.vsnprintf is not None:
+            buffer = create_string_buffer(MESSAGE_BUFFER_SIZE)
+            if self.vsnprintf(buffer, MESSAGE_BUFFER_SIZE, fmt, args) >= 0:
+                return buffer.value.decode("utf-8", "replace")
+
+        return fmt.decode("utf-8", "replace")
+
+    def format_report(self):
+        """This method returns a printable report of the stages of the most recent check,
+        with how long after the media file was selected (and after the previous stage)
+        each stage was reached."""
+
+        if self.start_ns is None:
+            return "No media file has been selected yet."
+
+        lines = [f"Media file: {self.file_full_path}", \
+            f"Result: {self.result if self.result else 'still being checked'}", ""]
+
+        label_width = max(len(stage) for stage, _ in self.stages)
+        previous_ns = 0
+        for stage, elapsed_ns in self.stages:
+            lines.append(f"{stage:<{label_width}}  {elapsed_ns / 1000000:>9.1f} ms  " \
+                f"(+{(elapsed_ns - previous_ns) / 1000000:.1f} ms)")
+            previous_ns = elapsed_ns
+
+        lines.append("")
+        if self.bad_message is not None:
+            lines.append(f"Rejected because of the log message: {self.bad_message}")
+        lines.append(f"Log messages collected: {len(self.messages)}")
+
+        return "\n".join(lines)
@@ -0,0 +1,129 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperPlayerPool class which creates the Time Stamper
+program's media players from a single libvlc instance and reuses them between media files."""
+
+from time import perf_counter_ns
+
+import classes
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The names of the media player events that the program attaches handlers to, which are detached
+# whenever a media player is returned to the pool so that they do not fire for the next media.
+PLAYER_EVENT_TYPES = ("MediaPlayerPlaying",)
+
+
+class TimeStamperPlayerPool():
+    """This class holds the libvlc instance that every media player in the program is created
+    from, along with the media players that are not currently in use. Instead of creating a new
+    media player (and releasing the previous one) whenever a media file is selected or checked,
+    the program acquires a media player from this pool and recycles it (stopping it and
+    clearing its media and event handlers) once it is no longer needed, so that loading a media
+    file does not have to set up a new media player each time. At most max_idle_players media
+    players are kept for reuse, and any others are released when they are recycled. Neither
+    vlc nor libvlc is loaded until the first media player is needed, so that the program
+    starts up without them (the time that loading them takes is recorded in the startup
+    report, see TimeStamperStartupReport)."""
+
+    def __init__(self, max_idle_players=2):
+
+        self.instance = None
+        self.idle_players = []
+        self.max_idle_players = max_idle_players
+
+    def get_instance(self):
+        """This method returns the libvlc instance that the pool's media players are
+        created from, creating it the first time that it is needed."""
+
+        if self.instance is None:
+
+            # Imported here, so that vlc is only loaded once a media file is first selected.
+            start_ns = perf_counter_ns()
+            from vlc import Instance
+            classes.startup_report.record_deferred("imported vlc", perf_counter_ns() - start_ns)
+
+            start_ns = perf_counter_ns()
+            self.instance = Instance()
+            classes.startup_report.record_deferred("created the libvlc instance", \
+                perf_counter_ns() - start_ns)
+
+        return self.instance
+
+    def acquire(self, file_full_path=None):
+        """This method returns a media player from the pool (or creates one if the pool is
+        empty). If file_full_path is provided, a new vlc.Media for the media file at that path
+        is set on the media player."""
+
+        if self.idle_players:
+            player = self.idle_players.pop()
+        else:
+            player = self.get_instance().media_player_new()
+
+        if file_full_path:
+            player.set_media(self.get_instance().media_new(file_full_path))
+
+        return player
+
+    def get_event_manager(self, player):
+        """This method returns the event manager of the media player player. The same event
+        manager is returned every time for the same media player, so the handlers attached
+        through it can be detached once the media player is recycled (a vlc.EventManager only
+        detaches the handlers that were attached through that same vlc.EventManager)."""
+
+        if getattr(player, "pool_event_manager", None) is None:
+            player.pool_event_manager = player.event_manager()
+
+        return player.pool_event_manager
+
+    def recycle(self, player):
+        """This method stops the media player player and returns it to the pool (or
+        releases it if the pool already holds max_idle_players media players)."""
+
+        # There is nothing to recycle if no media player has been created yet, and a
+        # media player that is already in the pool has already been recycled.
+        if player is None or player in self.idle_players:
+            return
+
+        # vlc has already been loaded by now (the media player was created from it).
+        from vlc import EventType
+
+        # Stop the media player and detach the handlers of any events that were attached to it.
+        player.stop()
+        events = self.get_event_manager(player)
+        for event_type in PLAYER_EVENT_TYPES:
+            events.event_detach(getattr(EventType, event_type))
+
+        # Keep the media player for reuse (without its media) if the pool is not yet full.
+        if len(self.idle_players) < self.max_idle_players:
+            player.set_media(None)
+            player.set_rate(1.0)
+            self.idle_players.append(player)
+        else:
+            player.release()
+
+    def release(self):
+        """This method releases every media player in the pool and the libvlc instance."""
+
+        for player in self.idle_players:
+            player.release()
+        self.idle_players = []
+
+        if self.instance is not None:
+            self.instance.release()
+            self.instance = None
@@ -0,0 +1,336 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperLogView class which displays the contents of
+the current output file in the notes log without loading the entire output file."""
+
+from array import array
+from tkinter import END, NORMAL
+
+import classes
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+class TimeStamperLogView():
+    """This class displays the current output file in the notes log. Rather than inserting the
+    entire output file into the notes log, only a window of lines around the region that the
+    user is looking at is held in the notes log at any time. As the user scrolls towards the
+    edge of that window, lines are paged in from the output file and lines on the opposite side
+    of the window are dropped. Lines are located in the output file using a sparse index that
+    records the byte offset of every "index_stride"-th line, so opening an output file only
+    requires one pass over its bytes and memory use stays flat as the output file grows."""
+
+    def __init__(self):
+
+        self.file_path = ""
+        self.text_obj = None
+
+        # The sparse index of line offsets and the amount of the output file that it covers.
+        self.line_offsets = array("q")
+        self.indexed_size = 0
+        self.newline_count = 0
+
+        # The range of lines from the output file that are currently held in the notes log.
+        self.first_line = 0
+        self.last_line = 0
+
+        # Whether the notes log is currently holding the end of the output file.
+        self.following = True
+
+        self.is_paging = False
+
+    def get_template_value(self, attribute_str):
+        """This method returns the value of an attribute from the notes log's template."""
+
+        return classes.template["text_log"][attribute_str]
+
+    def load(self, file_path):
+        """This method indexes the output file specified in file_path and displays
+        the end of that output file in the notes log (which is where new notes appear)."""
+
+        self.text_obj = classes.widgets["text_log"]
+        self.text_obj.config(yscrollcommand=self.on_scroll)
+
+        self.file_path = file_path
+        self.line_offsets = array("q", [0])
+        self.indexed_size = 0
+        self.newline_count = 0
+
+        # Make sure that every note written so far has been flushed to the output file.
+        classes.output_writer.flush(file_path)
+
+        # Index the entire output file.
+        self.extend_index()
+
+        # Display the last window of lines in the output file.
+        total_lines = self.newline_count + 1
+        self.first_line = max(0, total_lines - self.get_template_value("window_lines"))
+        self.last_line = total_lines
+        self.following = True
+        self.render(self.read_lines(self.first_line, self.last_line))
+
+    def reload(self):
+        """This method reindexes the current output file from scratch and displays its end
+        in the notes log. This should be called after the output file has been rewritten."""
+
+        if self.file_path:
+            self.load(self.file_path)
+
+    def show_line(self, line_number):
+        """This method displays a window of lines around line_number (the number of a line in
+        the output file, counting from 0) in the notes log and scrolls that line into view."""
+
+        if self.text_obj is None or not self.file_path:
+            return
+
+        # Make sure that the index covers everything that has been written to the output file.
+        classes.output_writer.flush(self.file_path)
+        self.extend_index()
+
+        # Display the window of lines centered on the requested line.
+        total_lines = self.newline_count + 1
+        window_lines = self.get_template_value("window_lines")
+        line_number = min(max(0, line_number), total_lines - 1)
+        self.first_line = max(0, min(line_number - window_lines // 2, total_lines - window_lines))
+        self.last_line = min(total_lines, self.first_line + window_lines)
+        self.following = self.last_line >= total_lines
+        self.render(self.read_lines(self.first_line, self.last_line))
+
+        # Scroll the requested line to the top of the notes log.
+        self.text_obj.yview(f"{line_number - self.first_line + 1}.0")
+
+    def show_time(self, centiseconds):
+        """This method scrolls the notes log to the first note in the output file whose timestamp
+        is at or after the time specified in centiseconds (using the timestamp index, so the
+        output file does not need to be scanned). If there is no such note, the notes log is
+        scrolled to the end of the output file. This method returns the line number of the note
+        that was scrolled to, or None if the notes log was scrolled to the end of the output file."""
+
+        if not self.file_path:
+            return None
+
+        seek_result = classes.timestamp_index.seek(self.file_path, centiseconds)
+        line_number = seek_result[1] if seek_result is not None else None
+
+        if line_number is None:
+            self.load(self.file_path)
+        else:
+            self.show_line(line_number)
+
+        return line_number
+
+    def clear(self):
+        """This method removes all text from the notes log and
+        forgets about the output file that was being displayed."""
+
+        self.file_path = ""
+        self.line_offsets = array("q")
+        self.indexed_size = 0
+        self.newline_count = 0
+        self.first_line, self.last_line = 0, 0
+        self.following = True
+
+        self.text_obj = classes.widgets["text_log"]
+        self.render("")
+
+    def render(self, to_display):
+        """This method replaces all of the text in the notes log with to_display
+        and then scrolls the notes log to its end, all in a single insertion."""
+
+        initial_state = self.text_obj["state"]
+        self.text_obj["state"] = NORMAL
+        self.text_obj.delete(1.0, END)
+        self.text_obj.insert(END, to_display)
+        self.text_obj.see(END)
+        self.text_obj["state"] = initial_state
+
+    def append(self, to_print):
+        """This method displays text that has just been printed to the end of the output file.
+        If the notes log is not currently holding the end of the output file, then the notes log
+        jumps to the end of the output file first, as would happen with a regular Text widget."""
+
+        # If no output file is being displayed, there is nowhere to display the text.
+        if self.text_obj is None or not self.file_path:
+            return
+
+        # Jump to the end of the output file if the notes log is scrolled away from it
+        # (the text that was just printed will already be included in what gets loaded).
+        if not self.following:
+            self.load(self.file_path)
+            return
+
+        initial_state = self.text_obj["state"]
+        self.text_obj["state"] = NORMAL
+        self.text_obj.insert(END, to_print)
+        self.last_line += to_print.count("\n")
+
+        # Drop lines from the top of the notes log if it now holds too many lines.
+        excess_lines = (self.last_line - self.first_line) - self.get_template_value("window_lines")
+        if excess_lines > 0:
+            self.text_obj.delete(1.0, f"{excess_lines + 1}.0")
+            self.first_line += excess_lines
+
+        self.text_obj.see(END)
+        self.text_obj["state"] = initial_state
+
+    def extend_index(self):
+        """This method extends the sparse line index to cover any bytes that have been
+        added to the end of the output file since the output file was last indexed."""
+
+        index_stride = self.get_template_value("index_stride")
+        chunk_size = self.get_template_value("index_chunk_size")
+
+        with open(self.file_path, "rb") as out_file:
+
+            out_file.seek(self.indexed_size)
+
+            # Read the unindexed part of the output file one chunk at a time.
+            while True:
+
+                chunk = out_file.read(chunk_size)
+                if not chunk:
+                    break
+
+                # Record the offset of every line whose number is a multiple of index_stride.
+                newline_pos = chunk.find(b"\n")
+                while newline_pos != -1:
+                    self.newline_count += 1
+                    if self.newline_count % index_stride == 0:
+                        self.line_offsets.append(self.indexed_size + newline_pos + 1)
+                    newline_pos = chunk.find(b"\n", newline_pos + 1)
+
+                self.indexed_size += len(chunk)
+
+    def read_lines(self, start_line, end_line):
+        """This method reads lines start_line (inclusive) through end_line (exclusive) from
+        the output file and returns them as a single string joined by new line characters."""
+
+        if end_line <= start_line:
+            return ""
+
+        index_stride = self.get_template_value("index_stride")
+        file_encoding = classes.settings["output"]["file_encoding"]
+        lines = []
+
+        with open(self.file_path, "rb") as out_file:
+
+            # Jump to the closest indexed line at or before start_line.
+            out_file.seek(self.line_offsets[start_line // index_stride])
+
+            # Skip over the lines between the indexed line and start_line.
+            for _ in range(start_line % index_stride):
+                out_file.readline()
+
+            # Read the requested lines.
+            for _ in range(end_line - start_line):
+                line = out_file.readline()
+                line = line.decode(file_encoding, errors="replace")
+                lines.append(line.rstrip("\n").rstrip("\r"))
+
+        return "\n".join(lines)
+
+    def on_scroll(self, first, last):
+        """This method is executed by the notes log whenever the region of the notes log that
+        is visible changes. If the visible region is close to either edge of the lines that
+        are currently held in the notes log, more lines are paged in from the output file."""
+
+        if self.is_paging or not self.file_path:
+            return
+
+        self.is_paging = True
+        page_threshold = self.get_template_value("page_threshold")
+
+        try:
+
+            # If the user has scrolled close to the top of the notes
+            # log, page in lines from earlier in the output file.
+            if float(first) < page_threshold and self.first_line > 0:
+                self.page_up()
+
+            # If the user has scrolled close to the bottom of the notes
+            # log, page in lines from later in the output file.
+            elif float(last) > 1 - page_threshold and not self.following:
+                self.page_down()
+
+        finally:
+            self.is_paging = False
+
+    def page_up(self):
+        """This method inserts lines from the output file above the lines that are currently
+        held in the notes log and drops the same number of lines from the bottom of the notes
+        log, keeping the lines that the user is currently looking at in the same place."""
+
+        page_lines = min(self.get_template_value("page_lines"), self.first_line)
+        top_visible_line = int(self.text_obj.index("@0,0").split(".")[0])
+
+        initial_state = self.text_obj["state"]
+        self.text_obj["state"] = NORMAL
+
+        # Insert the earlier lines at the top of the notes log.
+        new_text = self.read_lines(self.first_line - page_lines, self.first_line)
+        self.text_obj.insert(1.0, f"{new_text}\n")
+        self.first_line -= page_lines
+
+        # Drop lines from the bottom of the notes log if it now holds too many lines.
+        excess_lines = (self.last_line - self.first_line) - self.get_template_value("window_lines")
+        if excess_lines > 0:
+            self.last_line -= excess_lines
+            self.text_obj.delete(f"{self.last_line - self.first_line}.end", END)
+            self.following = False
+
+        self.text_obj["state"] = initial_state
+
+        # Keep the lines that the user was looking at in the same place.
+        self.text_obj.yview(f"{top_visible_line + page_lines}.0")
+
+    def page_down(self):
+        """This method inserts lines from the output file below the lines that are currently
+        held in the notes log and drops the same number of lines from the top of the notes
+        log, keeping the lines that the user is currently looking at in the same place."""
+
+        # Make sure that the index covers everything that has been written to the output file.
+        classes.output_writer.flush(self.file_path)
+        self.extend_index()
+
+        total_lines = self.newline_count + 1
+        page_lines = min(self.get_template_value("page_lines"), total_lines - self.last_line)
+        top_visible_line = int(self.text_obj.index("@0,0").split(".")[0])
+
+        initial_state = self.text_obj["state"]
+        self.text_obj["state"] = NORMAL
+
+        # Insert the later lines at the bottom of the notes log.
+        if page_lines > 0:
+            new_text = self.read_lines(self.last_line, self.last_line + page_lines)
+            self.text_obj.insert(END, f"\n{new_text}")
+            self.last_line += page_lines
+
+        # Record whether the notes log now holds the end of the output file.
+        self.following = self.last_line >= total_lines
+
+        # Drop lines from the top of the notes log if it now holds too many lines.
+        excess_lines = (self.last_line - self.first_line) - self.get_template_value("window_lines")
+        if excess_lines > 0:
+            self.text_obj.delete(1.0, f"{excess_lines + 1}.0")
+            self.first_line += excess_lines
+            top_visible_line -= excess_lines
+
+        self.text_obj["state"] = initial_state
+
+        # Keep the lines that the user was looking at in the same place.
+        self.text_obj.yview(f"{max(1, top_visible_line)}.0")
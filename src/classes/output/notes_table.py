@@ -0,0 +1,136 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperNotesTable class which describes the header lines
+and notes of an output file as columns of numbers rather than as lists of strings."""
+
+from array import array
+
+from classes.timing.timestamp import TimeStamperTimestamp
+from methods.timing import methods_timing_helper
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+class TimeStamperNotesTable():
+    """This class holds the notes of an output file as a table with one row per note and one
+    column (a Python array of integers) per property: the byte offset at which the note begins
+    in the output file, its length in bytes, the time of its timestamp in centiseconds and the
+    precision code of its timestamp (see TimeStamperTimestamp). The header lines of the output
+    file are held as a list of (offset, length) tuples. The text of a note is only decoded
+    (through a TimeStamperOutputReader for the same output file) when the note is written, so
+    notes can be sorted, reconciled and merged without building a Python object for each note.
+    If NumPy is installed, the columns are sorted and checked with NumPy."""
+
+    def __init__(self, header_spans=None, offsets=None, lengths=None, \
+        centiseconds=None, precisions=None):
+
+        self.header_spans = header_spans if header_spans is not None else []
+        self.offsets = offsets if offsets is not None else array("q")
+        self.lengths = lengths if lengths is not None else array("q")
+        self.centiseconds = centiseconds if centiseconds is not None else array("q")
+        self.precisions = precisions if precisions is not None else array("b")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def extend(self, other):
+        """This method appends the header lines and notes of the table other (which
+        should describe the part of the same output file directly after this one)."""
+
+        self.header_spans.extend(other.header_spans)
+        self.offsets.extend(other.offsets)
+        self.lengths.extend(other.lengths)
+        self.centiseconds.extend(other.centiseconds)
+        self.precisions.extend(other.precisions)
+
+    def get_precision(self):
+        """This method returns the precision code of the most precise timestamp in the table
+        (which includes hours or minutes if any timestamp does and has the greatest number of
+        subsecond digits of any timestamp). This is the precision that every timestamp is
+        given when notes are reconciled."""
+
+        return TimeStamperTimestamp.combine_precisions(set(self.precisions))
+
+    def is_sorted(self):
+        """This method determines whether the notes in the table are in order of their times."""
+
+        if numpy is not None:
+            centiseconds = numpy.frombuffer(self.centiseconds, dtype=numpy.int64)
+            return bool(numpy.all(centiseconds[1:] >= centiseconds[:-1]))
+
+        return all(earlier <= later for earlier, later \
+            in zip(self.centiseconds, self.centiseconds[1:]))
+
+    def get_sorted_order(self):
+        """This method returns the rows of the table in order of their times. The order is
+        stable, so notes with identical times stay in the order that they appear in the table.
+        If the notes are already in order (see is_sorted), they are not sorted at all."""
+
+        if self.is_sorted():
+            return range(len(self.centiseconds))
+
+        if numpy is not None:
+            return numpy.argsort(numpy.frombuffer(self.centiseconds, dtype=numpy.int64), \
+                kind="stable").tolist()
+
+        return sorted(range(len(self.centiseconds)), key=self.centiseconds.__getitem__)
+
+    def reconcile_note(self, note, row, precision):
+        """This method rewrites the timestamp at the beginning of note (the decoded text of the
+        note in the specified row) so that it has the precision code precision. If the timestamp
+        is written in the usual format, it is rewritten straight from the time and precision in
+        the table. Otherwise (e.g., if one of its values is 60 or more), the timestamp is read
+        from the text and made as precise as precision requires (see make_h_m_s_precise)."""
+
+        timestamp_end = note.find("]") + 1
+        timestamp = TimeStamperTimestamp(self.centiseconds[row], self.precisions[row])
+
+        # If the timestamp is written in the usual format, rewrite it straight from the table.
+        if note[:timestamp_end] == timestamp.format():
+            return f"{timestamp.with_precision(precision).format()}{note[timestamp_end:]}"
+
+        # Otherwise, read the timestamp and make it as precise as required.
+        h_m_s = methods_timing_helper.timestamp_to_h_m_s(\
+            note[:timestamp_end], pad=2, pad_subseconds=False)
+        consistent_timestamp = methods_timing_helper.h_m_s_to_timestamp(\
+            *methods_timing_helper.make_h_m_s_precise(h_m_s, precision))
+        return f"{consistent_timestamp}{note[timestamp_end:]}"
+
+    def iterate_notes(self, reader, order=None, precision=None):
+        """This method decodes the notes in the table with reader (a TimeStamperOutputReader
+        for the output file that the table describes) and yields them one at a time. The
+        optional argument order is a list of the rows to yield (all rows in their original order
+        by default), and the optional argument precision is a precision code that the timestamp
+        of every yielded note is given (by default, the notes are yielded as they are)."""
+
+        for row in range(len(self.offsets)) if order is None else order:
+            note = reader.decode(self.offsets[row], self.lengths[row])
+            yield note if precision is None else self.reconcile_note(note, row, precision)
+
+    def iterate_header(self, reader):
+        """This method decodes the header lines in the table with reader
+        (as in iterate_notes) and yields them one at a time."""
+
+        for offset, length in self.header_spans:
+            yield reader.decode(offset, length)
+
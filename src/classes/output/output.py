@@ -0,0 +1,304 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperOutputWriter class which keeps the output files of the
+Time Stamper program open while they are active and controls when notes are flushed to disk."""
+
+from os import fstat, fsync, linesep, stat
+from time import perf_counter
+
+import classes
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+class TimeStamperOutputWriter():
+    """This class keeps one open handle for every active output file so that printing a note
+    does not require the output file to be reopened and closed. When the notes that have been
+    written are actually flushed to disk is determined by the "flush_policy" output setting,
+    which should be either "note" (flush after every note), "interval" (flush at most every
+    "flush_interval_ms" milliseconds) or "count" (flush after every "flush_note_count" notes).
+    This class also keeps track of the last character, size and modification time of every
+    active output file so that the output file does not need to be read before every note."""
+
+    def __init__(self):
+
+        self.handles = {}
+        self.tail_states = {}
+        self.notes_since_flush = {}
+
+        self.last_flush_time = 0.0
+        self.scheduled_flush_id = None
+
+        # The results of successful output file verifications, keyed by (device, inode).
+        self.verified_files = {}
+
+    def __getitem__(self, item):
+        return self.handles[item]
+
+    def __contains__(self, item):
+        return item in self.handles
+
+    def open(self, file_path, close_others=True):
+        """This method opens a handle to the output file specified in file_path (if a handle
+        to that output file is not already open). The optional argument close_others, which
+        is set to True by default, determines whether the handles to any other output files
+        should be flushed and closed, as the Time Stamper program only has one active output
+        file at a time. This method returns True if the handle was opened successfully."""
+
+        # Flush and close the handles to any other output files if requested.
+        if close_others:
+            for other_path in [path for path in self.handles if path != file_path]:
+                self.close(other_path)
+
+        # Only open a new handle if one is not already open for this output file.
+        if file_path not in self.handles:
+
+            try:
+                self.handles[file_path] = open(file_path, "ab")
+            except OSError:
+                return False
+
+            self.notes_since_flush[file_path] = 0
+
+            # Record the current state of the end of the output file.
+            self.tail_states[file_path] = {}
+            self.reload_tail_state(file_path)
+
+        return True
+
+    def close(self, file_path=None):
+        """This method flushes and closes the handle to the output file specified in file_path.
+        If file_path is None, then the handles to ALL output files will be flushed and closed."""
+
+        paths_to_close = list(self.handles) if file_path is None else [file_path]
+
+        for path in paths_to_close:
+
+            # Skip any output files that do not have an open handle.
+            if path not in self.handles:
+                continue
+
+            # Make sure everything that was written to the handle ends up in the output
+            # file, and save the index of the timestamps in the output file.
+            self.flush(path)
+            classes.timestamp_index.save(path)
+
+            # Close the handle and forget about the output file.
+            try:
+                self.handles[path].close()
+            except OSError:
+                pass
+            del self.handles[path]
+            del self.tail_states[path]
+            del self.notes_since_flush[path]
+
+        # If no handles are left open, there is no need for a scheduled flush.
+        if not self.handles:
+            self.cancel_scheduled_flush()
+
+    def write(self, to_print, file_path):
+        """This method writes the value stored in to_print to the output file specified in
+        file_path and then flushes the output file if the flush policy requires it. If a
+        handle to the output file is not already open, one will be opened here."""
+
+        if not self.open(file_path, close_others=False):
+            return
+
+        # Convert the text to bytes the same way that a text-mode file would have.
+        file_encoding = classes.settings["output"]["file_encoding"]
+        to_write = to_print.replace("\n", linesep) if linesep != "\n" else to_print
+        to_write = to_write.encode(file_encoding)
+        self.handles[file_path].write(to_write)
+
+        # Index the timestamps of any notes that were just written.
+        tail_state = self.tail_states[file_path]
+        classes.timestamp_index.append(file_path, to_write, \
+            tail_state["size"] + tail_state["unflushed_bytes"])
+
+        # Update the state of the end of the output file to reflect what was just written.
+        if to_print:
+            tail_state["last_character"] = to_print[-1]
+        tail_state["unflushed_bytes"] += len(to_write)
+        self.notes_since_flush[file_path] += 1
+
+        # Flush the output file if the flush policy requires it.
+        self.apply_flush_policy(file_path)
+
+    def apply_flush_policy(self, file_path):
+        """This method flushes the output file specified in file_path
+        (or schedules it to be flushed) according to the flush policy."""
+
+        output_settings = classes.settings["output"]
+        flush_policy = output_settings["flush_policy"]
+
+        # If notes should be flushed after every note, flush now.
+        if flush_policy == "note":
+            self.flush(file_path)
+
+        # If notes should be flushed after a certain number of notes,
+        # flush now if that number of notes has been reached.
+        elif flush_policy == "count":
+            if self.notes_since_flush[file_path] >= max(1, output_settings["flush_note_count"]):
+                self.flush(file_path)
+
+        # If notes should be flushed at a certain interval, flush now if that interval has
+        # already passed since the last flush, and otherwise schedule a flush for later.
+        elif flush_policy == "interval":
+
+            interval_ms = max(0, output_settings["flush_interval_ms"])
+            elapsed_ms = (perf_counter() - self.last_flush_time) * 1000
+
+            if elapsed_ms >= interval_ms:
+                self.flush(file_path)
+            elif self.scheduled_flush_id is None and classes.time_stamper.root is not None:
+                self.scheduled_flush_id = classes.time_stamper.root.after(\
+                    max(1, int(interval_ms - elapsed_ms)), self.scheduled_flush)
+
+        # If flush_policy was not "note", "count" or "interval", raise a ValueError.
+        else:
+            raise ValueError("Setting flush_policy must be either",
+                            "\"note\", \"count\" or \"interval\".")
+
+    def scheduled_flush(self):
+        """This method is executed by the Tkinter event loop when a flush that was
+        scheduled by the "interval" flush policy is due. It flushes every output file."""
+
+        self.scheduled_flush_id = None
+        self.flush()
+
+    def cancel_scheduled_flush(self):
+        """This method cancels the flush that was scheduled by the "interval" flush policy."""
+
+        if self.scheduled_flush_id is not None:
+            try:
+                classes.time_stamper.root.after_cancel(self.scheduled_flush_id)
+            except (AttributeError, ValueError):
+                pass
+            self.scheduled_flush_id = None
+
+    def flush(self, file_path=None):
+        """This method flushes everything that has been written to the output file specified in
+        file_path to disk. If file_path is None, then ALL output files will be flushed. If the
+        "fsync" output setting is True, the operating system will also be asked to commit
+        the output file to the storage device instead of just keeping it in its cache."""
+
+        paths_to_flush = list(self.handles) if file_path is None else [file_path]
+
+        for path in paths_to_flush:
+
+            # Skip any output files that do not have an open handle
+            # or that have nothing new written to them since the last flush.
+            if path not in self.handles or not self.notes_since_flush[path]:
+                continue
+
+            handle = self.handles[path]
+            handle.flush()
+            if classes.settings["output"]["fsync"]:
+                fsync(handle.fileno())
+
+            self.notes_since_flush[path] = 0
+
+            # The size of the output file should now have grown by exactly the number of bytes
+            # that were just flushed. If it did not, then the output file was changed by
+            # something other than this program, so the state of its end must be reloaded.
+            tail_state = self.tail_states[path]
+            handle_stat = fstat(handle.fileno())
+            if handle_stat.st_size != tail_state["size"] + tail_state["unflushed_bytes"]:
+                self.reload_tail_state(path)
+            else:
+                tail_state["size"] = handle_stat.st_size
+                tail_state["mtime_ns"] = handle_stat.st_mtime_ns
+                tail_state["unflushed_bytes"] = 0
+
+        self.last_flush_time = perf_counter()
+
+    def reload_tail_state(self, file_path):
+        """This method records the last character, size and modification time of the output
+        file specified in file_path by reading them from disk. This method should only
+        be called when the output file is first opened or has been changed externally."""
+
+        tail_state = self.tail_states[file_path]
+        tail_state["last_character"] = self.read_last_character(file_path)
+        tail_state["unflushed_bytes"] = 0
+
+        handle_stat = fstat(self.handles[file_path].fileno())
+        tail_state["size"] = handle_stat.st_size
+        tail_state["mtime_ns"] = handle_stat.st_mtime_ns
+        tail_state["inode"] = (handle_stat.st_dev, handle_stat.st_ino)
+
+    def refresh_tail_state(self, file_path):
+        """This method checks whether the output file specified in file_path has been changed
+        by something other than this program (for instance, if it was edited in a text editor)
+        since its state was last recorded. The output file is only read again if such a
+        change is detected. If the output file was replaced by a different file at the same
+        path, the handle to the output file is reopened. This method does not need to be
+        called before every note, but should be called before the output file is rewritten."""
+
+        if file_path not in self.handles:
+            return
+
+        # Make sure that the output file on disk contains everything that has been written.
+        self.flush(file_path)
+
+        tail_state = self.tail_states[file_path]
+
+        # If the output file can no longer be found, there is nothing to refresh.
+        try:
+            path_stat = stat(file_path)
+        except OSError:
+            return
+
+        # If a different file now exists at the output path, reopen the handle.
+        if (path_stat.st_dev, path_stat.st_ino) != tail_state["inode"]:
+            self.close(file_path)
+            self.open(file_path, close_others=False)
+
+        # If the output file changed size or was modified, reload the state of its end.
+        elif path_stat.st_size != tail_state["size"] \
+            or path_stat.st_mtime_ns != tail_state["mtime_ns"]:
+            self.reload_tail_state(file_path)
+
+    def read_last_character(self, file_path):
+        """This method efficiently determines the last character in the output file
+        specified in file_path. If the output file is empty, this method will return None."""
+
+        # Open the file.
+        with open(file_path, "rb") as file:
+
+            # See if there is any text in the file.
+            try:
+                file.seek(-1, 2)
+
+            # If there is NO text currently in the file, return None.
+            except OSError:
+                return None
+
+            # If there IS text currently in the file, return the last character of the file.
+            return str(file.read(1), classes.settings["output"]["file_encoding"])
+
+    def last_character(self, file_path):
+        """This method returns the last character of the output file specified in file_path
+        (including anything that has been written to the output file but has not yet been
+        flushed) without reading the output file. If the output file is empty, this method
+        returns None. If there is no open handle to the output file, this method will
+        open one (which is the only case where this method will read the output file)."""
+
+        if not self.open(file_path, close_others=False):
+            return None
+
+        return self.tail_states[file_path]["last_character"]
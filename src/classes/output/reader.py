@@ -0,0 +1,124 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperOutputReader class which reads the header lines and
+notes of an output file through a memory map, without copying or decoding the output file."""
+
+from mmap import ACCESS_READ, mmap
+
+import classes
+from classes.output.notes_table import TimeStamperNotesTable
+from methods.timing import methods_timing_batch
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+class TimeStamperOutputReader():
+    """This class maps an output file into memory and finds the boundaries of its header lines
+    and notes directly in the mapped bytes. Header lines and notes are described by their
+    (offset, length) in bytes rather than being copied into strings, and are only decoded
+    when decode is called (or can be accessed without copying at all through view). This
+    means that reading an output file only allocates a small amount of memory per note,
+    and a note that spans many lines is found without joining those lines together.
+
+    The optional argument file_encoding defaults to the "file_encoding" output setting.
+    This class should be used as a context manager, and any memoryviews returned by view
+    must be released before the context is exited. Output files can only be read this way
+    if new lines are encoded as a single b"\\n" byte in the file encoding (see is_supported).
+    Lines are only split on b"\\n" (a lone carriage return does not begin a new line)."""
+
+    def __init__(self, file_path, file_encoding=None):
+
+        self.file_path = file_path
+        self.file_encoding = file_encoding or classes.settings["output"]["file_encoding"]
+
+        self.out_file = None
+        self.buffer = b""
+
+    def __enter__(self):
+
+        self.out_file = open(self.file_path, "rb")
+
+        # Map the output file into memory (an empty output file cannot be mapped).
+        try:
+            self.buffer = mmap(self.out_file.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            self.buffer = b""
+
+        return self
+
+    def __exit__(self, *_):
+
+        if isinstance(self.buffer, mmap):
+            self.buffer.close()
+        self.buffer = b""
+        self.out_file.close()
+
+    def __len__(self):
+        return len(self.buffer)
+
+    @staticmethod
+    def is_supported():
+        """This method determines whether the output file encoding allows output files to be
+        read by this class (i.e., whether a new line is encoded as a single b"\\n" byte)."""
+
+        return "\n".encode(classes.settings["output"]["file_encoding"]) == b"\n"
+
+    def index_notes(self, start=0, end=None, on_header=True):
+        """This method finds the header lines and notes in the bytes of the output file from start
+        (inclusive, which should be the beginning of a line) to end (exclusive, or the end of the
+        output file if end is None) and returns them as a TimeStamperNotesTable, which holds the
+        location, time and precision of every note in arrays of integers. The optional argument
+        on_header, which is set to True by default, determines whether any lines before the
+        first timestamped line should be treated as header lines."""
+
+        end = len(self.buffer) if end is None else end
+
+        # Find every note and its timestamp in a single scan of the bytes.
+        note_offsets, note_lengths, note_centiseconds, note_precisions = \
+            methods_timing_batch.find_notes(self.buffer, start, end, self.file_encoding)
+
+        # Record the location of each header line (the lines before the first note).
+        header_spans = []
+        header_end = note_offsets[0] if note_offsets else end
+        line_start = start
+        while on_header and line_start < header_end:
+            line_end = self.buffer.find(b"\n", line_start, header_end) + 1 or header_end
+            header_spans.append((line_start, line_end - line_start))
+            line_start = line_end
+
+        return TimeStamperNotesTable(header_spans, note_offsets, note_lengths, \
+            note_centiseconds, note_precisions)
+
+    def view(self, offset, length):
+        """This method returns a memoryview of the length bytes of the output file
+        starting at offset, without copying those bytes. The memoryview must be
+        released before the output file is closed (i.e., before the context is exited)."""
+
+        return memoryview(self.buffer)[offset:offset + length]
+
+    def decode(self, offset, length):
+        """This method decodes the length bytes of the output file starting at offset and
+        returns them as a string, translating new lines in the same way as an output file
+        opened in text mode would and adding a new line to the end if there is not one
+        already (which is how header lines and notes are represented elsewhere)."""
+
+        text = self.buffer[offset:offset + length].decode(self.file_encoding)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+        return text if text[-1:] == "\n" else f"{text}\n"
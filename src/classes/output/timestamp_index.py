@@ -0,0 +1,289 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperTimestampIndex class which maintains a sparse index
+of the timestamps in the current output file so that notes can be located by their time."""
+
+from array import array
+from bisect import bisect_left
+from json import dump, load
+from os import stat
+from os.path import basename, dirname, join
+
+import classes
+from classes.timing.timestamp import TimeStamperTimestamp
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+class TimeStamperTimestampIndex():
+    """This class maintains a sparse index of the timestamps in an output file. For every
+    "timestamp_index_stride"-th note in the output file, the index records the byte offset and
+    line number at which the note begins, along with the latest timestamp of any note BEFORE
+    it. Because that latest timestamp can only grow, the index can be binary searched even if
+    the notes in the output file are not in order, and finding the first note at or after a
+    certain time only requires reading at most one stride of notes from the output file.
+
+    The index is kept up to date as notes are written by the output writer and is saved in a
+    hidden sidecar file next to the output file. If the output file is changed by anything else
+    (or the sidecar file is out of date), this is detected and the index is rebuilt the next
+    time it is used. Output files can only be indexed if new lines are encoded as a single
+    b"\\n" byte in the file encoding (as is the case for UTF-8, for instance)."""
+
+    def __init__(self):
+
+        self.file_path = ""
+        self.reset("")
+
+    def reset(self, file_path):
+        """This method forgets everything that has been indexed and
+        starts a new, empty index for the output file specified in file_path."""
+
+        self.file_path = file_path
+        self.inode = None
+
+        # The sparse index: the latest timestamp (in centiseconds) of any note before
+        # each indexed note, and the byte offset and line number of each indexed note.
+        self.keys = array("q")
+        self.offsets = array("q")
+        self.line_numbers = array("q")
+
+        # The state of the scan through the output file. Bytes after the last new line
+        # that has been scanned are held in pending_bytes until their line is complete.
+        self.pending_offset = 0
+        self.pending_bytes = b""
+        self.fingerprint = b""
+        self.newline_count = 0
+        self.note_count = 0
+        self.latest_centiseconds = -1
+
+    def get_sidecar_path(self, file_path):
+        """This method returns the path to the sidecar file that
+        stores the index of the output file specified in file_path."""
+
+        return join(dirname(file_path), f".{basename(file_path)}.index")
+
+    def is_supported(self):
+        """This method determines whether the output file encoding allows output files to be
+        indexed (i.e., whether a new line is encoded as a single b"\\n" byte)."""
+
+        return "\n".encode(classes.settings["output"]["file_encoding"]) == b"\n"
+
+    def append(self, file_path, to_write, offset):
+        """This method is called by the output writer whenever the bytes in to_write are written
+        to the output file specified in file_path at the byte offset specified in offset. If the
+        index covers the output file up to that offset, the written bytes are indexed right away.
+        Otherwise, the index is left as it is and will be brought up to date when it is used."""
+
+        if file_path == self.file_path and offset == self.pending_offset + len(self.pending_bytes):
+            self.feed(to_write)
+
+    def feed(self, data):
+        """This method indexes the bytes in data, which should directly follow
+        the bytes that have already been indexed in the output file."""
+
+        data = self.pending_bytes + data
+        line_start = 0
+        stride = classes.settings["output"]["timestamp_index_stride"]
+        file_encoding = classes.settings["output"]["file_encoding"]
+
+        # Index every complete line.
+        newline_pos = data.find(b"\n")
+        while newline_pos != -1:
+
+            # If this line begins a note, record the note.
+            line = data[line_start:newline_pos]
+            timestamp = self.parse_note_start(line, file_encoding)
+            if timestamp is not None:
+
+                # Record every stride-th note in the index.
+                if self.note_count % stride == 0:
+                    self.keys.append(self.latest_centiseconds)
+                    self.offsets.append(self.pending_offset + line_start)
+                    self.line_numbers.append(self.newline_count)
+
+                self.note_count += 1
+                self.latest_centiseconds = max(self.latest_centiseconds, timestamp.centiseconds)
+
+            self.newline_count += 1
+            line_start = newline_pos + 1
+            newline_pos = data.find(b"\n", line_start)
+
+        # Hold on to the incomplete final line until it is completed.
+        self.fingerprint = (self.fingerprint + data[:line_start])[-64:]
+        self.pending_offset += line_start
+        self.pending_bytes = data[line_start:]
+
+    def parse_note_start(self, line, file_encoding):
+        """This method returns the TimeStamperTimestamp at the beginning of line (a line of an
+        output file, as bytes encoded with file_encoding), or None if line does not begin
+        with a timestamp (i.e., if it does not begin a note)."""
+
+        if line[:1] != b"[" or line.find(b"]") == -1:
+            return None
+
+        original_timestamp = line[:line.find(b"]") + 1].decode(file_encoding, errors="replace")
+        return TimeStamperTimestamp.parse(original_timestamp)
+
+    def scan(self, out_file):
+        """This method indexes everything in the open output file out_file
+        (which should be opened in binary mode) that has not yet been indexed."""
+
+        chunk_size = classes.template["text_log"]["index_chunk_size"]
+
+        # Discard the incomplete final line and scan it again from the output
+        # file, since it may have been completed since it was last scanned.
+        self.pending_bytes = b""
+        out_file.seek(self.pending_offset)
+
+        while True:
+            chunk = out_file.read(chunk_size)
+            if not chunk:
+                break
+            self.feed(chunk)
+
+    def fingerprint_matches(self, out_file):
+        """This method determines whether the bytes of the open output file out_file just before
+        the incomplete final line are still the bytes that were indexed there (if they are not,
+        the output file was changed by something other than the output writer)."""
+
+        fingerprint_start = self.pending_offset - len(self.fingerprint)
+        out_file.seek(fingerprint_start)
+        return out_file.read(len(self.fingerprint)) == self.fingerprint
+
+    def ensure_current(self, file_path):
+        """This method brings the index of the output file specified in file_path up to date,
+        loading the index from its sidecar file if the index is not already in memory, scanning
+        any part of the output file that has not yet been indexed and rebuilding the index
+        from scratch if the output file has changed. This method returns True if the index
+        is up to date, or False if the output file could not be indexed."""
+
+        if not self.is_supported():
+            return False
+
+        # Make sure that every note written so far has been flushed to the output file.
+        classes.output_writer.flush(file_path)
+
+        try:
+            path_stat = stat(file_path)
+        except OSError:
+            return False
+
+        # If a different output file was indexed last, load the index from the sidecar file.
+        if file_path != self.file_path:
+            self.load(file_path)
+
+        with open(file_path, "rb") as out_file:
+
+            # If the output file was replaced, shrank or no longer matches what was indexed,
+            # rebuild the index from scratch. Otherwise, only scan the part of the output
+            # file that has not been indexed yet.
+            if (path_stat.st_dev, path_stat.st_ino) != self.inode \
+                or path_stat.st_size < self.pending_offset or not self.fingerprint_matches(out_file):
+                self.reset(file_path)
+                self.inode = (path_stat.st_dev, path_stat.st_ino)
+
+            self.scan(out_file)
+
+        return True
+
+    def seek(self, file_path, centiseconds):
+        """This method finds the first note in the output file specified in file_path (in
+        the order of the output file) whose timestamp is at or after the time specified in
+        centiseconds. This method returns a tuple of the form (byte_offset, line_number)
+        describing where that note begins, (None, None) if there is no such note, or None
+        if the output file could not be indexed. Finding the note only takes a binary
+        search of the index and a scan through at most one stride of notes."""
+
+        if not self.ensure_current(file_path):
+            return None
+
+        # Find the last indexed note before which no note is at or after the requested time.
+        entry_index = bisect_left(self.keys, centiseconds) - 1
+        if entry_index < 0:
+            return None, None
+
+        file_encoding = classes.settings["output"]["file_encoding"]
+        line_number = self.line_numbers[entry_index]
+
+        # Scan forward from that note until a note at or after the requested time is found.
+        with open(file_path, "rb") as out_file:
+
+            out_file.seek(self.offsets[entry_index])
+            line_offset = self.offsets[entry_index]
+
+            for line in out_file:
+                timestamp = self.parse_note_start(line, file_encoding)
+                if timestamp is not None and timestamp.centiseconds >= centiseconds:
+                    return line_offset, line_number
+                line_offset += len(line)
+                line_number += 1
+
+        return None, None
+
+    def load(self, file_path):
+        """This method loads the index of the output file specified in file_path from its
+        sidecar file. If the sidecar file does not exist or cannot be read, the index is
+        reset (and will be rebuilt from scratch by ensure_current)."""
+
+        self.reset(file_path)
+
+        try:
+            with open(self.get_sidecar_path(file_path), "r", encoding="utf-8") as sidecar_file:
+                sidecar = load(sidecar_file)
+            self.inode = tuple(sidecar["inode"])
+            self.keys = array("q", sidecar["keys"])
+            self.offsets = array("q", sidecar["offsets"])
+            self.line_numbers = array("q", sidecar["line_numbers"])
+            self.pending_offset = sidecar["pending_offset"]
+            self.fingerprint = bytes.fromhex(sidecar["fingerprint"])
+            self.newline_count = sidecar["newline_count"]
+            self.note_count = sidecar["note_count"]
+            self.latest_centiseconds = sidecar["latest_centiseconds"]
+            if sidecar["stride"] != classes.settings["output"]["timestamp_index_stride"]:
+                self.reset(file_path)
+
+        except (OSError, ValueError, KeyError, TypeError):
+            self.reset(file_path)
+
+    def save(self, file_path=None):
+        """This method saves the index to the sidecar file next to the output file that it indexes
+        (but only if the index is for the output file specified in file_path, if it is provided).
+        If the sidecar file cannot be written, the index will simply be rebuilt when needed."""
+
+        if not self.file_path or self.inode is None \
+            or (file_path is not None and file_path != self.file_path):
+            return
+
+        sidecar = {
+            "stride": classes.settings["output"]["timestamp_index_stride"],
+            "inode": list(self.inode),
+            "keys": self.keys.tolist(),
+            "offsets": self.offsets.tolist(),
+            "line_numbers": self.line_numbers.tolist(),
+            "pending_offset": self.pending_offset,
+            "fingerprint": self.fingerprint.hex(),
+            "newline_count": self.newline_count,
+            "note_count": self.note_count,
+            "latest_centiseconds": self.latest_centiseconds
+        }
+
+        try:
+            with open(self.get_sidecar_path(self.file_path), "w", encoding="utf-8") as sidecar_file:
+                dump(sidecar, sidecar_file)
+        except OSError:
+            pass
@@ -0,0 +1,107 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperStartupReport class which times each stage of the Time
+Stamper program's startup, along with the work that is deferred until it is first needed."""
+
+from time import perf_counter_ns
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The moment that this module was imported (this module is the first one that the classes
+# package imports), which is treated as the moment that the program started.
+STARTUP_NS = perf_counter_ns()
+
+# The stage of the startup after which the program is ready to be used.
+READY_STAGE = "ready"
+
+
+class TimeStamperStartupReport():
+    """This class records how long after the program started each stage of its startup was
+    reached (see mark), and how long each piece of work that is deferred until it is first
+    needed took (see record_deferred), such as loading libvlc once a media file is first
+    selected. Its report shows how much longer startup would have taken if that work were
+    still done up front."""
+
+    def __init__(self):
+
+        self.stages = []
+        self.deferred = []
+
+        # The program's modules have all been imported by the time that this class is created.
+        self.mark("imported modules")
+
+    def mark(self, stage):
+        """This method records that the startup has reached the stage stage (if it has not
+        already reached it), along with how long after the program started it did so."""
+
+        if not self.has_reached(stage):
+            self.stages.append((stage, perf_counter_ns() - STARTUP_NS))
+
+    def has_reached(self, stage):
+        """This method returns whether the startup has reached the stage stage."""
+
+        return any(reached_stage == stage for reached_stage, _ in self.stages)
+
+    def record_deferred(self, task, duration_ns):
+        """This method records that the deferred work task (which is only done the first time
+        that it is needed) took duration_ns nanoseconds, and finished just now."""
+
+        self.deferred.append((task, duration_ns, perf_counter_ns() - STARTUP_NS))
+
+    def format_report(self):
+        """This method returns a printable report of the stages of the startup, with how long
+        after the program started (and after the previous stage) each stage was reached,
+        followed by the deferred work and how long it took."""
+
+        lines = ["Startup:"]
+
+        label_width = max(len(label) for label, *_ in self.stages + self.deferred)
+        previous_ns = 0
+        for stage, elapsed_ns in self.stages:
+            lines.append(f"  {stage:<{label_width}}  {elapsed_ns / 1000000:>9.1f} ms  " \
+                f"(+{(elapsed_ns - previous_ns) / 1000000:.1f} ms)")
+            previous_ns = elapsed_ns
+
+        lines.extend(["", "Deferred until first needed:"])
+        if not self.deferred:
+            lines.append("  Nothing yet (libvlc is loaded once a media file is first selected).")
+            return "\n".join(lines)
+
+        for task, duration_ns, finished_ns in self.deferred:
+            lines.append(f"  {task:<{label_width}}  {duration_ns / 1000000:>9.1f} ms  " \
+                f"(finished at {finished_ns / 1000000:.1f} ms)")
+
+        # Compare the startup against the startup that doing the deferred work up front would
+        # have made, unless the deferred work was needed during the startup anyway (e.g.,
+        # because a default media file is set).
+        lines.append("")
+        ready_ns = next((elapsed_ns for stage, elapsed_ns in self.stages \
+            if stage == READY_STAGE), None)
+        deferred_ns = sum(duration_ns for _, duration_ns, _ in self.deferred)
+
+        if ready_ns is None:
+            lines.append("The program is still starting up.")
+        elif any(finished_ns <= ready_ns for *_, finished_ns in self.deferred):
+            lines.append("The deferred work was done during the startup, because it was " \
+                "needed then (e.g., a default media file is set).")
+        else:
+            lines.append(f"Deferring this work saved {deferred_ns / 1000000:.1f} ms: the " \
+                f"program was ready after {ready_ns / 1000000:.1f} ms instead of " \
+                f"{(ready_ns + deferred_ns) / 1000000:.1f} ms.")
+
+        return "\n".join(lines)
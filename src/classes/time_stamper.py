@@ -4,7 +4,6 @@ should create an instance of this TimeStamper class and then call that instance'
 
 from sys import platform
 from tkinter import Button, Menu
-from vlc import MediaPlayer
 
 import classes
 
@@ -34,8 +33,7 @@ class TimeStamper():
     def __init__(self):
         self.root = None
         self.output_path = ""
-        self.media_player = MediaPlayer()
-        self.log_file = None
+        self.media_player = None
         self.play_press_time = 0.0
 
     def remove_func(self):
@@ -63,8 +61,11 @@ class TimeStamper():
     def run(self):
         """This method runs the Time Stamper program."""
 
+        classes.startup_report.mark("created singletons")
+
         # Create the main window and all of its widgets.
         self.root = classes.widgets.create_entire_window("window_main", is_main_window=True)
+        classes.startup_report.mark("created the main window")
 
         # Ensure that the initial timestamp format matches user specifications.
         classes.timer.update_timestamp(truncate_to=2)
@@ -89,4 +90,9 @@ class TimeStamper():
         classes.macros["button_media_select"](\
             file_full_path=classes.settings["media"]["path"], erase_if_empty=True)
 
+        # The program is ready once its main loop has started.
+        self.root.after_idle(classes.startup_report.mark, "ready")
         self.root.mainloop()
+
+        # Flush and close the handles to all output files once the program has exited.
+        classes.output_writer.close()
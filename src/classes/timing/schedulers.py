@@ -0,0 +1,187 @@
+#-*- coding: utf-8 -*-
+"""This module contains the schedulers that a TimeStamperTimerCore can run on. A scheduler
+provides the timer with a clock (clock_ns), a way to run a callback after a delay (call_later)
+and a way to cancel a callback that has not run yet (cancel)."""
+
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter_ns
+
+import classes
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The number of nanoseconds in a millisecond.
+NANOSECONDS_PER_MILLISECOND = 1000000
+
+
+class TimeStamperTkScheduler():
+    """This class schedules callbacks on a Tkinter root with root.after and root.after_cancel,
+    and reads the time with perf_counter_ns. If no root is provided, the root of the Time
+    Stamper program is used (which is looked up when it is needed, since the timer is created
+    before the root is)."""
+
+    def __init__(self, root=None):
+
+        self.root = root
+
+    def get_root(self):
+        """This method returns the Tkinter root that callbacks are scheduled on."""
+
+        return self.root if self.root is not None else classes.time_stamper.root
+
+    def clock_ns(self):
+        """This method returns the current reading of the scheduler's clock in nanoseconds."""
+
+        return perf_counter_ns()
+
+    def call_later(self, delay_ms, callback, *args):
+        """This method schedules callback to be called with args after delay_ms milliseconds
+        and returns an identifier that can be passed to cancel."""
+
+        return self.get_root().after(delay_ms, callback, *args)
+
+    def cancel(self, scheduled_id):
+        """This method cancels the callback identified by scheduled_id (see call_later)."""
+
+        self.get_root().after_cancel(scheduled_id)
+
+
+class TimeStamperAsyncioScheduler():
+    """This class schedules callbacks on an asyncio event loop with loop.call_later, and reads
+    the time with perf_counter_ns. If no loop is provided, the loop that is running when a
+    callback is first scheduled is used."""
+
+    def __init__(self, loop=None):
+
+        self.loop = loop
+
+    def get_loop(self):
+        """This method returns the asyncio event loop that callbacks are scheduled on."""
+
+        if self.loop is None:
+            # Imported here, since most of the program never schedules anything with asyncio.
+            from asyncio import get_running_loop
+            self.loop = get_running_loop()
+
+        return self.loop
+
+    def clock_ns(self):
+        """This method returns the current reading of the scheduler's clock in nanoseconds."""
+
+        return perf_counter_ns()
+
+    def call_later(self, delay_ms, callback, *args):
+        """This method schedules callback to be called with args after delay_ms milliseconds
+        and returns an identifier (an asyncio.TimerHandle) that can be passed to cancel."""
+
+        return self.get_loop().call_later(delay_ms / 1000, callback, *args)
+
+    def cancel(self, scheduled_id):
+        """This method cancels the callback identified by scheduled_id (see call_later)."""
+
+        scheduled_id.cancel()
+
+
+class TimeStamperVirtualScheduler():
+    """This class runs a virtual clock that only moves when it is told to (see advance and
+    run_until_idle), running every callback that was scheduled for a moment that the clock
+    moves past at that moment. This allows a timer to be run headlessly and far faster than
+    real time (e.g., to simulate many playback sessions in a row). The optional argument
+    lateness_ms (0 by default) delays every callback by that many milliseconds more than it
+    asked for, which simulates a busy event loop."""
+
+    def __init__(self, start_ns=0, lateness_ms=0):
+
+        self.now_ns = start_ns
+        self.lateness_ms = lateness_ms
+
+        # The scheduled callbacks, as a heap of (due time, identifier, callback, args) tuples.
+        self.queue = []
+        self.identifiers = count(1)
+        self.cancelled_ids = set()
+
+    def __len__(self):
+        return len(self.queue) - len(self.cancelled_ids)
+
+    def clock_ns(self):
+        """This method returns the current reading of the scheduler's clock in nanoseconds."""
+
+        return self.now_ns
+
+    def call_later(self, delay_ms, callback, *args):
+        """This method schedules callback to be called with args after delay_ms milliseconds
+        (plus the scheduler's lateness) and returns an identifier that can be passed to cancel."""
+
+        scheduled_id = next(self.identifiers)
+        due_ns = self.now_ns + (delay_ms + self.lateness_ms) * NANOSECONDS_PER_MILLISECOND
+        heappush(self.queue, (due_ns, scheduled_id, callback, args))
+
+        return scheduled_id
+
+    def cancel(self, scheduled_id):
+        """This method cancels the callback identified by scheduled_id (see call_later)."""
+
+        if any(queued[1] == scheduled_id for queued in self.queue):
+            self.cancelled_ids.add(scheduled_id)
+
+    def run_next(self, until_ns=None):
+        """This method moves the clock to the next scheduled callback and runs it, unless that
+        callback is due after until_ns. It returns whether a callback was run."""
+
+        while self.queue:
+
+            due_ns, scheduled_id, callback, args = self.queue[0]
+            if until_ns is not None and due_ns > until_ns:
+                return False
+
+            heappop(self.queue)
+            if scheduled_id in self.cancelled_ids:
+                self.cancelled_ids.discard(scheduled_id)
+                continue
+
+            self.now_ns = max(self.now_ns, due_ns)
+            callback(*args)
+            return True
+
+        return False
+
+    def advance(self, milliseconds):
+        """This method moves the clock forward by the provided number of milliseconds, running
+        every callback that is due along the way (including those that those callbacks schedule).
+        The number of callbacks that were run is returned."""
+
+        until_ns = self.now_ns + round(milliseconds * NANOSECONDS_PER_MILLISECOND)
+        callbacks_run = 0
+
+        while self.run_next(until_ns):
+            callbacks_run += 1
+
+        self.now_ns = until_ns
+        return callbacks_run
+
+    def run_until_idle(self, max_callbacks=1000000):
+        """This method runs scheduled callbacks (moving the clock to each of them in turn)
+        until none are left or max_callbacks have been run, and returns the number run."""
+
+        callbacks_run = 0
+        while callbacks_run < max_callbacks and self.run_next():
+            callbacks_run += 1
+
+        return callbacks_run
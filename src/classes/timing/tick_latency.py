@@ -0,0 +1,156 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperTickLatency class which measures how late the
+timer's ticks are and compensates for that lateness when the next tick is scheduled."""
+
+from datetime import datetime
+from json import dump
+from platform import platform, python_version
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The upper bounds (in milliseconds, exclusive) of the buckets of the histogram of tick
+# lateness. A final bucket holds every tick that is later than the last of these bounds.
+BUCKET_BOUNDS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# How strongly the most recent overshoot of root.after affects the average overshoot.
+OVERSHOOT_SMOOTHING = 0.1
+
+
+class TimeStamperTickLatency():
+    """This class keeps a histogram of how late the timer's ticks are (i.e., how long after
+    the moment that they were meant to run at they actually ran, as measured with
+    perf_counter_ns). It also keeps an average of how long root.after overshoots the delay
+    that it is given by, which is subtracted from the delay of the next tick so that ticks
+    run when they are meant to even while the event loop is busy (see get_compensated_delay)."""
+
+    def __init__(self):
+
+        self.bucket_counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.tick_count = 0
+        self.total_lateness_ns = 0
+        self.max_lateness_ns = 0
+
+        self.average_overshoot_ms = 0.0
+
+    def reset(self):
+        """This method clears the histogram and the average overshoot."""
+
+        self.__init__()
+
+    def record(self, lateness_ns, overshoot_ns):
+        """This method records a tick that ran lateness_ns nanoseconds after the moment that it was
+        meant to run at, and overshoot_ns nanoseconds after the delay that root.after was given."""
+
+        lateness_ns = max(0, lateness_ns)
+        lateness_ms = lateness_ns / 1000000
+
+        # Add the tick to the first bucket whose upper bound it is below.
+        bucket = len(BUCKET_BOUNDS_MS)
+        for i, bound in enumerate(BUCKET_BOUNDS_MS):
+            if lateness_ms < bound:
+                bucket = i
+                break
+        self.bucket_counts[bucket] += 1
+
+        self.tick_count += 1
+        self.total_lateness_ns += lateness_ns
+        self.max_lateness_ns = max(self.max_lateness_ns, lateness_ns)
+
+        # Update the average overshoot of root.after.
+        self.average_overshoot_ms += \
+            (max(0, overshoot_ns) / 1000000 - self.average_overshoot_ms) * OVERSHOOT_SMOOTHING
+
+    def get_compensated_delay(self, interval_ms):
+        """This method returns the delay in milliseconds that root.after should be given for the
+        next tick to run interval_ms milliseconds from now, given how much root.after has been
+        overshooting its delays recently. The delay is always at least one millisecond."""
+
+        return max(1, round(interval_ms - self.average_overshoot_ms))
+
+    def get_percentile(self, percentile):
+        """This method returns the upper bound in milliseconds of the bucket that holds the
+        tick at the given percentile (from 0 to 100) of lateness, or None if no ticks have been
+        recorded. If that tick is in the final bucket, the latest tick's lateness is returned."""
+
+        if not self.tick_count:
+            return None
+
+        target = self.tick_count * percentile / 100
+        running_count = 0
+        for i, count in enumerate(self.bucket_counts[:-1]):
+            running_count += count
+            if running_count >= target:
+                return BUCKET_BOUNDS_MS[i]
+
+        return self.max_lateness_ns / 1000000
+
+    def to_dict(self):
+        """This method returns the histogram and its summary statistics as a dictionary,
+        along with a description of the machine that they were recorded on."""
+
+        bucket_labels = [f"<{bound} ms" for bound in BUCKET_BOUNDS_MS]
+        bucket_labels.append(f">={BUCKET_BOUNDS_MS[-1]} ms")
+
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": python_version(),
+            "platform": platform(),
+            "ticks": self.tick_count,
+            "mean_ms": self.total_lateness_ns / self.tick_count / 1000000 \
+                if self.tick_count else None,
+            "max_ms": self.max_lateness_ns / 1000000,
+            "p50_ms": self.get_percentile(50),
+            "p95_ms": self.get_percentile(95),
+            "p99_ms": self.get_percentile(99),
+            "average_overshoot_ms": self.average_overshoot_ms,
+            "buckets": dict(zip(bucket_labels, self.bucket_counts))
+        }
+
+    def format_report(self, bar_width=40):
+        """This method returns a printable report of the histogram, with a bar of up to
+        bar_width characters for each bucket, followed by its summary statistics."""
+
+        summary = self.to_dict()
+        if not self.tick_count:
+            return "No ticks have been recorded yet. Run the timer and refresh this report."
+
+        largest_count = max(self.bucket_counts)
+        label_width = max(len(label) for label in summary["buckets"])
+        lines = []
+
+        for label, count in summary["buckets"].items():
+            bar_length = round(count / largest_count * bar_width) if largest_count else 0
+            lines.append(f"{label:>{label_width}}  {'#' * bar_length:<{bar_width}}  {count}")
+
+        lines.append("")
+        lines.append(f"Ticks: {self.tick_count}")
+        lines.append(f"Mean lateness: {summary['mean_ms']:.2f} ms")
+        lines.append(f"Max lateness: {summary['max_ms']:.2f} ms")
+        for percentile in ("p50", "p95", "p99"):
+            lines.append(f"{percentile} lateness: at most {summary[f'{percentile}_ms']:g} ms")
+        lines.append(f"Average root.after overshoot: {self.average_overshoot_ms:.2f} ms")
+
+        return "\n".join(lines)
+
+    def dump(self, file_path):
+        """This method writes the histogram and its summary statistics (see to_dict) to
+        the file specified in file_path as JSON, so that machines can be compared."""
+
+        with open(file_path, "w", encoding="utf-8") as dump_file:
+            dump(self.to_dict(), dump_file, indent=4)
@@ -0,0 +1,413 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperTimerCore class which keeps track of time in the
+Time Stamper program without depending on Tkinter, the program's widgets or libvlc."""
+
+from math import ceil
+
+from classes.timing.tick_latency import TimeStamperTickLatency
+from classes.timing.timestamp import TimeStamperTimestamp
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The number of nanoseconds in a second, in a centisecond and in a millisecond.
+NANOSECONDS_PER_SECOND = 1000000000
+NANOSECONDS_PER_CENTISECOND = 10000000
+NANOSECONDS_PER_MILLISECOND = 1000000
+
+# The greatest time in seconds that the timer can display (99h 59m 59.99s).
+MAX_TIME = 359999.99
+
+
+class TimeStamperTimerCore():
+    """This class runs a timer with pause, resume, rewind, fast-forward, skip backward and skip
+    forward features on a scheduler (see schedulers.py), which provides the timer's clock and runs
+    its ticks. The timer keeps its own clock: the time that it currently displays (a whole number
+    of centiseconds) along with, while it is running, the reading of the scheduler's clock when
+    it started running (start_ns), the time in nanoseconds that it started running from
+    (offset_ns) and the speed that it is running at (multiplier). While the timer is running, its
+    current time is computed from the clock whenever it is read (so timestamps are exact to the
+    centisecond), while it only ticks (i.e., redraws its displayed time) when its displayed time
+    changes and no more often than display_refresh_rate (in ticks per second, where 0 means no
+    limit) allows. How late each tick runs is measured and compensated for when the next tick is
+    scheduled (see tick_latency).
+
+    This class does not display the time anywhere or play any media. TimeStamperTimer in
+    timing.py extends it with the program's widgets and media player by overriding the methods
+    render_time, on_tick, on_start, on_pause, on_time_changed, on_bound_reached, is_media_playing,
+    get_max_time and get_display_refresh_rate, which do nothing (or the simplest thing) here."""
+
+    def __init__(self, scheduler, max_time=MAX_TIME, display_refresh_rate=0):
+
+        self.scheduler = scheduler
+        self.max_time = max_time
+        self.display_refresh_rate = display_refresh_rate
+
+        self.is_running = False
+        self.temporary_pause = False
+        self.start_ns = 0
+        self.offset_ns = 0
+        self.multiplier = 0.0
+        self.centiseconds = 0
+
+        self.scheduled_id = None
+        self.tick_id = None
+
+        self.tick_latency = TimeStamperTickLatency()
+        self.tick_deadline_ns = None
+        self.tick_after_deadline_ns = None
+
+    def get_max_time(self):
+        """This method returns the timer's current maximum time in seconds."""
+
+        return self.max_time
+
+    def get_display_refresh_rate(self):
+        """This method returns the greatest number of times per second that the running timer
+        should tick, where 0 means that it should tick whenever its displayed time changes."""
+
+        return self.display_refresh_rate
+
+    def is_media_playing(self):
+        """This method returns whether media is playing alongside the timer (which lets the
+        timer keep running at a time of 0 while the media catches up)."""
+
+        return False
+
+    def render_time(self, timestamp, pad):
+        """This method is called with a TimeStamperTimestamp whenever the timer's displayed
+        time is set (see display_time), so that it can be shown to the user with each of its
+        values padded to pad digits."""
+
+    def on_tick(self, timestamp):
+        """This method is called with the displayed TimeStamperTimestamp on every tick."""
+
+    def on_start(self, current_time_seconds):
+        """This method is called when the timer starts running (after its multiplier has been
+        set) with the time in seconds that it starts running from."""
+
+    def on_pause(self):
+        """This method is called whenever the timer is paused."""
+
+    def on_time_changed(self, new_time):
+        """This method is called with the new time in seconds whenever the timer is moved to
+        a new time (see update_timer)."""
+
+    def on_bound_reached(self):
+        """This method is called when the running timer reaches 0 or its maximum time."""
+
+        self.pause()
+
+    def get_current_centiseconds(self):
+        """This method returns the timer's current time in centiseconds. While the timer is
+        running, this is computed from the timer's clock (and kept between 0 and the maximum
+        time), so it may be ahead of the time that was last displayed."""
+
+        if self.is_running and self.multiplier != 0.0:
+            running_centiseconds = TimeStamperTimestamp.from_seconds(\
+                self.get_running_time()).centiseconds
+            return min(running_centiseconds, round(self.get_max_time() * 100))
+
+        return self.centiseconds
+
+    def read_timestamp(self):
+        """This method returns the timer's current time as a TimeStamperTimestamp."""
+
+        return TimeStamperTimestamp(self.get_current_centiseconds())
+
+    def get_current_seconds(self):
+        """This method returns the timer's current time in seconds."""
+
+        return self.get_current_centiseconds() / 100
+
+    def get_running_time(self):
+        """This method returns the precise time in seconds that the timer has run to since it
+        started running (which the currently displayed time is rounded from)."""
+
+        return (self.offset_ns + (self.scheduler.clock_ns() - self.start_ns) * self.multiplier) \
+            / NANOSECONDS_PER_SECOND
+
+    def display_time(self, new_time, pad=2):
+        """This method sets the timer's displayed time to the provided time in seconds (rounded
+        to the nearest centisecond) and renders it with each of its values padded to pad digits
+        (see render_time). The displayed time is returned as a TimeStamperTimestamp."""
+
+        timestamp = TimeStamperTimestamp.from_seconds(new_time)
+
+        # Update the timer's clock before rendering the time, so that
+        # anything that reads the timer while it is rendered reads the new time.
+        self.centiseconds = timestamp.centiseconds
+        self.render_time(timestamp, pad)
+
+        # Rendering the time may have read a partially rendered time
+        # into the timer's clock, so set the timer's clock once more.
+        self.centiseconds = timestamp.centiseconds
+
+        return timestamp
+
+    def update_timer(self, new_time):
+        """This method updates the timer to the new time passed
+        in new_time (which should be a time in seconds)."""
+
+        # Move the offset by the difference between the new
+        # time and the time we are adjusting FROM.
+        self.offset_ns += round(new_time * NANOSECONDS_PER_SECOND) \
+            - self.get_current_centiseconds() * NANOSECONDS_PER_CENTISECOND
+
+        # Display the new time.
+        self.display_time(new_time, pad=2)
+        self.on_time_changed(new_time)
+
+    def timer_tick(self, prev_multiplier):
+        """This method runs continuously while the timer is running to update the current time."""
+
+        # This tick is no longer pending.
+        self.tick_id = None
+
+        # Record how late this tick is (if it was scheduled by a previous tick).
+        if self.tick_deadline_ns is not None and self.multiplier == prev_multiplier:
+            tick_ns = self.scheduler.clock_ns()
+            self.tick_latency.record(\
+                tick_ns - self.tick_deadline_ns, tick_ns - self.tick_after_deadline_ns)
+            self.tick_deadline_ns = None
+
+        # Only tick the timer if it is currently running.
+        if self.is_running and self.multiplier != 0.0:
+
+            internal_time = self.get_running_time()
+
+            # Only tick the timer if its current time is less than the maximum time.
+            if internal_time < self.get_max_time() or self.multiplier < 0.0:
+
+                # Only tick the timer if the precise internal time is greater than 0, if it
+                # is running forwards (in which case it can only be at 0 if no time has passed
+                # on the scheduler's clock yet) or if media is playing alongside it.
+                if internal_time > 0.0 or self.multiplier > 0.0 or self.is_media_playing():
+
+                    # Display the updated time.
+                    displayed_time = self.display_time(internal_time, pad=2)
+                    self.on_tick(displayed_time)
+
+                    # After the next centisecond has elapsed (or, if the display would be
+                    # redrawn too often, after a longer interval), tick the timer again. The
+                    # delay given to the scheduler is shortened by how much the scheduler has
+                    # been overshooting its delays recently, so the next tick runs on time.
+                    if self.multiplier == prev_multiplier:
+                        self.schedule_tick(self.get_tick_interval(internal_time))
+
+                # If the timer's current time is not greater than 0, stop the timer at 0.
+                else:
+                    self.display_time(0.0, pad=2)
+                    self.on_bound_reached()
+
+            # If the timer's current time is not less than the
+            # maximum time, stop the timer at the maximum time.
+            else:
+                self.display_time(self.get_max_time(), pad=2)
+                self.on_bound_reached()
+
+    def get_tick_interval(self, internal_time):
+        """This method returns the number of milliseconds after which the running timer should
+        next tick, given its precise internal time in seconds. The timer ticks when its displayed
+        time next changes, but never more often than the display refresh rate allows."""
+
+        # Calculate the number of seconds to the next centisecond.
+        next_centisecond = (int(internal_time * 100) + int(self.multiplier > 0.0)) / 100
+        seconds_to_next_tick = abs(next_centisecond - internal_time)
+
+        # Convert the number of seconds to the next centisecond
+        # the number of milliseconds to the next centisecond.
+        milliseconds_to_next_tick = max(seconds_to_next_tick, .001) * 1000
+
+        # Consider the time dilation from rewinding/fast-forwarding when
+        # calculating the number of milliseconds to the next centisecond.
+        milliseconds_to_next_tick = ceil(milliseconds_to_next_tick * abs(1 / self.multiplier))
+
+        # Do not tick more often than the display refresh rate allows.
+        refresh_rate = self.get_display_refresh_rate()
+        if refresh_rate > 0:
+            milliseconds_to_next_tick = max(milliseconds_to_next_tick, ceil(1000 / refresh_rate))
+
+        return milliseconds_to_next_tick
+
+    def schedule_tick(self, interval_ms):
+        """This method schedules the timer to tick again interval_ms milliseconds from now,
+        compensating for the recent lateness of the scheduler (see TimeStamperTickLatency)."""
+
+        delay_ms = self.tick_latency.get_compensated_delay(interval_ms)
+        scheduled_ns = self.scheduler.clock_ns()
+
+        # Record when the next tick is meant to run and when the scheduler should run it.
+        self.tick_deadline_ns = scheduled_ns + interval_ms * NANOSECONDS_PER_MILLISECOND
+        self.tick_after_deadline_ns = scheduled_ns + delay_ms * NANOSECONDS_PER_MILLISECOND
+
+        self.tick_id = self.scheduler.call_later(delay_ms, self.timer_tick, self.multiplier)
+
+    def cancel_tick(self):
+        """This method cancels the timer's pending tick (if there is one), so that
+        pausing and restarting the timer never leaves more than one tick pending."""
+
+        if self.tick_id is not None:
+            self.scheduler.cancel(self.tick_id)
+            self.tick_id = None
+            self.tick_deadline_ns = None
+
+    def pause(self, play_delay=None):
+        """This method halts the timer. An optional argument, play_delay (which is set to None
+        by default), determines the amount of time in seconds after which the timer should resume
+        (at its previous speed) once it is paused. If play_delay is 0, the timer is paused
+        temporarily but is not scheduled to resume (so it keeps its speed for when it is next
+        started with start). Note that play_delay only has an effect if this method is called
+        when the timer is already running or is scheduled to run."""
+
+        # Only pause the timer if it is currently running/scheduled to run.
+        if self.is_running or self.scheduled_id:
+
+            # The displayed time may not have been redrawn since the timer's
+            # last centisecond, so display the exact time that it is paused at.
+            if self.is_running and self.multiplier != 0.0:
+                self.display_time(self.get_current_seconds(), pad=2)
+
+            # Stop the timer from ticking.
+            self.cancel_tick()
+
+            # If a play delay was provided, initiate a temporary pause.
+            if play_delay:
+
+                # Record that the timer is only being paused temporarily.
+                self.temporary_pause = True
+
+                # If there is an existing scheduled start, then it should be cancelled,
+                # as this effectively means that the time is still being edited.
+                if self.scheduled_id:
+                    self.scheduler.cancel(self.scheduled_id)
+
+                # If a positive play delay was provided, schedule
+                # the timer to start after the play delay.
+                if play_delay > 0:
+                    self.scheduled_id = \
+                        self.scheduler.call_later(int(play_delay * 1000), self.start)
+
+                # If a positive play delay was not provided, keep the timer
+                # paused until it is explicitly started again.
+                else:
+                    self.scheduled_id = None
+
+            # If no play delay was provided, the timer should stay
+            # paused until it is explicitly started again.
+            else:
+                self.multiplier = 0.0
+
+            # Declare the timer as not running.
+            self.is_running = False
+
+            self.on_pause()
+
+    def start(self, new_multiplier=None):
+        """This method starts the timer running at the speed new_multiplier (e.g., 1.0 to play,
+        a negative number to rewind or a number greater than 1.0 to fast-forward). If
+        new_multiplier is None (the default), the timer's speed is not altered from its
+        current value. The speed that the timer is now running at is returned."""
+
+        self.scheduled_id = None
+        self.temporary_pause = False
+
+        # Determine the new multiplier.
+        if new_multiplier is None:
+            new_multiplier = self.multiplier
+
+        # Only start the timer if it is not already running
+        # at the speed we would like to set it to.
+        if not self.is_running or new_multiplier != self.multiplier:
+
+            # Pause the timer if it is currently running.
+            self.pause()
+
+            # Get the timer's current time in seconds.
+            current_time_seconds = self.get_current_seconds()
+
+            # Declare the timer as running.
+            self.is_running = True
+
+            # Set the new multiplier.
+            self.multiplier = new_multiplier
+
+            self.on_start(current_time_seconds)
+
+            # Save the current raw time.
+            self.start_ns = self.scheduler.clock_ns()
+
+            # Factor the current reading on the timer into the
+            # offset for the calculation of the running time.
+            self.offset_ns = self.centiseconds * NANOSECONDS_PER_CENTISECOND
+
+            # Begin ticking the timer (this first tick was not scheduled, so it is never late).
+            self.cancel_tick()
+            self.tick_deadline_ns = None
+            self.timer_tick(self.multiplier)
+
+        # Return the rate at which the timer is now running.
+        return new_multiplier
+
+    def adjust_timer(self, seconds_to_adjust_by, abort_if_out_of_bounds=False):
+        """This method takes an integer (seconds_to_adjust_by) representing the desired
+        number of seconds to adjust the timer by. When the optional argument
+        abort_if_out_of_bounds is set to True, this method will return the provided number
+        of seconds if adjusting the timer by that amount would not put the timer out of
+        bounds, and return 0 otherwise. When abort_if_out_of_bounds is set to False, this
+        method will return the provided number of seconds if adjusting the timer by that
+        amount would not put the timer out of bounds, and otherwise will return a reduced
+        version of the provided number of seconds representing the maximum number of seconds
+        the timer could be adjusted by without putting it below 0 or above its maximum time."""
+
+        if seconds_to_adjust_by != 0:
+
+            current_time_seconds = self.get_current_seconds()
+
+            # If the requested adjustment WOULD BRING the
+            # timer below the minimum time (00h 00m 00.00s)...
+            if current_time_seconds + seconds_to_adjust_by < 0:
+
+                # If abort_if_out_of_bounds is True, we should not adjust the timer.
+                if abort_if_out_of_bounds:
+                    return 0
+
+                # If abort_if_out_of_bounds is False, reduce the
+                # adjustment so that it brings the timer to 0.
+                seconds_to_adjust_by = -current_time_seconds
+
+            # If the requested adjustment WOULD NOT BRING the
+            # timer below the minimum time (00h 00m 00.00s)...
+            else:
+
+                # IF the requested adjustment WOULD BRING the timer OVER the maximum time...
+                if current_time_seconds + seconds_to_adjust_by > self.get_max_time():
+
+                    # If abort_if_out_of_bounds is True, we should not adjust the timer.
+                    if abort_if_out_of_bounds:
+                        return 0
+
+                    # If abort_if_out_of_bounds is False, reduce the adjustment
+                    # amount so that it brings the timer TO the maximum time
+                    seconds_to_adjust_by = self.get_max_time() - current_time_seconds
+
+            # Update the timer's time.
+            current_time_seconds += seconds_to_adjust_by
+            self.update_timer(current_time_seconds)
+
+        return seconds_to_adjust_by
@@ -0,0 +1,228 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperTimestamp class which represents a
+time (and the precision with which it should be written) as a small immutable value."""
+
+from functools import lru_cache, total_ordering
+
+import methods.timing.methods_timing_helper as methods_helper
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+@total_ordering
+class TimeStamperTimestamp():
+    """This class represents a time as a whole number of centiseconds along with a precision
+    code describing which values should be included when the time is written as a timestamp.
+    The lowest two bits of the precision code hold the number of subsecond digits and the next
+    two bits record whether minutes and hours should be included (these are the same codes
+    that are used in methods_timing_batch). Objects of this class cannot be modified once they
+    are created, so they can be shared freely, and formatting and parsing timestamps is cached.
+    Timestamps are ordered by their time first and then by their precision code."""
+
+    __slots__ = ("centiseconds", "precision")
+
+    PRECISION_SUBSECONDS = 0b0011
+    PRECISION_MINUTES = 0b0100
+    PRECISION_HOURS = 0b1000
+
+    # Hours, minutes and two subsecond digits (which is how the timer itself is displayed).
+    PRECISION_FULL = 0b1110
+
+    def __init__(self, centiseconds=0, precision=PRECISION_FULL):
+
+        object.__setattr__(self, "centiseconds", int(centiseconds))
+        object.__setattr__(self, "precision", int(precision))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects cannot be modified.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects cannot be modified.")
+
+    def __eq__(self, other):
+        if not isinstance(other, TimeStamperTimestamp):
+            return NotImplemented
+        return (self.centiseconds, self.precision) == (other.centiseconds, other.precision)
+
+    def __lt__(self, other):
+        if not isinstance(other, TimeStamperTimestamp):
+            return NotImplemented
+        return (self.centiseconds, self.precision) < (other.centiseconds, other.precision)
+
+    def __hash__(self):
+        return hash((self.centiseconds, self.precision))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.centiseconds}, {self.precision:#06b})"
+
+    def __str__(self):
+        return self.format()
+
+    @classmethod
+    def from_seconds(cls, seconds, precision=PRECISION_FULL):
+        """This method returns a timestamp for a time in seconds, rounded to the nearest
+        centisecond (in the same way as round(seconds, 2)). Negative times are treated as
+        zero, as the timer cannot go below zero."""
+
+        return cls(max(0, round(round(seconds, 2) * 100)), precision)
+
+    @classmethod
+    def from_h_m_s(cls, hours=None, minutes=None, seconds=None, subseconds=None):
+        """This method returns a timestamp for a time in hours, minutes, seconds and subseconds
+        (as returned by timestamp_to_h_m_s). The precision of the returned timestamp records
+        which of those values were provided and how many subsecond digits were provided."""
+
+        precision = min(len(subseconds), 2) if subseconds else 0
+        precision |= cls.PRECISION_MINUTES if minutes is not None else 0
+        precision |= cls.PRECISION_HOURS if hours is not None else 0
+
+        return cls(methods_helper.h_m_s_to_centiseconds(hours, minutes, seconds, subseconds), \
+            precision)
+
+    @classmethod
+    def from_fields(cls, hours, minutes, seconds, subseconds):
+        """This method returns a timestamp (with full precision) for the strings displayed in
+        the timer's time fields, where subseconds are interpreted as the digits following a
+        decimal point. Recently read values are cached, as the same values are read several
+        times for each tick of the timer."""
+
+        return parse_fields(hours, minutes, seconds, subseconds)
+
+    @classmethod
+    def parse(cls, timestamp):
+        """This method returns the timestamp represented by the string timestamp (with or
+        without brackets), or None if the string is not a valid timestamp. The values in the
+        string are interpreted in the same way as in timestamp_to_h_m_s. Parsed strings are
+        cached, so parsing the same string again does not split or check it again."""
+
+        return parse_timestamp(timestamp)
+
+    @classmethod
+    def combine_precisions(cls, precisions):
+        """This method returns the precision code of the most precise of the precision codes in
+        precisions (which includes hours or minutes if any of them does and has the greatest
+        number of subsecond digits of any of them). This is the precision that every timestamp
+        is given when the timestamps of notes are made consistent."""
+
+        precision = 0
+        subsecond_digits = 0
+        for other_precision in precisions:
+            precision |= other_precision
+            subsecond_digits = max(subsecond_digits, other_precision & cls.PRECISION_SUBSECONDS)
+
+        return (precision & ~cls.PRECISION_SUBSECONDS) | subsecond_digits
+
+    @property
+    def seconds(self):
+        """The time of this timestamp in seconds."""
+
+        return self.centiseconds / 100
+
+    @property
+    def subseconds(self):
+        """The number of centiseconds past the current second."""
+
+        return self.centiseconds % 100
+
+    def with_precision(self, precision):
+        """This method returns a timestamp for the same time with the precision code precision."""
+
+        return self if precision == self.precision else TimeStamperTimestamp(\
+            self.centiseconds, precision)
+
+    def fields(self):
+        """This method returns a tuple of the form (hours, minutes, seconds, subseconds) holding
+        the time of this timestamp as strings padded to two digits (regardless of its precision).
+        This is the form in which the time is displayed in the timer's time fields."""
+
+        return split_centiseconds(self.centiseconds, 2, True)
+
+    def to_h_m_s(self):
+        """This method returns the [hours, minutes, seconds, subseconds] list of this timestamp
+        (in the form returned by timestamp_to_h_m_s with a pad of 2), where any value that is
+        not included at this timestamp's precision is None. Subseconds are truncated (not
+        rounded) to the number of subsecond digits in this timestamp's precision."""
+
+        hours, minutes, seconds, subseconds = self.fields()
+        subsecond_digits = self.precision & self.PRECISION_SUBSECONDS
+
+        return [hours if self.precision & self.PRECISION_HOURS else None, \
+            minutes if self.precision & (self.PRECISION_MINUTES | self.PRECISION_HOURS) else None, \
+            seconds, subseconds[:subsecond_digits] if subsecond_digits else None]
+
+    def format(self, include_brackets=True):
+        """This method returns this timestamp as a string (as h_m_s_to_timestamp would for the
+        values returned by to_h_m_s). The optional argument include_brackets, which is set to
+        True by default, determines whether the string will be enclosed in square brackets."""
+
+        return format_timestamp(self.centiseconds, self.precision, include_brackets)
+
+
+@lru_cache(maxsize=4096)
+def split_centiseconds(centiseconds, pad=2, include_subseconds=True):
+    """This method splits a time in centiseconds into a tuple of hours, minutes, seconds and
+    (if include_subseconds is True) subseconds, each as a string padded to pad digits."""
+
+    seconds, subseconds = divmod(centiseconds, 100)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if include_subseconds:
+        return (str(hours).zfill(pad), str(minutes).zfill(pad), \
+            str(seconds).zfill(pad), str(subseconds).zfill(pad))
+
+    return (str(hours).zfill(pad), str(minutes).zfill(pad), str(seconds).zfill(pad))
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(centiseconds, precision, include_brackets=True):
+    """This method formats a time in centiseconds as a timestamp with the precision code
+    precision (see TimeStamperTimestamp). Recently formatted timestamps are cached, which
+    means that the repeated requests for the current timestamp made while the timer is
+    running (from the trace method of every time field that changes) are only formatted once."""
+
+    hours, minutes, seconds, subseconds = split_centiseconds(centiseconds, 2, True)
+
+    # Build the timestamp from the seconds outwards (as h_m_s_to_timestamp would).
+    subsecond_digits = precision & TimeStamperTimestamp.PRECISION_SUBSECONDS
+    timestamp = f"{seconds}.{subseconds[:subsecond_digits]}" if subsecond_digits else seconds
+    if precision & (TimeStamperTimestamp.PRECISION_MINUTES | TimeStamperTimestamp.PRECISION_HOURS):
+        timestamp = f"{minutes}:{timestamp}"
+    if precision & TimeStamperTimestamp.PRECISION_HOURS:
+        timestamp = f"{hours}:{timestamp}"
+
+    return f"[{timestamp}]" if include_brackets else timestamp
+
+
+@lru_cache(maxsize=256)
+def parse_fields(hours, minutes, seconds, subseconds):
+    """This method returns the TimeStamperTimestamp for the strings
+    displayed in the timer's time fields (see from_fields)."""
+
+    return TimeStamperTimestamp(\
+        methods_helper.h_m_s_to_centiseconds(hours, minutes, seconds, subseconds))
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(timestamp):
+    """This method returns the TimeStamperTimestamp represented by the string
+    timestamp, or None if the string is not a valid timestamp (see parse)."""
+
+    h_m_s = methods_helper.timestamp_to_h_m_s(timestamp)
+    return None if h_m_s is None else TimeStamperTimestamp.from_h_m_s(*h_m_s)
@@ -0,0 +1,107 @@
+#-*- coding: utf-8 -*-
+"""This module contains the TimeStamperTimestampFormatter class which formats
+the timer's current time as a timestamp according to the user settings."""
+
+import classes
+from classes.timing.timestamp import TimeStamperTimestamp
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The numbers 00 to 99 padded to two digits, the hours of a timestamp (00: to 99:) and
+# the minutes and seconds of every second within an hour (00:00 to 59:59).
+DIGITS = tuple(f"{number:02d}" for number in range(100))
+HOURS = tuple(f"{digits}:" for digits in DIGITS)
+MINUTES_SECONDS = tuple(f"{minutes}:{seconds}" \
+    for minutes in DIGITS[:60] for seconds in DIGITS[:60])
+
+# The decimal of a timestamp for every number of centiseconds (00 to 99) when timestamps
+# are rounded to the last second, the last decisecond and the last centisecond.
+SUBSECONDS = {
+    "second": ("",) * 100,
+    "decisecond": tuple(f".{digits[0]}" for digits in DIGITS),
+    "centisecond": tuple(f".{digits}" for digits in DIGITS)
+}
+
+
+class TimeStamperTimestampFormatter():
+    """This class formats times as timestamps in the way described by the user settings
+    ("always_include_hours_in_timestamp" and "round_timestamp"). Rather than checking the
+    settings every time a timestamp is formatted, the settings are compiled into lookup tables
+    once (when the program starts and whenever the settings are saved), so formatting a
+    timestamp only takes a few table lookups and a single join. compile must be called again
+    whenever the settings are changed for the change to affect the formatted timestamps."""
+
+    def __init__(self):
+
+        self.force_include_hours = False
+        self.subsecond_digits = 2
+        self.subseconds = SUBSECONDS["centisecond"]
+
+        self.compile()
+
+    def compile(self):
+        """This method compiles the current user settings into the lookup tables that are used
+        to format timestamps. If the "round_timestamp" setting is not "second", "decisecond"
+        or "centisecond", a ValueError is raised and the previous settings are kept."""
+
+        # Determine what increment timestamps should be rounded to.
+        round_to = classes.settings["round_timestamp"]["round_to_last"]
+        if round_to not in SUBSECONDS:
+            raise ValueError("Argument round_to must be either",
+                            "\"second\", \"decisecond\" or \"centisecond\".")
+
+        self.subseconds = SUBSECONDS[round_to]
+        self.subsecond_digits = ("second", "decisecond", "centisecond").index(round_to)
+
+        # Determine whether hours should be included in
+        # timestamps even when the time is below one hour.
+        self.force_include_hours = \
+            bool(classes.settings["always_include_hours_in_timestamp"]["is_enabled"])
+
+    def get_precision(self, centiseconds):
+        """This method returns the precision code (see TimeStamperTimestamp) with which
+        a time of centiseconds is formatted according to the compiled settings."""
+
+        precision = TimeStamperTimestamp.PRECISION_MINUTES | self.subsecond_digits
+        if centiseconds >= 360000 or self.force_include_hours:
+            precision |= TimeStamperTimestamp.PRECISION_HOURS
+
+        return precision
+
+    def format(self, centiseconds, include_brackets=True):
+        """This method formats a time in centiseconds as a timestamp according to the compiled
+        settings. Minutes are always included, and hours are included if the time is at least
+        one hour or if hours should always be included. The optional argument include_brackets,
+        which is set to True by default, determines whether the timestamp has brackets."""
+
+        whole_seconds, subseconds = divmod(centiseconds, 100)
+        hours, minutes_seconds = divmod(whole_seconds, 3600)
+
+        # Look up the hours (if they are included), the minutes and
+        # seconds and the decimal, and join them into a timestamp.
+        if hours or self.force_include_hours:
+            hours = HOURS[hours] if hours < 100 else f"{hours}:"
+        else:
+            hours = ""
+
+        if include_brackets:
+            return "".join(("[", hours, MINUTES_SECONDS[minutes_seconds], \
+                self.subseconds[subseconds], "]"))
+
+        return "".join((hours, MINUTES_SECONDS[minutes_seconds], self.subseconds[subseconds]))
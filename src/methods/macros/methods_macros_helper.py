@@ -2,7 +2,7 @@
 """This module stores some extra methods that various other macros rely on."""
 
 from sys import platform
-from tkinter import DISABLED, NORMAL, Button
+from tkinter import DISABLED, END, NORMAL, Button
 import classes
 import methods.macros.methods_macros_output as methods_output
 
@@ -300,3 +300,14 @@ def determine_widget_attribute(widget_template, attribute_str):
 
     # Return the exact value of the linked state if a custom value was not set.
     return state
+
+
+def refresh_startup_report():
+    """This method displays the current report of the time taken by each stage of the program's
+    startup (see TimeStamperStartupReport) in the text of the startup timings window."""
+
+    text_startup_report = classes.widgets["text_startup_report"]
+    text_startup_report["state"] = NORMAL
+    text_startup_report.delete("1.0", END)
+    text_startup_report.insert(END, classes.startup_report.format_report())
+    text_startup_report["state"] = DISABLED
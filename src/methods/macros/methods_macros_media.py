@@ -1,14 +1,9 @@
 #-*- coding: utf-8 -*-
 """This module stores some extra methods associated with media."""
 
-from ctypes import cdll, CDLL, c_char_p
-from os import remove
-from os.path import dirname, isfile, join
 from sys import platform
 from tkinter import DISABLED, NORMAL, END
 
-from vlc import FILE_ptr, EventType, MediaParsedStatus, MediaPlayer
-
 import classes
 import methods.macros.methods_macros_helper as methods_helper
 import methods.macros.methods_macros_output as methods_output
@@ -32,6 +27,16 @@ from methods.timing import methods_timing_helper
 
 # Contact: github.cqrde@simplelogin.com
 
+# The number of milliseconds that libvlc is given to log any problems with the selected media
+# file once it starts playing, the number of milliseconds between checks for a video output
+# and the number of milliseconds after which a media file without a video output is accepted.
+PROBE_SETTLE_MS = 50
+PROBE_INTERVAL_MS = 10
+VIDEO_OUTPUT_TIMEOUT_MS = 500
+
+# Note that vlc is imported inside the methods in this module that use it, which only run once a
+# media player has been created, so that vlc is only loaded once a media file is first selected.
+
 
 def updated_mute_button_image(volume_scale_value):
     """Assuming that the volume is not muted, this method returns the
@@ -90,11 +95,17 @@ def refresh_media_time(new_time, pad=2):
 
 
 def attempt_media_player_release():
-    """This method tries to release the current media player. If this method
-    is unable to release the current media player, then nothing will happen."""
+    """This method tries to return the current media player to the player pool (see
+    TimeStamperPlayerPool), which stops it so that it can be reused for the next media
+    file. If this method is unable to do so, then nothing will happen."""
+
+    # The cached duration of the media no longer applies, and the
+    # media player's media no longer needs to be checked.
+    classes.timer.clear_media_duration()
+    classes.media_probe.stop()
 
     try:
-        classes.time_stamper.media_player.release()
+        classes.player_pool.recycle(classes.time_stamper.media_player)
     except (AttributeError, OSError):
         pass
 
@@ -230,6 +241,12 @@ def final_media_handler(file_full_path):
     enables and configures all widgets relevant to media playback. If this method determines
     that the selected media file is not a video file, it will destroy the video window."""
 
+    # Record that the media file has been accepted and stop collecting the log of libvlc.
+    classes.media_probe.finish("accepted")
+
+    # Cache the duration of the media now that the media has been validated.
+    classes.timer.cache_media_duration()
+
     # Re-enable all media widgets which were temporarily disabled during media file validation.
     toggle_media_buttons(True)
 
@@ -249,185 +266,245 @@ def final_media_handler(file_full_path):
         window_video.protocol("WM_DELETE_WINDOW", \
             lambda: classes.macros.mapping["window_video_ONCLOSE"](window_video))
 
-    # Close the logfile.
-    instance = classes.time_stamper.media_player.get_instance()
-    instance.log_unset()
-    if platform.startswith("darwin"):
-        CDLL("libc.dylib").fclose(classes.time_stamper.log_file)
+    # Remember the properties of the media file so that it does not need
+    # to be validated again before it is next used (see TimeStamperMediaCache).
+    duration_ms = classes.time_stamper.media_player.get_media().get_duration()
+    if duration_ms > 0:
+        classes.media_cache.store(file_full_path, duration_ms, \
+            bool(classes.time_stamper.media_player.has_vout()))
+
+
+def rejected_media_handler(_file_full_path):
+    """This method gets executed if the selected media file is not valid for playback
+    by VLC. It changes the program's configuration to reflect that a valid media
+    file IS NOT active (only re-enabling the media buttons, which had been disabled
+    for the duration of media file validation)."""
+
+    # Record that the media file has been rejected and stop collecting the log of libvlc.
+    classes.media_probe.finish("rejected")
+
+    # Destroy the video window if it exists.
+    if "window_video" in classes.widgets.mapping \
+        and classes.widgets.mapping["window_video"].winfo_exists():
+        classes.widgets["window_video"].destroy()
+
+    # Re-enable the media buttons, which had been
+    # disabled for the duration of media file validation.
+    toggle_media_buttons(True)
+
+    # Try to release the current media player.
+    attempt_media_player_release()
+    classes.time_stamper.media_player = None
+
+
+def finish_background_check(file_full_path, is_parsed, has_video):
+    """This method gets executed (on the main thread) once a media file that was enabled from
+    the media cache has been parsed in the background. If the media file was parsed without
+    libvlc logging any problems with it, its cached properties are refreshed. Otherwise,
+    the media file is forgotten by the media cache and the program changes its configuration
+    to reflect that a valid media file IS NOT active."""
+
+    # Stop if another media file has been selected (or the media file was cancelled).
+    if not classes.media_probe.is_checking(file_full_path):
+        return
+
+    # If the media file is still valid, refresh its cached duration.
+    if is_parsed and classes.media_probe.bad_message is None:
+
+        classes.media_probe.finish("accepted")
+
+        duration_ms = classes.time_stamper.media_player.get_media().get_duration()
+        if duration_ms > 0:
+            classes.media_cache.store(file_full_path, duration_ms, has_video)
+
+    # If the media file is no longer valid, stop using it.
     else:
-        cdll.msvcrt.fclose(classes.time_stamper.log_file)
 
+        # Pause the timer (and the media) if it is running.
+        if classes.timer.is_running:
+            classes.macros["button_pause"]()
 
-def second_post_playing_handler(file_full_path):
-    """This method gets executed once the selected media has both been completely
-    verified as valid and has been playing for approximately one millisecond."""
+        classes.media_cache.remove(file_full_path)
+        rejected_media_handler(file_full_path)
 
-    # Pause the media.
-    classes.time_stamper.media_player.set_pause(True)
+        # Reset and disable the widgets associated with media.
+        reset_media_widgets()
+        methods_helper.toggle_widgets(classes.template["button_media_select"], False)
 
-    # Reset the media back to its start time.
-    classes.time_stamper.media_player.set_time(0)
 
-    # Wait for a longer period, after which the program will be able
-    # to confirm whether the media has any video output streams.
-    classes.time_stamper.root.after(500, final_media_handler, file_full_path)
+def background_parsing_handler(_, file_full_path, has_video):
+    """This method gets executed when VLC's parsing of a media file that was enabled from the
+    media cache has terminated, and finishes the check of the media file on the main thread."""
 
+    from vlc import MediaParsedStatus
 
-def second_post_parsing_handler(_, file_full_path):
-    """This method gets executed once VLC has both verified that the selected
-    media file is valid for playback and finished parsing the media source."""
+    if not classes.media_probe.is_checking(file_full_path):
+        return
 
-    # Play the media.
-    classes.time_stamper.media_player.play()
+    classes.media_probe.mark("parsed")
+    is_parsed = classes.time_stamper.media_player.get_media().get_parsed_status() \
+        == MediaParsedStatus.done
 
-    # Allow the media to play for a very brief period (~1 millisecond) before proceeding.
-    classes.time_stamper.root.after(1, second_post_playing_handler, file_full_path)
+    # Give libvlc a moment to log any problems that it had parsing the media file.
+    classes.time_stamper.root.after(PROBE_SETTLE_MS, finish_background_check, \
+        file_full_path, is_parsed, has_video)
 
 
-def parse_second_time(file_full_path):
-    """If a message about the selected media file not being an audio/video
-    file WAS NOT found in the log file, then the selected media file
-    IS valid for playback by VLC and this method will be executed."""
+def load_cached_media(file_full_path, cached_media):
+    """This method configures and enables the widgets associated with media for the media file
+    at file_full_path straight away, using its cached properties (see TimeStamperMediaCache)
+    instead of validating it first. The media file is then parsed in the background (without
+    being played, so that the media is not disturbed if the user has started playing it), and
+    is only stopped being used if that parse fails (see finish_background_check)."""
 
-    # Try to release the current media player.
-    attempt_media_player_release()
+    from vlc import EventType
 
-    # Reinitialize a MediaPlayer now that we know our media file is valid.
-    classes.time_stamper.media_player = MediaPlayer(file_full_path)
+    # Collect the log messages of libvlc in memory while the media file is checked.
+    classes.media_probe.start(classes.player_pool.get_instance(), file_full_path)
 
-    # Create a window for the media player (which will potentially
-    # get destroyed later if it is discovered that the selected
-    # media file is either invalid or does not contain any video).
-    create_video_window()
-    classes.widgets["window_video"].protocol("WM_DELETE_WINDOW", lambda: None)
+    # Create a window for the media player if the media file has video.
+    if cached_media["has_video"]:
+        create_video_window()
+        window_video = classes.widgets["window_video"]
+        window_video.protocol("WM_DELETE_WINDOW", \
+            lambda: classes.macros.mapping["window_video_ONCLOSE"](window_video))
+
+    # Configure and enable the widgets associated with media.
+    classes.timer.set_media_duration(cached_media["duration_ms"])
+    toggle_media_buttons(True)
+    set_media_widgets(file_full_path)
+    methods_helper.toggle_widgets(classes.template["button_media_select"], True)
+    classes.media_probe.mark("enabled from cache")
 
-    # Retrieve the media and the media's event manager from the media player.
+    # Parse the media in the background, keeping the cached
+    # duration of the media up to date if libvlc revises it.
     media = classes.time_stamper.media_player.get_media()
     events = media.event_manager()
-
-    # Set the program to configure and enable/disable the relevant widgets to reflect
-    # that a valid output file IS active once the media has finished parsing.
     events.event_attach(EventType.MediaParsedChanged, \
-        second_post_parsing_handler, file_full_path)
-
-    # Parse the media.
+        background_parsing_handler, file_full_path, cached_media["has_video"])
+    events.event_attach(EventType.MediaDurationChanged, media_duration_changed_handler)
     media.parse_with_options(1, -1)
 
 
-def first_post_playing_handler(_, file_full_path, iteration):
-    """If VLC has successfully parsed the selected media file, then this
-    method will get executed once the state of the media player switches
-    to vlc.State.Playing. This method will then examine the libvlc logfiles
-    to determine whether the selected file is valid for playback in VLC."""
+def media_duration_changed_handler(event):
+    """This method gets executed whenever libvlc revises the duration of the current media,
+    and updates the duration of the media that is cached by the timer accordingly."""
 
-    # Pause the media player.
-    classes.time_stamper.media_player.set_pause(True)
+    classes.timer.set_media_duration(event.u.new_duration)
+
+
+def media_has_video_track(media):
+    """This method returns whether the parsed vlc.Media media has a video track (or True
+    if libvlc has not reported its tracks, in which case it may have one)."""
+
+    from vlc import TrackType
+
+    tracks = media.tracks_get()
+    if tracks is None:
+        return True
+
+    return any(track.type == TrackType.video for track in tracks)
+
+
+def probe_media(file_full_path, elapsed_ms=0):
+    """This method gets executed (on the main thread) once the selected media has started
+    playing and has been paused again, and then every PROBE_INTERVAL_MS milliseconds until
+    the media has been either accepted or rejected. The media is rejected as soon as libvlc
+    has logged a message showing that it is not an audio/video file. Otherwise, it is accepted
+    once it has a video output, once it is known not to have a video track or once
+    VIDEO_OUTPUT_TIMEOUT_MS milliseconds have passed without a video output."""
+
+    from vlc import EventType
 
-    # If this method is being called for the first time on the selected media file, we should
-    # run through the validation procedure again to give the program more time to fill out the
-    # logfile, as the text we are looking for in the logfile has likely not yet been printed.
-    if iteration == 1:
+    # Stop if another media file has been selected (or the media file was cancelled).
+    if not classes.media_probe.is_checking(file_full_path):
+        return
 
-        classes.time_stamper.root.after(5, validate_media_player, file_full_path, 2)
+    media_player = classes.time_stamper.media_player
 
-    # If this method is being called for the second time on the selected
-    # media file, we should scan the logfile to ensure that no error messages
-    # were recorded that indicate this file is not suitable for VLC playback.
+    # The first time this is called, stop responding to the media player starting to play (the
+    # handler cannot be detached from the thread that runs it), and reset the media back to
+    # its start time.
+    if elapsed_ms == 0:
+        classes.player_pool.get_event_manager(media_player).event_detach(\
+            EventType.MediaPlayerPlaying)
+        media_player.set_time(0)
+
+    # If libvlc has logged a message showing that the selected media file is not an audio/video
+    # file, then this file IS NOT valid for playback by VLC, so we should NOT enable the
+    # widgets associated with media playback.
+    if classes.media_probe.bad_message is not None:
+        rejected_media_handler(file_full_path)
+
+    # If the video output (if there is one) has been created, accept the media file.
+    elif media_player.has_vout() or not classes.media_probe.expects_video \
+        or elapsed_ms >= VIDEO_OUTPUT_TIMEOUT_MS:
+        final_media_handler(file_full_path)
+
+    # Otherwise, check the media file again shortly.
     else:
+        classes.time_stamper.root.after(\
+            PROBE_INTERVAL_MS, probe_media, file_full_path, elapsed_ms + PROBE_INTERVAL_MS)
+
+
+def post_playing_handler(_, file_full_path):
+    """If VLC has successfully parsed the selected media file, then this method will get
+    executed once the state of the media player switches to vlc.State.Playing. It pauses
+    the media and leaves the rest of the validation to probe_media on the main thread."""
+
+    # Only respond to the media starting to play for the first time.
+    if classes.media_probe.has_reached("playing"):
+        return
+    classes.media_probe.mark("playing")
+
+    # Pause the media player.
+    classes.time_stamper.media_player.set_pause(True)
+
+    # Give libvlc a moment to log any problems that it had opening the media's streams.
+    classes.time_stamper.root.after(PROBE_SETTLE_MS, probe_media, file_full_path)
 
-        # Scan the log file for any messages indicating that
-        # the selected media file is not an audio/video file.
-        good_media_file = True
-        with open(join(dirname(classes.settings.user_json_path), \
-            "out.log"), "r", encoding="utf-8") as log_file:
-
-            lines = log_file.readlines()
-            bad_line_starts = \
-                ("garbage at input from", "VLC could not identify the audio or video codec")
-            for line in lines:
-                for bad_start in bad_line_starts:
-                    if len(line) >= len(bad_start) and line[:len(bad_start)] == bad_start:
-                        good_media_file = False
-                        break
-
-        # If a message about the selected media file not being an audio/video
-        # file WAS NOT found in the log file, proceed with the media
-        # file validation by parsing the media file a second time.
-        if good_media_file:
-
-            classes.time_stamper.root.after(5, parse_second_time, file_full_path)
-
-        # If a message about the selected media file not being an audio/video file
-        # WAS found in the log file, then this file IS NOT valid for playback by
-        # VLC so we should NOT enable the widgets associated with media playback.
-        else:
-
-            # Destroy the video window if it exists.
-            if "window_video" in classes.widgets.mapping \
-                and classes.widgets.mapping["window_video"].winfo_exists():
-                classes.widgets["window_video"].destroy()
-
-            # Re-enable the media buttons, which had been
-            # disabled for the duration of media file validation.
-            toggle_media_buttons(True)
-
-            # Close the logfile.
-            instance = classes.time_stamper.media_player.get_instance()
-            instance.log_unset()
-            if platform.startswith("darwin"):
-                CDLL("libc.dylib").fclose(classes.time_stamper.log_file)
-            else:
-                cdll.msvcrt.fclose(classes.time_stamper.log_file)
-
-            # Try to release the current media player.
-            #attempt_media_player_release()
-            classes.time_stamper.media_player = None
-
-
-def first_post_parsing_handler(_, file_full_path, iteration):
+
+def post_parsing_handler(_, file_full_path):
     """This method gets executed when VLC's parsing of the selected media
     file has terminated. If the parsing was successful, the program will then
     try to play the media. If the parsing was unsuccessful, the program will
     change its configuration to reflect that a valid media file IS NOT active."""
 
+    from vlc import EventType, MediaParsedStatus
+
+    classes.media_probe.mark("parsed")
+    media = classes.time_stamper.media_player.get_media()
+
     # If a parsed media file WAS generated...
-    if classes.time_stamper.media_player.get_media().get_parsed_status() == MediaParsedStatus.done:
+    if media.get_parsed_status() == MediaParsedStatus.done:
+
+        # Note whether to wait for a video output before accepting the media file.
+        classes.media_probe.expects_video = media_has_video_track(media)
 
         # Attach an event handler for when the media starts playing.
-        events = classes.time_stamper.media_player.event_manager()
-        events.event_attach(EventType.MediaPlayerPlaying, \
-            first_post_playing_handler, file_full_path, iteration)
+        # (The handler is detached once the media player is returned to the player pool.)
+        events = classes.player_pool.get_event_manager(classes.time_stamper.media_player)
+        events.event_attach(EventType.MediaPlayerPlaying, post_playing_handler, file_full_path)
 
         # Play the media.
         classes.time_stamper.media_player.play()
 
-    # If a parsed media file WAS NOT generated...
+    # If a parsed media file WAS NOT generated, reject the media file on the main thread.
     else:
-
-        # Only re-enable the media buttons, which had been
-        # disabled for the duration of media file validation.
-        toggle_media_buttons(True)
-
-        # Close the logfile.
-        instance = classes.time_stamper.media_player.get_instance()
-        instance.log_unset()
-        if platform.startswith("darwin"):
-            CDLL("libc.dylib").fclose(classes.time_stamper.log_file)
-        else:
-            cdll.msvcrt.fclose(classes.time_stamper.log_file)
-
-        # Try to release the current media player.
-        attempt_media_player_release()
-        classes.time_stamper.media_player = None
+        classes.time_stamper.root.after(1, rejected_media_handler, file_full_path)
 
 
-def validate_media_player(file_full_path, iteration=1, erase_if_empty=False):
+def validate_media_player(file_full_path, erase_if_empty=False):
     """This method will try to create a media player based on the file path provided
     in file_full_path. If a media player was successfully created, then this method
     will configure the program to reflect that a media player IS active. Otherwise, this
     method will configure the program to reflect that a media player IS NOT active.
-    The optional argument erase_if_empty, which is set to False by default, determines
-    whether the previous media file should be cancelled if no media file is specified."""
+    The media file is parsed and played (paused) once, while the log messages of libvlc
+    are collected in memory (see TimeStamperMediaProbe), and the time taken by each stage
+    is recorded. If the media file has been validated before and has not changed since,
+    it is enabled straight away instead (see load_cached_media). The optional argument
+    erase_if_empty, which is set to False by default, determines whether the previous
+    media file should be cancelled if no media file is specified."""
 
     # Destroy the video window if it exists.
     if "window_video" in classes.widgets.mapping and \
@@ -439,8 +516,17 @@ def validate_media_player(file_full_path, iteration=1, erase_if_empty=False):
         # Try to release the current media player.
         attempt_media_player_release()
 
-        # Create a new media player using the selected media file.
-        classes.time_stamper.media_player = MediaPlayer(file_full_path)
+        # Get a media player for the selected media file from the player pool.
+        classes.time_stamper.media_player = classes.player_pool.acquire(file_full_path)
+
+        # If the selected media file has been validated before and has not changed since,
+        # enable the widgets associated with media straight away and check it in the background.
+        cached_media = classes.media_cache.lookup(file_full_path)
+        if cached_media is not None:
+            load_cached_media(file_full_path, cached_media)
+            return
+
+        from vlc import EventType
 
         # Create a window for the media player (which will potentially
         # get destroyed later if it is discovered that the selected
@@ -454,33 +540,23 @@ def validate_media_player(file_full_path, iteration=1, erase_if_empty=False):
         # Get the event manager associated with the media.
         events = media.event_manager()
 
-        if iteration == 1:
-
-            # Temporarily reset and disable all media widgets while the program attempts
-            # to validate the current media file (if the current media file cannot be
-            # validated, only the media buttons will be re-enabled and the remaining
-            # widgets that were disabled in this code block will NOT be re-enabled).
-            toggle_media_buttons(False)
-            reset_media_widgets()
-            methods_helper.toggle_widgets(classes.template["button_media_select"], False)
-
-            # Delete the logfile if it exists.
-            log_file_path = join(dirname(classes.settings.user_json_path), "out.log")
-            if isfile(log_file_path):
-                remove(log_file_path)
-
-            # Set libvlc to publish its log to a location which we can reference later.
-            instance = classes.time_stamper.media_player.get_instance()
-            fopen = CDLL("libc.dylib").fopen if platform.startswith("darwin") else cdll.msvcrt.fopen
-            fopen.restype = FILE_ptr
-            fopen.argtypes = (c_char_p, c_char_p)
-            classes.time_stamper.log_file = fopen(bytes(log_file_path, "utf-8"), b"w")
-            instance.log_set_file(classes.time_stamper.log_file)
-
-        # Set the program to execute first_post_parsing_handler
+        # Temporarily reset and disable all media widgets while the program attempts
+        # to validate the current media file (if the current media file cannot be
+        # validated, only the media buttons will be re-enabled and the remaining
+        # widgets that were disabled in this code block will NOT be re-enabled).
+        toggle_media_buttons(False)
+        reset_media_widgets()
+        methods_helper.toggle_widgets(classes.template["button_media_select"], False)
+
+        # Collect the log messages of libvlc in memory while the media file is checked.
+        classes.media_probe.start(classes.player_pool.get_instance(), file_full_path)
+
+        # Set the program to execute post_parsing_handler
         # once VLC has finished parsing the selected media.
-        events.event_attach(EventType.MediaParsedChanged, \
-            first_post_parsing_handler, file_full_path, iteration)
+        events.event_attach(EventType.MediaParsedChanged, post_parsing_handler, file_full_path)
+
+        # Keep the cached duration of the media up to date if libvlc revises it.
+        events.event_attach(EventType.MediaDurationChanged, media_duration_changed_handler)
 
         # Attempt to parse the selected media.
         media.parse_with_options(1, -1)
@@ -490,7 +566,7 @@ def validate_media_player(file_full_path, iteration=1, erase_if_empty=False):
     elif erase_if_empty:
 
         # Stop the Time Stamper program's media player if it exists.
-        if isinstance(classes.time_stamper.media_player, MediaPlayer):
+        if classes.time_stamper.media_player:
             classes.time_stamper.media_player.stop()
 
         # Try to release the current media player.
@@ -500,3 +576,15 @@ def validate_media_player(file_full_path, iteration=1, erase_if_empty=False):
         # Reset and disable the widgets associated with media.
         reset_media_widgets()
         methods_helper.toggle_widgets(classes.template["button_media_select"], False)
+
+
+def refresh_media_probe_report():
+    """This method displays the current report of the time taken by each stage of the most
+    recent media check (see TimeStamperMediaProbe) in the text of the media load timings
+    window."""
+
+    text_media_probe = classes.widgets["text_media_probe"]
+    text_media_probe["state"] = NORMAL
+    text_media_probe.delete("1.0", END)
+    text_media_probe.insert(END, classes.media_probe.format_report())
+    text_media_probe["state"] = DISABLED
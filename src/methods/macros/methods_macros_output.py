@@ -1,11 +1,19 @@
 #-*- coding: utf-8 -*-
 """This module stores some extra methods associated with printing text output."""
 
+from codecs import getincrementaldecoder
+from itertools import chain
+from os import stat
 from os.path import exists, isdir
 from tkinter import NORMAL, END
 
 import classes
+from classes.output.reader import TimeStamperOutputReader
+from classes.timing.timestamp import TimeStamperTimestamp
 import methods.macros.methods_macros_helper as methods_helper
+import methods.output.methods_output_batch as methods_batch
+import methods.output.methods_output_files as methods_files
+import methods.output.methods_output_sort as methods_sort
 from methods.timing import methods_timing_helper
 
 # Time Stamper: Run a timer and write automatically timestamped notes.
@@ -45,7 +53,7 @@ def attempt_button_message(button_str_key, timestamp=None, **user_variables):
             if timestamp is None:
 
                 # Generate the current timestamp.
-                timestamp = classes.timer.current_time_to_timestamp()
+                timestamp = classes.timer.current_timestamp()
 
             # Replace any variables in the button's message.
             button_message = replace_button_message_variables(\
@@ -77,6 +85,14 @@ def validate_output_file(file_full_path, erase_if_empty=False):
             # Store the output path as a class attribute of the TimeStamper class.
             classes.time_stamper.output_path = file_full_path
 
+            # Keep a handle to the output file open for as long as the output file is active.
+            classes.output_writer.open(file_full_path)
+
+            # Bring the index of the timestamps in the output file up to date (loading it from
+            # its sidecar file if possible), so that the notes written from now on are indexed
+            # as they are written.
+            classes.timestamp_index.ensure_current(file_full_path)
+
             # Configure the relevant widgets to reflect that a valid output
             # file IS active (distinct from enabling/disabling widgets).
             set_output_widgets(file_full_path)
@@ -100,6 +116,9 @@ def validate_output_file(file_full_path, erase_if_empty=False):
         # Reset the output path in the TimeStamper class.
         classes.time_stamper.output_path = ""
 
+        # Flush and close the handle to the previous output file.
+        classes.output_writer.close()
+
         # Configure the relevant widgets to reflect that a valid output
         # file IS NOT active (distinct from enabling/disabling widgets).
         reset_output_widgets()
@@ -108,46 +127,29 @@ def validate_output_file(file_full_path, erase_if_empty=False):
         methods_helper.toggle_widgets(classes.template["button_output_select"], False)
 
 
-def determine_last_character(file_name):
-    """This method efficiently determines the last character in a text
-    file. If the text file is empty, this method will return None."""
-
-    # Open the file.
-    with open(file_name, "rb+") as file:
-
-        # See if there is any text in the file.
-        try:
-            file.seek(-1, 2)
-
-        # If there is NO text currently in the file, return None.
-        except OSError:
-            return None
-
-        # If there IS text currently in the file, return the last character of the file.
-        return str(file.read(1), classes.settings["output"]["file_encoding"])
-
-
 def print_timestamped_message(message, timestamp=None):
     """This method takes a message, timestamps it, and then prints that timestamped
     message to the notes log and the output file (if no timestamp is provided,
-    then a timestamp will be generated using the timer's current time)."""
+    then a timestamp will be generated using the timer's current time). The
+    timestamp may be either a string or a TimeStamperTimestamp."""
 
     # If no timestamp was provided, generate a timestamp using the timer's current time.
     if timestamp is None:
-        timestamp = classes.timer.current_time_to_timestamp()
+        timestamp = classes.timer.current_timestamp()
 
     # Generate the complete message that should be printed, including the timestamp.
     to_print = f"{timestamp} {message}"
 
-    # If the last character of the current output file is not
-    # a new line, add a new line before the upcoming message.
-    if determine_last_character(classes.time_stamper.output_path) != "\n":
+    # If the last character of the current output file is not a new line, add a new line
+    # before the upcoming message (the output writer keeps track of the last character
+    # of the output file, so the output file does not need to be read here).
+    if classes.output_writer.last_character(classes.time_stamper.output_path) != "\n":
         to_print = f"\n{to_print}"
 
     # Print the message passed in the argument "message" along with
     # the current timestamp to the notes log and the output file.
-    print_to_text(to_print, classes.widgets["text_log"])
-    print_to_file(to_print, classes.time_stamper.output_path)
+    classes.output_writer.write(to_print, classes.time_stamper.output_path)
+    classes.log_view.append(to_print)
 
 
 def get_button_message_input(button_str_key):
@@ -214,9 +216,8 @@ def set_output_widgets(file_full_path):
     # Print the file path to the entry widget.
     print_to_entry(file_full_path, classes.widgets["entry_output_path"], wipe_clean=True)
 
-    # Any text already in the output file should be printed to the notes log.
-    file_encoding = classes.settings["output"]["file_encoding"]
-    copy_text_file_to_text_widget(file_full_path, file_encoding, classes.widgets["text_log"])
+    # Any text already in the output file should be displayed in the notes log.
+    classes.log_view.load(file_full_path)
 
 
 def reset_output_widgets():
@@ -233,24 +234,7 @@ def reset_output_widgets():
     print_to_entry("", classes.widgets["entry_output_path"], wipe_clean=True)
 
     # Clear the text displaying the notes log.
-    print_to_text("", classes.widgets["text_log"], wipe_clean=True)
-
-
-def copy_text_file_to_text_widget(file_full_path, file_encoding, text_obj, wipe_clean=True):
-    """This method prints the entire contents of the text file indicated by
-    file_full_path to the text widget text_obj. An optional argument wipe_clean,
-    which is set to True by default, determines whether any text currently displayed
-    in the text widget should be removed before the new text is displayed."""
-
-    text_obj_initial_state = text_obj["state"]
-    text_obj["state"] = NORMAL
-    with open(file_full_path, "r", encoding=file_encoding) as out_file:
-        if wipe_clean:
-            text_obj.delete(1.0, END)
-        for line in out_file.readlines():
-            text_obj.insert(END, line)
-            text_obj.see(END)
-    text_obj["state"] = text_obj_initial_state
+    classes.log_view.clear()
 
 
 def verify_text_file(file_full_path, test_readability, test_writability):
@@ -272,8 +256,7 @@ def verify_text_file(file_full_path, test_readability, test_writability):
     try:
         file_encoding = classes.settings["output"]["file_encoding"]
         if test_readability:
-            with open(file_full_path, "r", encoding=file_encoding) as output_file:
-                output_file.readlines()
+            verify_text_file_decodes(file_full_path, file_encoding)
         if test_writability:
             with open(file_full_path, "a+", encoding=file_encoding) as output_file:
                 output_file.write("")
@@ -286,6 +269,64 @@ def verify_text_file(file_full_path, test_readability, test_writability):
     return True
 
 
+def verify_text_file_decodes(file_full_path, file_encoding, chunk_size=1048576):
+    """This method checks that the file specified by file_full_path can be decoded as text with
+    the encoding file_encoding, raising a UnicodeDecodeError as soon as an undecodable chunk is
+    found. The file is decoded one chunk at a time (the size of which is set by the optional
+    argument chunk_size) so that it never has to be held in memory in its entirety. Successful
+    checks are cached by the output writer based on the file's device, inode, size and
+    modification time. If none of these have changed since the last successful check, the
+    file is not read again. If the file has only been appended to since the last successful
+    check, then only the newly appended bytes are decoded."""
+
+    file_stat = stat(file_full_path)
+    file_key = (file_stat.st_dev, file_stat.st_ino)
+    verified_files = classes.output_writer.verified_files
+    cached = verified_files.get(file_key)
+
+    # The number of bytes at the end of the last successful check that are remembered
+    # so that it can be determined whether the file has only been appended to since then.
+    fingerprint_size = 64
+
+    start_offset = 0
+    if cached is not None and cached["encoding"] == file_encoding:
+
+        # If the file has not changed since the last successful check, it does not need to be read.
+        if cached["size"] == file_stat.st_size and cached["mtime_ns"] == file_stat.st_mtime_ns:
+            return
+
+        # If the file has grown and still contains the bytes that were at the end of the last
+        # successful check, then it has only been appended to, so only check the new bytes
+        # (this only works for encodings in which a new character never depends on a
+        # previous one, which is the case for any encoding that encodes "\n" as b"\n").
+        if cached["size"] < file_stat.st_size and "\n".encode(file_encoding) == b"\n":
+            with open(file_full_path, "rb") as output_file:
+                output_file.seek(max(0, cached["size"] - fingerprint_size))
+                if output_file.read(len(cached["fingerprint"])) == cached["fingerprint"]:
+                    start_offset = cached["size"]
+
+    # Decode the (unchecked part of the) file one chunk at a time.
+    decoder = getincrementaldecoder(file_encoding)()
+    fingerprint = cached["fingerprint"] if start_offset else b""
+    with open(file_full_path, "rb") as output_file:
+
+        output_file.seek(start_offset)
+
+        while True:
+            chunk = output_file.read(chunk_size)
+            if not chunk:
+                break
+            decoder.decode(chunk)
+            fingerprint = (fingerprint + chunk[-fingerprint_size:])[-fingerprint_size:]
+
+        decoder.decode(b"", final=True)
+        verified_size = output_file.tell()
+
+    # Remember that the file was successfully checked.
+    verified_files[file_key] = {"encoding": file_encoding, "size": verified_size, \
+        "mtime_ns": file_stat.st_mtime_ns, "fingerprint": fingerprint}
+
+
 def print_to_entry(to_print, entry_obj, wipe_clean=False):
     """This method prints the value stored in to_print to the entry widget
     entry_obj. An optional argument wipe_clean, which is set to False
@@ -315,15 +356,6 @@ def print_to_text(to_print, text_obj, wipe_clean=False):
     text_obj["state"] = initial_state
 
 
-def print_to_file(to_print, file_path, access_mode="a+"):
-    """This method prints the value stored in to_print to the file specified in file_path."""
-
-    if file_path:
-        file_encoding = classes.settings["output"]["file_encoding"]
-        with open(file_path, access_mode, encoding=file_encoding) as out_file:
-            out_file.write(to_print)
-
-
 def replace_button_message_variables(button_message, **user_variables):
     """This method takes a user-entered button message and replaces
     any user-entered variables with their appropriate values."""
@@ -340,48 +372,102 @@ def reconcile_or_sort_macro(is_reconcile):
     procedures have been condensed down to a single method here and different parameters
     are passed depending on whether the skip backward or skip forward button was pressed."""
 
-    out_path, text_log = classes.time_stamper.output_path, classes.widgets["text_log"]
+    out_path = classes.time_stamper.output_path
+
+    # Make sure that every note written so far has been flushed to the output file and
+    # that the output writer is aware of any changes made to the output file externally.
+    classes.output_writer.refresh_tail_state(out_path)
 
     # If the output file is valid (this should already be the case, but just double-checking)...
     if verify_text_file(out_path, True, True):
 
         # Determine the last character of the output file (before reconciling/sorting).
-        last_character_of_file = determine_last_character(out_path)
+        last_character_of_file = classes.output_writer.last_character(out_path)
 
-        # Read through the input files of notes and save the lines to a list.
-        header, consistent_h_m_s, body = store_timestamper_output([out_path])
+        # If we are SORTING notes and the output file is too large to be sorted in
+        # memory, sort the output file using temporary files on disk instead.
+        if not is_reconcile and methods_sort.should_sort_externally([out_path]):
 
-        # If we are RECONCILING notes, make the degree of precision of all timestamps in
-        # the output consistent with the degree of precision of the most precise timestamp.
-        if is_reconcile:
-            for i, note in enumerate(body):
-                consistent_timestamp = \
-                    methods_timing_helper.h_m_s_to_timestamp(*consistent_h_m_s[i])
-                body[i] = f"{consistent_timestamp}{note[note.find(']') + 1:]}"
+            # Close the handle to the output file so that the output file can be replaced.
+            classes.output_writer.close(out_path)
 
-        # If we are not reconciling notes but are instead SORTING notes, sort the notes
-        # gathered from all requested files according to their precise timestamps.
-        else:
-            body = [ln for _, ln in sorted(zip(consistent_h_m_s, body), key=lambda pair: pair[0])]
+            try:
+                methods_sort.sort_output_externally([out_path], out_path, last_character_of_file)
+
+            # Reopen the handle to the (rewritten) output file and
+            # display the rewritten output file in the notes log.
+            finally:
+                classes.output_writer.open(out_path, close_others=False)
+                classes.log_view.reload()
+
+            return
+
+        # Close the handle to the output file so that the output file can be replaced.
+        classes.output_writer.close(out_path)
+
+        # Write the header and the reconciled/sorted notes to a temporary file in a single
+        # buffered pass and then replace the output file with it, so the output file is never
+        # left half-written. If the last character of the output file WAS NOT originally a new
+        # line, then the final new line character is erased from the last note if it exists.
+        try:
+            with methods_files.rewrite_file_atomically(out_path) as out_file:
+                write_reconciled_or_sorted_output(out_path, out_file, is_reconcile, \
+                    last_character_of_file)
 
-        # Erase the current contents of the notes log and the output file.
-        print_to_text("", text_log, wipe_clean=True)
-        print_to_file("", out_path, access_mode="w+")
+        # Reopen the handle to the (rewritten) output file and
+        # display the rewritten output file in the notes log.
+        finally:
+            classes.output_writer.open(out_path, close_others=False)
+            classes.log_view.reload()
 
-        # Print the sorted notes to the notes log and to the output file (except for the last note).
-        all_lines = header + body
-        for line_index in range(len(all_lines) - 1):
-            print_to_text(all_lines[line_index], text_log, wipe_clean=False)
-            print_to_file(all_lines[line_index], out_path, access_mode="a+")
 
-        # If the last character of the file WAS NOT originally a new line, then
-        # erase the final new line character from the last note if it exists.
-        if last_character_of_file != "\n" and all_lines[-1][-1] == "\n":
-            all_lines[-1] = all_lines[-1][:-1]
+def write_reconciled_or_sorted_output(out_path, out_file, is_reconcile, last_character_of_file):
+    """This method reads the output file specified in out_path, reconciles or sorts its notes
+    (depending on is_reconcile) and writes its header followed by those notes to the open file
+    out_file. If last_character_of_file (the original last character of the output file) is
+    not a new line, the final new line character is erased from the last note if it exists.
+    Large output files are split into chunks which are parsed in separate processes."""
 
-        # Print the final line to the notes log and the output file.
-        print_to_text(all_lines[-1], text_log, wipe_clean=False)
-        print_to_file(all_lines[-1], out_path, access_mode="a+")
+    # If the output file can be read through a memory map, only hold the locations and
+    # times of the notes in memory and decode each note only when it is written.
+    if TimeStamperOutputReader.is_supported():
+
+        notes_table = methods_batch.index_output_notes_batch(out_path)
+
+        # If we are SORTING notes, sort the notes according to their precise timestamps. If
+        # we are RECONCILING notes, make the degree of precision of all timestamps in the
+        # output consistent with the degree of precision of the most precise timestamp.
+        note_order = None if is_reconcile else notes_table.get_sorted_order()
+        precision = notes_table.get_precision() if is_reconcile else None
+
+        with TimeStamperOutputReader(out_path) as reader:
+
+            header = notes_table.iterate_header(reader)
+            body = notes_table.iterate_notes(reader, note_order, precision)
+
+            methods_files.write_output_lines(out_file, chain(header, body), last_character_of_file)
+
+        return
+
+    # Otherwise, read through the output file and save the lines to a list.
+    header, consistent_h_m_s, body = methods_batch.store_timestamper_output_batch([out_path])
+
+    # If we are RECONCILING notes, make the degree of precision of all timestamps in
+    # the output consistent with the degree of precision of the most precise timestamp.
+    if is_reconcile:
+        for i, note in enumerate(body):
+            consistent_timestamp = \
+                methods_timing_helper.h_m_s_to_timestamp(*consistent_h_m_s[i])
+            body[i] = f"{consistent_timestamp}{note[note.find(']') + 1:]}"
+
+    # If we are not reconciling notes but are instead SORTING notes, sort the notes
+    # gathered from all requested files according to their precise timestamps (in
+    # centiseconds, which is how notes are ordered when they are sorted in any other way).
+    else:
+        note_times = [TimeStamperTimestamp.from_h_m_s(*h_m_s) for h_m_s in consistent_h_m_s]
+        body = [ln for _, ln in sorted(zip(note_times, body), key=lambda pair: pair[0])]
+
+    methods_files.write_output_lines(out_file, header + body, last_character_of_file)
 
 
 def make_timestamp_formats_consistent(original_h_m_s):
@@ -390,113 +476,123 @@ def make_timestamp_formats_consistent(original_h_m_s):
     method then modifies the input list so that the precision of each [hours, minutes,
     seconds, subseconds] entry becomes as precise as the most precise entry in the list."""
 
-    # Check whether minutes were included in any of the timestamps,
-    # and if they were, ensure that all timestamps include minutes.
-    for orig_outer in original_h_m_s:
-        if orig_outer[1] is not None:
-            for i, orig_inner in enumerate(original_h_m_s):
-                original_h_m_s[i][1] = "00" if orig_inner[1] is None else orig_inner[1]
-            break
-
-    # Check whether hours were included in any of the timestamps,
-    # and if they were, ensure that all timestamps include hours.
-    for orig_outer in original_h_m_s:
-        if orig_outer[0] is not None:
-            for i, orig_inner in enumerate(original_h_m_s):
-                original_h_m_s[i][0] = "00" if orig_inner[0] is None else orig_inner[0]
-            break
-
-    # Check the precision of the decimal of the most precise timestamp.
-    most_precise_subsecond = 0
-    for orig in original_h_m_s:
-        if orig[3] is not None:
-            most_precise_subsecond = max(most_precise_subsecond, len(orig[3]))
-
-    # Ensure that the decimals of each timestamp are as
-    # precise as the decimal of the most precise timestamp.
-    if most_precise_subsecond > 0:
-        for i, orig in enumerate(original_h_m_s):
-            if orig[3] is None or len(orig[3]) < most_precise_subsecond:
-                orig[3] = methods_timing_helper.pad_number(\
-                    orig[3] if orig[3] else "0", most_precise_subsecond, False)
+    # Find the precision of the most precise timestamp.
+    precisions = [get_h_m_s_precision(h_m_s) for h_m_s in original_h_m_s]
+    precision = TimeStamperTimestamp.combine_precisions(set(precisions))
+
+    # Make every timestamp that is less precise than the most precise timestamp as precise
+    # (including any timestamp that has hours but no minutes, whose minutes are filled in).
+    for h_m_s, h_m_s_precision in zip(original_h_m_s, precisions):
+        if h_m_s_precision != precision or h_m_s[1] is None:
+            h_m_s[:] = methods_timing_helper.make_h_m_s_precise(h_m_s, precision)
 
     return original_h_m_s
 
 
-def store_timestamper_output(output_file_paths):
-    """This method reads through timestamper output files saved in "all_files" (which should
-    be a list of file paths) and saves the notes stored in these files to a list."""
+def get_h_m_s_precision(h_m_s):
+    """This method returns the precision code (see TimeStamperTimestamp) describing which values
+    are included in h_m_s (an [hours, minutes, seconds, subseconds] list, as returned by
+    timestamp_to_h_m_s) and how many subsecond digits it has."""
+
+    hours, minutes, _, subseconds = h_m_s
+
+    precision = min(len(subseconds), 2) if subseconds else 0
+    precision |= TimeStamperTimestamp.PRECISION_MINUTES if minutes is not None else 0
+    precision |= TimeStamperTimestamp.PRECISION_HOURS if hours is not None else 0
+
+    return precision
+
+
+def iterate_timestamper_lines(lines, on_header=True):
+    """This method reads through lines (an iterable of lines from a single timestamper output
+    file, such as an open output file) and yields the header lines and notes stored in these
+    lines as they are found. Each yielded value is a tuple of the form (h_m_s, text). For
+    header lines, h_m_s is None. For notes (which may span several lines), h_m_s is the [hours,
+    minutes, seconds, subseconds] list of the note's timestamp (with each value padded to two
+    digits). The optional argument on_header, which is set to True by default, determines
+    whether any lines before the first timestamped line should be treated as header lines."""
+
+    cur_h_m_s, cur_note = None, ""
+
+    # Iterate over every line.
+    for line in lines:
+
+        # If the last character of the current line is not a new line
+        # character, add a new line character to the end of the current line.
+        if line[-1] != "\n":
+            line = f"{line}\n"
+
+        h_m_s = None
+
+        # If the current line begins with an open square bracket and contains a closed
+        # square bracket somewhere later, it could potentially be a timestamped line.
+        # If the characters in the current line up to the first closed square bracket
+        # are successfully parsed as a timestamp, then this is a timestamped line.
+        if line[0] == "[" and line.find("]") != -1:
+            original_timestamp = line[:line.find("]") + 1]
+            h_m_s = methods_timing_helper.timestamp_to_h_m_s(\
+                original_timestamp, pad=2, pad_subseconds=False)
+
+        # If the current line begins with a timestamp...
+        if h_m_s is not None:
+
+            # We can now be certain that the program is finished reading
+            # in any non-timestamped lines at the top of the current file,
+            # so new lines should NOT be considered part of the header.
+            on_header = False
 
-    header, notes_body, original_h_m_s= [], [], []
-    cur_note = ""
+            # If a current note exists, yield it and begin generating a new note.
+            if cur_note:
+                yield cur_h_m_s, cur_note
+
+            # Begin generating a new note with the current line.
+            cur_h_m_s, cur_note = h_m_s, line
+
+        # If we have not yet reached a timestamped line in the current
+        # file, consider the current line as part of the header.
+        elif on_header:
+            yield None, line
+
+        # If the current line is neither timestamped nor a part of the
+        # header, then add the current line to the note that is currently
+        # being generated (this should only occur when we have a
+        # non-timestamped note that appears below a timestamped note).
+        else:
+            cur_note += line
+
+    # Flush out any final note that has not yet been yielded.
+    if cur_note:
+        yield cur_h_m_s, cur_note
+
+
+def iterate_timestamper_output(output_file_paths):
+    """This method reads through the timestamper output files saved in "output_file_paths" (which
+    should be a list of file paths) one line at a time and yields the header lines and notes
+    stored in these files as they are found, so that the files never have to be held in memory
+    in their entirety. The yielded values are described in iterate_timestamper_lines."""
 
     # Iterate over every file specified in "output_file_paths".
     for file_path in output_file_paths:
 
-        # Assume that any new lines at the beginning of the current file are part
-        # of the header (until we reach a timestamped line in the current file).
-        on_header = True
-
-        # Open the current file.
+        # Open the current file and yield its header lines and notes (any new lines at the
+        # beginning of the current file are part of the header until we reach a timestamped line).
         with open(file_path, "r", encoding=classes.settings["output"]["file_encoding"]) as out_file:
+            yield from iterate_timestamper_lines(out_file)
 
-            # Iterate over every line in the current file.
-            for line in out_file:
-
-                # If the last character of the current line is not a new line
-                # character, add a new line character to the end of the current line.
-                if line[-1] != "\n":
-                    line = f"{line}\n"
-
-                is_timestamped_line = False
-
-                # If the current line begins with an open square bracket and contains a closed
-                # square bracket somewhere later, it could potentially be a timestamped line.
-                if line[0] == "[" and line.find("]") != -1:
-
-                    # If the characters in the current line up to the first
-                    # closed square bracket were successfully parsed as a
-                    # timestamp, then that means this is a timestamped line.
-                    original_timestamp = line[:line.find("]") + 1]
-                    h_m_s = methods_timing_helper.timestamp_to_h_m_s(\
-                        original_timestamp, pad=2, pad_subseconds=False)
-                    if h_m_s is not None:
-
-                        is_timestamped_line = True
-                        original_h_m_s.append(h_m_s)
-
-                # If the current line begins with a timestamp...
-                if is_timestamped_line:
-
-                    # We can now be certain that the program is finished reading
-                    # in any non-timestamped lines at the top of the current file,
-                    # so new lines should NOT be considered part of the header.
-                    on_header = False
-
-                    # If a current note exists, append it to the
-                    # notes list and begin generating a new note.
-                    if cur_note:
-                        notes_body.append(cur_note)
-                        cur_note = ""
-
-                    # Add the current line to the note that is currently being generated.
-                    cur_note += line
-
-                # If we have not yet reached a timestamped line in the current
-                # file, consider the current line as part of the header.
-                elif on_header:
-                    header.append(line)
-
-                # If the current line is neither timestamped nor a part of the
-                # header, then add the current line to the note that is currently
-                # being generated (this should only occur when we have a
-                # non-timestamped note that appears below a timestamped note).
-                else:
-                    cur_note += line
-
-    # Flush out any final note that has not yet been added to the notes list.
-    if cur_note:
-        notes_body.append(cur_note)
+
+def store_timestamper_output(output_file_paths):
+    """This method reads through timestamper output files saved in "all_files" (which should
+    be a list of file paths) and saves the notes stored in these files to a list."""
+
+    header, notes_body, original_h_m_s = [], [], []
+
+    # Sort the header lines and notes from every file into separate lists.
+    for h_m_s, text in iterate_timestamper_output(output_file_paths):
+        if h_m_s is None:
+            header.append(text)
+        else:
+            original_h_m_s.append(h_m_s)
+            notes_body.append(text)
 
     # Make the degree of precision of all [hours, minutes, seconds, subseconds]
     # lists from the output consistent with the degree of precision
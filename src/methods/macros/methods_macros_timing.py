@@ -2,12 +2,11 @@
 """This module stores some extra methods associated with the timer."""
 
 from sys import platform
-from tkinter import RAISED, SUNKEN
+from tkinter import DISABLED, END, NORMAL, RAISED, SUNKEN
 
 import classes
 import methods.macros.methods_macros_helper as methods_helper
 import methods.macros.methods_macros_media as methods_media
-from methods.timing import methods_timing_helper
 
 # Time Stamper: Run a timer and write automatically timestamped notes.
 # Copyright (C) 2022 Benjamin Fertig
@@ -51,7 +50,7 @@ def playback_press_macro(playback_type):
     # Schedule the timer to start after a short delay (this scheduled start will be
     # cancelled if the current button is released before the delay period has ended).
     classes.timer.scheduled_id = \
-        classes.time_stamper.root.after(250, classes.timer.play, playback_type)
+        classes.timer.scheduler.call_later(250, classes.timer.play, playback_type)
 
     return "break"
 
@@ -70,7 +69,7 @@ def playback_release_macro(playback_type):
     if classes.timer.scheduled_id:
 
         # Cancel the upcoming, scheduled play function.
-        classes.time_stamper.root.after_cancel(classes.timer.scheduled_id)
+        classes.timer.scheduler.cancel(classes.timer.scheduled_id)
         classes.timer.scheduled_id = None
 
         # Generate a timestamp using the timer's current time.
@@ -136,6 +135,13 @@ def timer_entry_trace_method(entry_text, entry_template):
     these four methods are very similar, so their procedures have been condensed down to a single
     method here and different parameters are passed depending on which trace method was invoked."""
 
+    # If this method was called from the timer redrawing its time fields, the displays that
+    # depend on the time fields are refreshed once all of them have been redrawn (see
+    # render_time in timing.py), so only store the entry's value for potential referencing later.
+    if classes.timer.is_rendering_fields:
+        entry_template["previous_value"] = entry_text.get()
+        return
+
     # If this method was called EITHER from an automatic update of the timer because it is currently
     # running OR from the user scrolling the mousewheel over one of the timer entries, then
     # this entry's text has already been validated elsewhere, so we know that the text is valid.
@@ -162,7 +168,8 @@ def timer_entry_trace_method(entry_text, entry_template):
         # generic entry_trace_method did not detect any problems.
         if entry_text_is_valid:
 
-            # Get the timer's current time in seconds.
+            # Read the edited time fields into the timer and get its current time in seconds.
+            classes.timer.read_time_fields()
             current_time_seconds = classes.timer.get_current_seconds()
 
             # If adding the most recently added character to the timer entry put the
@@ -181,8 +188,23 @@ def timer_entry_trace_method(entry_text, entry_template):
         entry_text.set(entry_template["previous_value"])
 
         # Regenerate the timer's new time, factoring in the modified entry.
+        classes.timer.read_time_fields()
         current_time_seconds = classes.timer.get_current_seconds()
 
+    # Update the displays that depend on the timer entries.
+    refresh_time_displays(current_time_seconds)
+
+    # Store the updated value of the timer entry so that we can (potentially) revert
+    # back to it should the user later enter an invalid value into this entry.
+    entry_template["previous_value"] = entry_text.get()
+
+
+def refresh_time_displays(current_time_seconds):
+    """This method updates the displays that depend on the timer entries to the time
+    current_time_seconds (in seconds). It is called by timer_entry_trace_method whenever
+    the user edits one of the timer entries, and once by the timer whenever it has finished
+    redrawing the timer entries (see render_time in timing.py)."""
+
     # Update the timestamp if a fixed timestamp has not been set.
     if not classes.template["label_timestamp"]["timestamp_set"]:
         classes.timer.update_timestamp(seconds_override=current_time_seconds, truncate_to=2)
@@ -193,10 +215,6 @@ def timer_entry_trace_method(entry_text, entry_template):
     if classes.time_stamper.media_player:
         methods_media.refresh_media_time(current_time_seconds, pad=2)
 
-    # Store the updated value of the timer entry so that we can (potentially) revert
-    # back to it should the user later enter an invalid value into this entry.
-    entry_template["previous_value"] = entry_text.get()
-
 
 def timer_entry_mousewheel_method(event, entry_template):
     """This method contains the entire functionality of the methods that get executed
@@ -231,8 +249,7 @@ def timer_entry_mousewheel_method(event, entry_template):
 
     # If the timer was not adjusted, ensure that the current time is displayed in its entirety.
     if scroll_adjustment == 0:
-        h_m_s = classes.timer.read_timer()
-        classes.timer.display_time(methods_timing_helper.h_m_s_to_seconds(*h_m_s))
+        classes.timer.display_time(classes.timer.get_current_seconds())
 
     # Indicate that the timer is no longer being scrolled.
     classes.timer.is_being_scrolled = False
@@ -276,3 +293,14 @@ def set_or_clear_timestamp(is_set_timestamp):
     # the timestamp/clear timestamp button is pressed.
     methods_helper.button_enable_disable_macro(\
         classes.template["button_timestamp" if is_set_timestamp else "button_clear_timestamp"])
+
+
+def refresh_tick_latency_report():
+    """This method displays the current report of how late the timer's ticks have
+    been (see TimeStamperTickLatency) in the text of the tick latency window."""
+
+    text_tick_latency = classes.widgets["text_tick_latency"]
+    text_tick_latency["state"] = NORMAL
+    text_tick_latency.delete("1.0", END)
+    text_tick_latency.insert(END, classes.timer.tick_latency.format_report())
+    text_tick_latency["state"] = DISABLED
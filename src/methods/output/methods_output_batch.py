@@ -0,0 +1,256 @@
+#-*- coding: utf-8 -*-
+"""This module stores methods for parsing large amounts of timestamper output in parallel. The
+output is split into chunks (one or more per output file, always split on note boundaries),
+each chunk is parsed in a separate process and the results are then combined in order."""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO, TextIOWrapper
+from os import cpu_count
+from os.path import getsize
+
+import classes
+from classes.output.reader import TimeStamperOutputReader
+import methods.macros.methods_macros_output as methods_output
+from methods.timing import methods_timing_helper
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+def get_chunk_size():
+    """This method returns the approximate number of bytes of output that should be
+    parsed by each process, as specified in the "parse_chunk_size_mb" setting."""
+
+    return max(1, classes.settings["output"]["parse_chunk_size_mb"]) * 1048576
+
+
+def get_worker_count():
+    """This method returns the number of processes that should be used to parse output, as
+    specified in the "parse_workers" setting (0 means one process for every processor core)."""
+
+    return classes.settings["output"]["parse_workers"] or cpu_count() or 1
+
+
+def is_note_start(line, file_encoding):
+    """This method determines whether line (a line of an output file, as bytes encoded
+    with file_encoding) begins a new note (i.e., whether it begins with a timestamp)."""
+
+    if line[:1] != b"[" or line.find(b"]") == -1:
+        return False
+
+    original_timestamp = line[:line.find(b"]") + 1].decode(file_encoding, errors="replace")
+    return methods_timing_helper.timestamp_to_h_m_s(original_timestamp) is not None
+
+
+def find_chunk_boundaries(file_path, file_encoding, chunk_size):
+    """This method splits the output file specified in file_path into chunks of roughly
+    chunk_size bytes and returns the byte offsets at which the chunks begin, followed by the
+    size of the output file. Every chunk after the first begins at the start of a note, so a
+    note is never split between two chunks. Output files can only be split if new lines are
+    encoded as a single b"\\n" byte in file_encoding (as is the case for UTF-8, for instance),
+    so any other output file is treated as a single chunk."""
+
+    file_size = getsize(file_path)
+    boundaries = [0]
+
+    if "\n".encode(file_encoding) == b"\n":
+
+        with open(file_path, "rb") as out_file:
+
+            position = chunk_size
+            while position < file_size:
+
+                # Move to the start of the first line after the approximate boundary.
+                out_file.seek(position)
+                out_file.readline()
+
+                # Move forward to the start of the first note after that.
+                line_start = out_file.tell()
+                line = out_file.readline()
+                while line and not is_note_start(line, file_encoding):
+                    line_start = out_file.tell()
+                    line = out_file.readline()
+
+                # Stop if no note starts after the approximate boundary.
+                if not line:
+                    break
+
+                boundaries.append(line_start)
+                position = line_start + chunk_size
+
+    boundaries.append(file_size)
+    return boundaries
+
+
+def parse_output_chunk(file_path, file_encoding, start, end):
+    """This method parses the bytes from start (inclusive) to end (exclusive) of the output file
+    specified in file_path, as encoded with file_encoding, and returns a tuple of the form (header,
+    original_h_m_s, notes_body), as in store_timestamper_output (except that the timestamps are
+    left as they were found). This method is executed in a separate process, so the chunk
+    is read here rather than passed in, and only the parsed results are passed back."""
+
+    header, original_h_m_s, notes_body = [], [], []
+
+    with open(file_path, "rb") as out_file:
+        out_file.seek(start)
+        chunk = out_file.read(end - start)
+
+    # Decode the chunk the same way that an output file opened in text mode would be decoded.
+    lines = TextIOWrapper(BytesIO(chunk), encoding=file_encoding)
+
+    # Only the first chunk of an output file can contain header lines.
+    for h_m_s, text in methods_output.iterate_timestamper_lines(lines, on_header=start == 0):
+        if h_m_s is None:
+            header.append(text)
+        else:
+            original_h_m_s.append(h_m_s)
+            notes_body.append(text)
+
+    return header, original_h_m_s, notes_body
+
+
+def should_parse_in_parallel(output_file_paths):
+    """This method determines whether the output files in output_file_paths are large enough
+    for parsing them in parallel to be worthwhile (i.e., whether they add up to more than one
+    chunk), since starting the processes that parse the output takes some time of its own."""
+
+    total_size = sum(getsize(file_path) for file_path in output_file_paths)
+    return get_worker_count() > 1 and total_size > get_chunk_size()
+
+
+def split_into_chunks(output_file_paths, file_encoding):
+    """This method splits every output file in output_file_paths into chunks (as described in
+    find_chunk_boundaries) and returns a list of (file_path, start, end) tuples, in order."""
+
+    chunk_size = get_chunk_size()
+    chunks = []
+
+    for file_path in output_file_paths:
+        boundaries = find_chunk_boundaries(file_path, file_encoding, chunk_size)
+        chunks.extend((file_path, start, end) for start, end in zip(boundaries, boundaries[1:]))
+
+    return chunks
+
+
+def parse_chunks_in_pool(chunk_parser, chunks, file_encoding, progress_callback=None):
+    """This method calls chunk_parser (which must be a function defined at the top level of a
+    module, so that it can be called in another process) with the arguments (file_path,
+    file_encoding, start, end) for every chunk in chunks, in a pool of processes. Whenever a
+    chunk has been parsed, progress_callback (if it was provided) is called with the number of
+    bytes that have been parsed so far and the total number of bytes that need to be parsed.
+    This method returns the results of chunk_parser for every chunk, in the order of chunks."""
+
+    total_bytes = sum(end - start for _, start, end in chunks)
+    parsed_bytes = 0
+    results = [None] * len(chunks)
+
+    # Parse the chunks in a pool of processes, reporting progress as each chunk is parsed.
+    with ProcessPoolExecutor(max_workers=min(get_worker_count(), max(1, len(chunks)))) as executor:
+
+        futures = {executor.submit(chunk_parser, file_path, file_encoding, start, end): \
+            (chunk_index, end - start) for chunk_index, (file_path, start, end) in enumerate(chunks)}
+
+        for future in as_completed(futures):
+            chunk_index, chunk_bytes = futures[future]
+            results[chunk_index] = future.result()
+            parsed_bytes += chunk_bytes
+            if progress_callback is not None:
+                progress_callback(parsed_bytes, total_bytes)
+
+    return results
+
+
+def store_timestamper_output_parallel(output_file_paths, progress_callback=None):
+    """This method does the same thing as store_timestamper_output, but splits the output files
+    in output_file_paths into chunks and parses those chunks in a pool of processes, reporting
+    progress to progress_callback (if it was provided) as described in parse_chunks_in_pool.
+    This method returns a tuple of the form (header, consistent_h_m_s, notes_body)."""
+
+    file_encoding = classes.settings["output"]["file_encoding"]
+    chunks = split_into_chunks(output_file_paths, file_encoding)
+    results = parse_chunks_in_pool(parse_output_chunk, chunks, file_encoding, progress_callback)
+
+    # Combine the results from every chunk in their original order.
+    header, original_h_m_s, notes_body = [], [], []
+    for chunk_header, chunk_h_m_s, chunk_body in results:
+        header.extend(chunk_header)
+        original_h_m_s.extend(chunk_h_m_s)
+        notes_body.extend(chunk_body)
+
+    # Make the degree of precision of all [hours, minutes, seconds, subseconds]
+    # lists from the output consistent with the degree of precision
+    # of the most precise [hours, minutes, seconds, subseconds] list.
+    consistent_h_m_s = methods_output.make_timestamp_formats_consistent(original_h_m_s)
+
+    return header, consistent_h_m_s, notes_body
+
+
+def store_timestamper_output_batch(output_file_paths, progress_callback=None):
+    """This method returns the same result as store_timestamper_output for the output files in
+    output_file_paths, parsing them in parallel if they are large enough for that to be worthwhile.
+    progress_callback is used as in store_timestamper_output_parallel (if the output files are
+    parsed in this process, it is called once, after all of the output files have been parsed)."""
+
+    if should_parse_in_parallel(output_file_paths):
+        return store_timestamper_output_parallel(output_file_paths, progress_callback)
+
+    stored_output = methods_output.store_timestamper_output(output_file_paths)
+    if progress_callback is not None:
+        total_bytes = sum(getsize(file_path) for file_path in output_file_paths)
+        progress_callback(total_bytes, total_bytes)
+
+    return stored_output
+
+
+def index_output_chunk(file_path, file_encoding, start, end):
+    """This method finds the header lines and notes in the bytes from start (inclusive) to end
+    (exclusive) of the output file specified in file_path, as encoded with file_encoding, and
+    returns them as a TimeStamperNotesTable (see TimeStamperOutputReader.index_notes). This
+    method is executed in a separate process when output files are indexed in parallel."""
+
+    with TimeStamperOutputReader(file_path, file_encoding) as reader:
+        return reader.index_notes(start, end, on_header=start == 0)
+
+
+def index_output_notes_batch(file_path, progress_callback=None):
+    """This method finds the header lines and notes in the output file specified in file_path and
+    returns them as a TimeStamperNotesTable (see TimeStamperOutputReader.index_notes), without
+    decoding the output file. The output file is split into chunks that are indexed in parallel
+    if it is large enough for that to be worthwhile. progress_callback is used as described in
+    parse_chunks_in_pool (if the output file is indexed in this process, it is called once)."""
+
+    file_encoding = classes.settings["output"]["file_encoding"]
+
+    # If the output file is small, index it in this process.
+    if not should_parse_in_parallel([file_path]):
+        chunks = [(file_path, 0, getsize(file_path))]
+        results = [index_output_chunk(file_path, file_encoding, 0, chunks[0][2])]
+        if progress_callback is not None:
+            progress_callback(chunks[0][2], chunks[0][2])
+
+    # Otherwise, index the chunks of the output file in a pool of processes.
+    else:
+        chunks = split_into_chunks([file_path], file_encoding)
+        results = parse_chunks_in_pool(index_output_chunk, chunks, file_encoding, progress_callback)
+
+    # Combine the tables from every chunk in their original order.
+    notes_table = results[0]
+    for chunk_table in results[1:]:
+        notes_table.extend(chunk_table)
+
+    return notes_table
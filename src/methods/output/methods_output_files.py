@@ -0,0 +1,99 @@
+#-*- coding: utf-8 -*-
+"""This module stores methods for rewriting output files safely and efficiently."""
+
+from contextlib import contextmanager
+from os import close, fdopen, fsync, remove, replace
+from os.path import abspath, basename, dirname, exists
+from shutil import copymode
+from tempfile import mkstemp
+
+import classes
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+@contextmanager
+def rewrite_file_atomically(file_path, file_encoding=None):
+    """This method opens a temporary file in the same directory as the file specified in
+    file_path and yields it so that the new contents of the file can be written to it. Once
+    everything has been written, the temporary file replaces the original file in a single
+    step, so the file is never left half-written (if anything goes wrong while writing, the
+    original file is left untouched and the temporary file is removed). The handle to the
+    file held by the output writer should be closed before calling this method. The optional
+    argument file_encoding defaults to the "file_encoding" output setting."""
+
+    file_path = abspath(file_path)
+    file_encoding = file_encoding or classes.settings["output"]["file_encoding"]
+
+    # Create the temporary file next to the original file so that it can replace the original
+    # file without being copied (files can only be replaced atomically on the same drive).
+    temp_fd, temp_path = mkstemp(prefix=f".{basename(file_path)}.", suffix=".tmp", \
+        dir=dirname(file_path))
+
+    try:
+
+        try:
+            temp_file = fdopen(temp_fd, "w", encoding=file_encoding)
+        except Exception:
+            close(temp_fd)
+            raise
+
+        # Write the new contents of the file to the temporary file.
+        with temp_file:
+            yield temp_file
+            temp_file.flush()
+            if classes.settings["output"]["fsync"]:
+                fsync(temp_file.fileno())
+
+        # Give the temporary file the same permissions as the original file.
+        if exists(file_path):
+            copymode(file_path, temp_path)
+
+        # Replace the original file with the temporary file.
+        replace(temp_path, file_path)
+
+    # If anything went wrong, remove the temporary file and leave the original file alone.
+    except BaseException:
+        try:
+            remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_output_lines(out_file, lines, last_character):
+    """This method writes every line in lines (which may be any iterable of strings) to the
+    open file out_file. If last_character (the original last character of the output) is not
+    a new line, the final new line character is removed from the end of the last line."""
+
+    # Hold back the most recent line so that its final new line
+    # character can be removed if it turns out to be the last line.
+    previous_line = None
+
+    for line in lines:
+        if previous_line is not None:
+            out_file.write(previous_line)
+        previous_line = line
+
+    # If the last character of the output WAS NOT originally a new line, then
+    # erase the final new line character from the last line before writing it.
+    if previous_line is not None:
+        if last_character != "\n" and previous_line[-1:] == "\n":
+            previous_line = previous_line[:-1]
+        out_file.write(previous_line)
@@ -0,0 +1,209 @@
+#-*- coding: utf-8 -*-
+"""This module stores methods for merging several output files into a single timeline of notes.
+The output files are streamed through a heap keyed on the timestamps of their notes, so no
+output file ever needs to be held in memory in its entirety, however large it may be."""
+
+from bisect import bisect_right
+from contextlib import ExitStack
+from heapq import merge
+from itertools import chain, count
+from os import mkdir
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from classes.output.notes_table import TimeStamperNotesTable
+from classes.output.reader import TimeStamperOutputReader
+from classes.timing.timestamp import TimeStamperTimestamp
+import methods.macros.methods_macros_output as methods_output
+import methods.output.methods_output_batch as methods_batch
+import methods.output.methods_output_files as methods_files
+import methods.output.methods_output_sort as methods_sort
+from methods.timing import methods_timing_helper
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+def survey_output_files(output_file_paths, header_file):
+    """This method makes a single pass over every output file in output_file_paths, writing
+    their header lines to the open file header_file as they are found. This method returns
+    the precision code (see TimeStamperTimestamp) of the most precise timestamp in any of the
+    output files along with a list recording whether the notes in each output file are
+    already in order."""
+
+    precision = 0
+    is_sorted = []
+
+    for file_path in output_file_paths:
+
+        previous_centiseconds = -1
+        is_sorted.append(True)
+
+        for h_m_s, text in methods_output.iterate_timestamper_output([file_path]):
+
+            # Header lines are written out immediately.
+            if h_m_s is None:
+                header_file.write(text)
+                continue
+
+            # Record whether the timestamp of this note includes hours, minutes and subseconds.
+            precision = TimeStamperTimestamp.combine_precisions(\
+                (precision, methods_output.get_h_m_s_precision(h_m_s)))
+
+            # Record whether this note is out of order within its own output file.
+            centiseconds = methods_timing_helper.h_m_s_to_centiseconds(*h_m_s)
+            if centiseconds < previous_centiseconds:
+                is_sorted[-1] = False
+            previous_centiseconds = centiseconds
+
+    return precision, is_sorted
+
+
+def make_timestamp_format_consistent(h_m_s, note, precision):
+    """This method rewrites the timestamp at the beginning of note (whose [hours, minutes,
+    seconds, subseconds] list is h_m_s) so that it is as precise as the precision code
+    precision (as returned by survey_output_files), following the same rules as
+    make_timestamp_formats_consistent does for a list of timestamps (see make_h_m_s_precise).
+    The note is returned with its rewritten timestamp."""
+
+    consistent_timestamp = methods_timing_helper.h_m_s_to_timestamp(\
+        *methods_timing_helper.make_h_m_s_precise(h_m_s, precision))
+    return f"{consistent_timestamp}{note[note.find(']') + 1:]}"
+
+
+def stream_sorted_notes(file_path, file_index, is_sorted, temp_dir):
+    """This method returns an iterator over the notes in the output file specified in file_path
+    in the order of their timestamps, as (centiseconds, file_index, sequence, h_m_s, note) tuples.
+    If the notes in the output file are already in order (as indicated by is_sorted), they are
+    streamed straight from the output file. Otherwise, they are first sorted into runs on disk
+    in temp_dir, exactly as they would be when sorting a large output file, and then merged."""
+
+    # If the output file is already in order, stream its notes straight from the output file.
+    if is_sorted:
+        sequence = count()
+        return ((methods_timing_helper.h_m_s_to_centiseconds(*h_m_s), file_index, \
+            next(sequence), h_m_s, text) for h_m_s, text in \
+            methods_output.iterate_timestamper_output([file_path]) if h_m_s is not None)
+
+    # Otherwise, sort the notes into runs in a directory of their own (the header lines have
+    # already been written, so the copy of the header lines written here is not needed).
+    run_dir = join(temp_dir, f"runs_{file_index}")
+    mkdir(run_dir)
+    run_paths = methods_sort.spill_sorted_runs([file_path], run_dir, join(run_dir, "header.txt"))
+    run_paths = methods_sort.reduce_runs(run_paths, run_dir, 64)
+
+    # Merge the runs back together.
+    return ((centiseconds, file_index, sequence, read_h_m_s(text), text) for \
+        centiseconds, sequence, text in merge(*(methods_sort.read_run(path) for path in run_paths)))
+
+
+def read_h_m_s(note):
+    """This method returns the [hours, minutes, seconds, subseconds] list of the timestamp
+    at the beginning of note (which is assumed to begin with a valid timestamp)."""
+
+    return methods_timing_helper.timestamp_to_h_m_s(\
+        note[:note.find("]") + 1], pad=2, pad_subseconds=False)
+
+
+def merge_output_files(output_file_paths, destination_path):
+    """This method merges the notes from every output file in output_file_paths into a single
+    timeline of notes ordered by their timestamps and writes the header lines of every output
+    file followed by that timeline to destination_path. All timestamps in the timeline are
+    given the precision of the most precise timestamp in any of the output files. Notes with
+    identical timestamps are ordered by the position of their output files in output_file_paths
+    and then by their original order. The output files are streamed (rather than read into
+    memory), and destination_path is replaced atomically, so it may be one of the output files.
+    If the output files can be read through a memory map and are small enough to be sorted in
+    memory, they are merged through their notes tables (see merge_notes_tables). Otherwise,
+    they are streamed through a heap (see stream_merge_output_files). Both ways of merging
+    make timestamps consistent by the same rules (see make_h_m_s_precise)."""
+
+    if TimeStamperOutputReader.is_supported() \
+        and not methods_sort.should_sort_externally(output_file_paths):
+        merge_notes_tables(output_file_paths, destination_path)
+    else:
+        stream_merge_output_files(output_file_paths, destination_path)
+
+
+def stream_merge_output_files(output_file_paths, destination_path):
+    """This method does the same thing as merge_output_files, but streams the notes from every
+    output file in output_file_paths through a heap keyed on their timestamps (sorting the
+    notes of any output file that is not already in order into runs on disk first), so no
+    output file ever needs to be held in memory in its entirety, however large it may be."""
+
+    with TemporaryDirectory() as temp_dir:
+
+        # Survey the output files, setting the header lines aside.
+        header_path = join(temp_dir, "header.txt")
+        with open(header_path, "w", encoding="utf-8", newline="") as header_file:
+            precision, is_sorted = survey_output_files(output_file_paths, header_file)
+
+        # Merge the notes from every output file through a heap keyed on their timestamps.
+        merged_notes = merge(*(stream_sorted_notes(file_path, file_index, is_sorted[file_index], \
+            temp_dir) for file_index, file_path in enumerate(output_file_paths)))
+        consistent_notes = (make_timestamp_format_consistent(h_m_s, text, precision) \
+            for _, _, _, h_m_s, text in merged_notes)
+
+        # Write the header lines followed by the merged notes. As with the notes
+        # that are printed by this program, the final note does not end in a new line.
+        with open(header_path, "r", encoding="utf-8", newline="") as header_file, \
+            methods_files.rewrite_file_atomically(destination_path) as destination_file:
+            methods_files.write_output_lines(destination_file, \
+                chain(header_file, consistent_notes), None)
+
+
+def merge_notes_tables(output_file_paths, destination_path):
+    """This method does the same thing as merge_output_files, but indexes every output file in
+    output_file_paths as a TimeStamperNotesTable and merges the notes by sorting the combined
+    times of the notes in those tables. Each note is only decoded when it is written. The
+    output files must be readable by TimeStamperOutputReader (see is_supported)."""
+
+    # Index every output file and combine the tables, recording the
+    # row of the combined table at which each output file's notes begin.
+    notes_tables = [methods_batch.index_output_notes_batch(file_path) \
+        for file_path in output_file_paths]
+    merged_table, first_rows = TimeStamperNotesTable(), []
+    for notes_table in notes_tables:
+        first_rows.append(len(merged_table))
+        merged_table.extend(TimeStamperNotesTable(None, notes_table.offsets, \
+            notes_table.lengths, notes_table.centiseconds, notes_table.precisions))
+
+    # Since the notes of each output file follow the notes of the output files before it, a
+    # stable sort orders notes with identical timestamps by output file and then by position.
+    note_order = merged_table.get_sorted_order()
+    precision = merged_table.get_precision()
+
+    # The output files are closed before destination_path is replaced, since
+    # destination_path may be one of the output files that are being merged.
+    with methods_files.rewrite_file_atomically(destination_path) as destination_file, \
+        ExitStack() as readers_stack:
+
+        readers = [readers_stack.enter_context(TimeStamperOutputReader(file_path)) \
+            for file_path in output_file_paths]
+
+        def decode_note(row):
+            reader = readers[bisect_right(first_rows, row) - 1]
+            note = reader.decode(merged_table.offsets[row], merged_table.lengths[row])
+            return merged_table.reconcile_note(note, row, precision)
+
+        # Write the header lines of every output file followed by the merged notes. As with
+        # the notes that are printed by this program, the final note does not end in a new line.
+        header = chain.from_iterable(notes_table.iterate_header(reader) \
+            for notes_table, reader in zip(notes_tables, readers))
+        methods_files.write_output_lines(destination_file, \
+            chain(header, map(decode_note, note_order)), None)
@@ -0,0 +1,155 @@
+#-*- coding: utf-8 -*-
+"""This module stores methods for sorting the notes in output files that are too large to be
+sorted in memory. Notes are gathered into sorted runs which are spilled to temporary files,
+and those runs are then combined with a k-way merge that only holds one note per run."""
+
+from heapq import merge
+from itertools import chain, count
+from os.path import getsize, join
+from sys import getsizeof
+from tempfile import TemporaryDirectory
+
+import classes
+import methods.macros.methods_macros_output as methods_output
+import methods.output.methods_output_files as methods_files
+from methods.timing import methods_timing_helper
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+
+def get_memory_budget():
+    """This method returns the maximum number of bytes that should be used to hold
+    notes in memory while sorting, as specified in the "sort_memory_budget_mb" setting."""
+
+    return max(1, classes.settings["output"]["sort_memory_budget_mb"]) * 1048576
+
+
+def should_sort_externally(output_file_paths):
+    """This method determines whether the output files in output_file_paths are too large to
+    be sorted in memory (i.e., whether their combined size exceeds the memory budget)."""
+
+    return sum(getsize(file_path) for file_path in output_file_paths) > get_memory_budget()
+
+
+def write_run(run_path, run):
+    """This method writes a run of notes (a list of (centiseconds, sequence, note) tuples
+    that has already been sorted) to the temporary file specified in run_path. Each
+    note is preceded by a line containing its sort key and its length in characters."""
+
+    with open(run_path, "w", encoding="utf-8", newline="") as run_file:
+        for centiseconds, sequence, note in run:
+            run_file.write(f"{centiseconds} {sequence} {len(note)}\n{note}")
+
+
+def read_run(run_path):
+    """This method reads back a run that was written by write_run, yielding its
+    (centiseconds, sequence, note) tuples one at a time in their sorted order."""
+
+    with open(run_path, "r", encoding="utf-8", newline="") as run_file:
+        while True:
+            record_header = run_file.readline()
+            if not record_header:
+                break
+            centiseconds, sequence, note_length = record_header.split()
+            yield int(centiseconds), int(sequence), run_file.read(int(note_length))
+
+
+def spill_sorted_runs(output_file_paths, temp_dir, header_path):
+    """This method reads the notes from the output files in output_file_paths, gathers them into
+    runs no larger than the memory budget, sorts each run and writes each run to its own
+    temporary file in temp_dir. Header lines are written to the file specified in header_path
+    in the order in which they were found. This method returns a list of the paths to the runs."""
+
+    memory_budget = get_memory_budget()
+    run_paths, run, run_size = [], [], 0
+    sequence = count()
+
+    with open(header_path, "w", encoding="utf-8", newline="") as header_file:
+
+        for h_m_s, text in methods_output.iterate_timestamper_output(output_file_paths):
+
+            # Header lines do not get sorted, so they can be written out immediately.
+            if h_m_s is None:
+                header_file.write(text)
+                continue
+
+            # Add the note to the current run (the sequence number keeps notes
+            # with identical timestamps in the order in which they were found).
+            centiseconds = methods_timing_helper.h_m_s_to_centiseconds(*h_m_s)
+            run.append((centiseconds, next(sequence), text))
+            run_size += getsizeof(text) + 128
+
+            # If the current run has reached the memory budget, sort it and spill it to disk.
+            if run_size >= memory_budget:
+                run.sort()
+                run_paths.append(join(temp_dir, f"run_{len(run_paths)}.txt"))
+                write_run(run_paths[-1], run)
+                run, run_size = [], 0
+
+    # Sort and spill the final run.
+    if run:
+        run.sort()
+        run_paths.append(join(temp_dir, f"run_{len(run_paths)}.txt"))
+        write_run(run_paths[-1], run)
+
+    return run_paths
+
+
+def reduce_runs(run_paths, temp_dir, max_open_runs):
+    """This method merges groups of runs together until there are no more than max_open_runs
+    runs left, so that the final merge never needs to hold too many files open at once."""
+
+    while len(run_paths) > max_open_runs:
+
+        reduced_run_paths = []
+
+        for group_start in range(0, len(run_paths), max_open_runs):
+            group = run_paths[group_start:group_start + max_open_runs]
+            reduced_run_paths.append(join(temp_dir, f"run_{len(run_paths)}_{group_start}.txt"))
+            write_run(reduced_run_paths[-1], merge(*(read_run(path) for path in group)))
+
+        run_paths = reduced_run_paths
+
+    return run_paths
+
+
+def sort_output_externally(output_file_paths, destination_path, last_character, \
+    max_open_runs=64):
+    """This method sorts the notes from the output files in output_file_paths according to their
+    timestamps and writes the header lines followed by the sorted notes to destination_path,
+    without ever holding more notes in memory than the memory budget allows. As with the
+    in-memory sort, notes with identical timestamps keep their original order, and if
+    last_character (the original last character of the output) is not a new line, the
+    final new line character is removed from the end of the destination file. The
+    destination file is replaced atomically, so it is never left half-written."""
+
+    with TemporaryDirectory() as temp_dir:
+
+        # Split the output into sorted runs, setting the header lines aside.
+        header_path = join(temp_dir, "header.txt")
+        run_paths = spill_sorted_runs(output_file_paths, temp_dir, header_path)
+        run_paths = reduce_runs(run_paths, temp_dir, max_open_runs)
+
+        # Write the header lines followed by the merged notes, replacing the destination
+        # file in a single step once everything has been written.
+        with open(header_path, "r", encoding="utf-8", newline="") as header_file, \
+            methods_files.rewrite_file_atomically(destination_path) as destination_file:
+            merged_notes = (text for _, _, text in merge(*(read_run(path) for path in run_paths)))
+            methods_files.write_output_lines(destination_file, chain(header_file, merged_notes), \
+                last_character)
@@ -0,0 +1,315 @@
+#-*- coding: utf-8 -*-
+"""This module contains methods for parsing the timestamps of many lines at once. Rather than
+splitting each line and checking each of its values separately (as timestamp_to_h_m_s does),
+the timestamps are found with a single compiled pattern that is run over an entire buffer of
+bytes and are converted straight to centiseconds using lookup tables. If NumPy is installed,
+the bytes are scanned with NumPy instead and the results are returned as NumPy arrays
+(otherwise, they are returned as Python arrays). NumPy is not required by this program."""
+
+from array import array
+from re import MULTILINE, compile as compile_pattern
+
+from classes.timing.timestamp import TimeStamperTimestamp
+from methods.timing import methods_timing_helper
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Time Stamper: Run a timer and write automatically timestamped notes.
+# Copyright (C) 2022 Benjamin Fertig
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Contact: github.cqrde@simplelogin.com
+
+# The precision of a timestamp is described by a code whose lowest two bits hold the number
+# of subsecond digits and whose next two bits record whether minutes and hours were included
+# (these are the precision codes of TimeStamperTimestamp).
+PRECISION_SUBSECONDS = TimeStamperTimestamp.PRECISION_SUBSECONDS
+PRECISION_MINUTES = TimeStamperTimestamp.PRECISION_MINUTES
+PRECISION_HOURS = TimeStamperTimestamp.PRECISION_HOURS
+
+# This pattern matches a timestamp at the beginning of any line. The first alternative matches
+# the timestamps that this program writes (up to three fields of at most two digits separated
+# by colons, with an optional decimal). The second alternative matches anything else in square
+# brackets, which is then checked with timestamp_to_h_m_s so that the results always agree.
+TIMESTAMP_PATTERN = compile_pattern(\
+    rb"^\[(?:(?:(\d{0,2}):)?(?:(\d{0,2}):)?(\d{0,2})(?:\.(\d{0,2}))?\]|[^\]\n]*\])", MULTILINE)
+
+# A lookup table that classifies every byte as the end of a timestamp (0), a digit
+# (1), a colon (2), a decimal point (3) or anything else (4) when scanning with NumPy.
+if numpy is not None:
+    CHARACTER_CLASSES = numpy.full(256, 4, dtype=numpy.uint8)
+    CHARACTER_CLASSES[48:58], CHARACTER_CLASSES[58], CHARACTER_CLASSES[46] = 1, 2, 3
+
+# Lookup tables that convert the digits of a timestamp value (or its decimal) to an integer.
+DIGIT_VALUES = {b"": 0}
+DIGIT_VALUES.update({str(number).encode(): number for number in range(10)})
+DIGIT_VALUES.update({f"{number:02d}".encode(): number for number in range(100)})
+DECIMAL_VALUES = {b"": 0}
+DECIMAL_VALUES.update({str(number).encode(): number * 10 for number in range(10)})
+DECIMAL_VALUES.update({f"{number:02d}".encode(): number for number in range(100)})
+
+
+def parse_timestamp_match(match, file_encoding):
+    """This method converts a match of TIMESTAMP_PATTERN to a tuple of the form (centiseconds,
+    precision), where precision is a precision code as described at the top of this module. If
+    the match is not a valid timestamp (according to timestamp_to_h_m_s), this method returns
+    None. file_encoding is used to decode timestamps that are not in the usual format."""
+
+    first, second, seconds, decimal = match.groups()
+
+    # If the timestamp is not in the usual format, check it with timestamp_to_h_m_s.
+    if seconds is None:
+        h_m_s = methods_timing_helper.timestamp_to_h_m_s(\
+            match.group().decode(file_encoding, errors="replace"))
+        if h_m_s is None:
+            return None
+        precision = len(h_m_s[3]) if h_m_s[3] is not None else 0
+        precision |= PRECISION_MINUTES if h_m_s[1] is not None else 0
+        precision |= PRECISION_HOURS if h_m_s[0] is not None else 0
+        return methods_timing_helper.h_m_s_to_centiseconds(*h_m_s), precision
+
+    # If only one colon was found, the value before it holds the minutes (not the hours).
+    if second is None:
+        first, second = None, first
+
+    centiseconds = DIGIT_VALUES[first or b""] * 360000 + DIGIT_VALUES[second or b""] * 6000 \
+        + DIGIT_VALUES[seconds] * 100 + DECIMAL_VALUES[decimal or b""]
+
+    precision = len(decimal) if decimal else 0
+    precision |= PRECISION_MINUTES if second else 0
+    precision |= PRECISION_HOURS if first else 0
+
+    return centiseconds, precision
+
+
+def iterate_timestamps(buffer, start=0, end=None, file_encoding="utf-8"):
+    """This method finds every line in the bytes of buffer (which may be a bytes object, a
+    bytearray or a memory map) from start to end that begins with a valid timestamp, and yields
+    a tuple of the form (offset, centiseconds, precision) for each one, where offset is the
+    position in buffer at which the line begins. start should be the beginning of a line.
+    Lines that do not begin with "[" are skipped without being looked at individually."""
+
+    end = len(buffer) if end is None else end
+
+    for match in TIMESTAMP_PATTERN.finditer(buffer, start, end):
+        parsed_timestamp = parse_timestamp_match(match, file_encoding)
+        if parsed_timestamp is not None:
+            yield match.start(), parsed_timestamp[0], parsed_timestamp[1]
+
+
+def parse_timestamp_rows_vectorized(buffer, start, end, file_encoding):
+    """This method parses the timestamp at the beginning of every line in the bytes of buffer from
+    start to end using NumPy, and returns a tuple of four NumPy arrays with one row per line: the
+    position in buffer at which each line begins, the centiseconds of each timestamp, the precision
+    code of each timestamp and whether each line began with a valid timestamp. Rather than looking
+    at each line separately, the first few characters inside the brackets of every timestamp are
+    classified at once (as digits, colons, decimal points or anything else), and every group of
+    timestamps with the same arrangement of characters is then converted in a single step.
+    Timestamps that are unusually long or contain any other characters are checked individually."""
+
+    data = numpy.frombuffer(buffer, dtype=numpy.uint8)[start:end]
+    size = len(data)
+
+    # Find the beginning and end of every line (a final new line does not begin another line).
+    newlines = numpy.flatnonzero(data == 10)
+    line_starts = numpy.concatenate(([0], newlines + 1))
+    if line_starts[-1] >= size:
+        line_starts = line_starts[:-1]
+    line_ends = numpy.concatenate((newlines, [size]))[:len(line_starts)]
+
+    centiseconds = numpy.zeros(len(line_starts), dtype=numpy.int64)
+    precisions = numpy.zeros(len(line_starts), dtype=numpy.int8)
+    valid = numpy.zeros(len(line_starts), dtype=numpy.bool_)
+
+    # Find the lines that begin with an opening bracket and have a closing bracket later on.
+    rows = numpy.flatnonzero(data[line_starts] == 91) if len(line_starts) else line_starts
+    closing_brackets = numpy.flatnonzero(data == 93)
+    closing_index = numpy.searchsorted(closing_brackets, line_starts[rows])
+    has_closing_bracket = closing_index < len(closing_brackets)
+    closing_positions = numpy.full(len(rows), size, dtype=numpy.int64)
+    closing_positions[has_closing_bracket] = closing_brackets[closing_index[has_closing_bracket]]
+    has_closing_bracket &= closing_positions < line_ends[rows]
+    rows, closing_positions = rows[has_closing_bracket], closing_positions[has_closing_bracket]
+    timestamp_lengths = closing_positions - line_starts[rows] - 1
+
+    # Timestamps in the usual format are never longer than 11 characters.
+    is_short = timestamp_lengths <= 11
+    rows_to_check = [rows[~is_short]]
+    rows, timestamp_lengths = rows[is_short], timestamp_lengths[is_short]
+
+    # Classify the characters inside the brackets of every timestamp.
+    columns = numpy.arange(11)
+    window = data[numpy.minimum(line_starts[rows, None] + 1 + columns, max(0, size - 1))]
+    character_classes = CHARACTER_CLASSES[window]
+    character_classes[columns >= timestamp_lengths[:, None]] = 0
+    shape_keys = character_classes.astype(numpy.int64) @ (5 ** columns)
+    shapes, shape_indices = numpy.unique(shape_keys, return_inverse=True)
+
+    for shape_index, shape_key in enumerate(shapes.tolist()):
+
+        # Find the timestamps with this arrangement of characters.
+        if len(shapes) == 1:
+            shape_rows, shape_window = rows, window
+        else:
+            in_shape = shape_indices == shape_index
+            shape_rows, shape_window = rows[in_shape], window[in_shape]
+
+        # Build an example timestamp with this arrangement of characters.
+        shape = [(shape_key // 5 ** column) % 5 for column in range(11)]
+        example = b"".join((b"", b"0", b":", b".", b"?")[char_class] for char_class in shape)
+        match = TIMESTAMP_PATTERN.match(b"[" + example + b"]")
+
+        # If timestamps with this arrangement are not in the usual format, check them individually.
+        if 4 in shape or match is None or match.group(3) is None:
+            rows_to_check.append(shape_rows)
+            continue
+
+        # Add up the digits in each of the values of the timestamp.
+        values = []
+        for group_number in range(1, 5):
+            value = numpy.zeros(len(shape_rows), dtype=numpy.int64)
+            if match.start(group_number) != -1:
+                for column in range(match.start(group_number) - 1, match.end(group_number) - 1):
+                    value = value * 10 + (shape_window[:, column].astype(numpy.int64) - 48)
+            if group_number == 4 and match.end(4) - match.start(4) == 1:
+                value *= 10
+            values.append(value)
+
+        # If only one colon was found, the value before it holds the minutes (not the hours).
+        if match.group(2) is None:
+            values[0], values[1] = numpy.zeros(len(shape_rows), dtype=numpy.int64), values[0]
+
+        centiseconds[shape_rows] = \
+            values[0] * 360000 + values[1] * 6000 + values[2] * 100 + values[3]
+        precisions[shape_rows] = parse_timestamp_match(match, file_encoding)[1]
+        valid[shape_rows] = True
+
+    # Check any timestamps that are not in the usual format individually.
+    for row in numpy.concatenate(rows_to_check).tolist():
+        match = TIMESTAMP_PATTERN.match(buffer, start + int(line_starts[row]))
+        parsed_timestamp = parse_timestamp_match(match, file_encoding) if match else None
+        if parsed_timestamp is not None:
+            centiseconds[row], precisions[row] = parsed_timestamp
+            valid[row] = True
+
+    return line_starts + start, centiseconds, precisions, valid
+
+
+def find_notes(buffer, start=0, end=None, file_encoding="utf-8"):
+    """This method finds every line in the bytes of buffer from start to end that begins with a
+    valid timestamp (i.e., that begins a note) and returns a tuple of four Python arrays: the
+    position in buffer at which each note begins, the length of each note (up to the beginning
+    of the next note or end), the centiseconds of the timestamp of each note and the precision
+    code of the timestamp of each note. start should be the beginning of a line."""
+
+    end = len(buffer) if end is None else end
+
+    # If NumPy is installed, parse every line at once.
+    if numpy is not None:
+        line_starts, centiseconds, precisions, valid = \
+            parse_timestamp_rows_vectorized(buffer, start, end, file_encoding)
+        note_offsets = line_starts[valid].astype(numpy.int64)
+        note_lengths = numpy.diff(numpy.append(note_offsets, end))
+        return array("q", note_offsets.tobytes()), array("q", note_lengths.tobytes()), \
+            array("q", centiseconds[valid].tobytes()), array("b", precisions[valid].tobytes())
+
+    # Otherwise, find the notes with the compiled pattern.
+    note_offsets, note_centiseconds, note_precisions = array("q"), array("q"), array("b")
+    for offset, timestamp_centiseconds, precision in \
+        iterate_timestamps(buffer, start, end, file_encoding):
+        note_offsets.append(offset)
+        note_centiseconds.append(timestamp_centiseconds)
+        note_precisions.append(precision)
+
+    note_lengths = array("q", (next_offset - offset for offset, next_offset \
+        in zip(note_offsets, note_offsets[1:] + array("q", [end]))))
+
+    return note_offsets, note_lengths, note_centiseconds, note_precisions
+
+
+def parse_timestamp_buffer(buffer, file_encoding="utf-8"):
+    """This method parses the timestamp at the beginning of every line in buffer (a bytes-like
+    object containing lines separated by b"\\n") and returns a tuple of three arrays with one
+    row per line: the centiseconds of each timestamp (int64), the precision code of each
+    timestamp (int8) and whether each line actually began with a valid timestamp (bool).
+    The values of rows that are not valid are 0. If NumPy is installed, NumPy arrays are
+    returned. Otherwise, Python arrays are returned (with a bytearray for validity)."""
+
+    # If NumPy is installed, parse every line at once.
+    if numpy is not None:
+        return parse_timestamp_rows_vectorized(buffer, 0, len(buffer), file_encoding)[1:]
+
+    # There is one row for every line (a final new line does not begin another line).
+    row_count = buffer.count(b"\n")
+    if buffer and buffer[-1:] != b"\n":
+        row_count += 1
+
+    centiseconds = array("q", bytes(8 * row_count))
+    precisions = array("b", bytes(row_count))
+    valid = bytearray(row_count)
+
+    # Work out the row of each timestamp from the number of new lines before it.
+    row, counted_to = 0, 0
+    for offset, timestamp_centiseconds, precision in \
+        iterate_timestamps(buffer, file_encoding=file_encoding):
+        row += buffer.count(b"\n", counted_to, offset)
+        counted_to = offset
+        centiseconds[row] = timestamp_centiseconds
+        precisions[row] = precision
+        valid[row] = 1
+
+    return centiseconds, precisions, valid
+
+
+def parse_timestamp_lines(lines, file_encoding="utf-8"):
+    """This method parses the timestamp at the beginning of every line in lines (an iterable
+    of strings or bytes, which may end in a new line) and returns the same three arrays as
+    parse_timestamp_buffer, with one row for each line."""
+
+    centiseconds, precisions, valid = array("q"), array("b"), bytearray()
+
+    for line in lines:
+
+        if isinstance(line, str):
+            line = line.encode(file_encoding)
+
+        match = TIMESTAMP_PATTERN.match(line)
+        parsed_timestamp = parse_timestamp_match(match, file_encoding) if match else None
+
+        if parsed_timestamp is None:
+            centiseconds.append(0)
+            precisions.append(0)
+            valid.append(0)
+        else:
+            centiseconds.append(parsed_timestamp[0])
+            precisions.append(parsed_timestamp[1])
+            valid.append(1)
+
+    return convert_arrays(centiseconds, precisions, valid)
+
+
+def convert_arrays(centiseconds, precisions, valid):
+    """This method converts the arrays of centiseconds, precision codes and validity flags
+    to NumPy arrays (without copying them) if NumPy is installed. Otherwise, the arrays
+    are returned as they are."""
+
+    if numpy is None:
+        return centiseconds, precisions, valid
+
+    return numpy.frombuffer(centiseconds, dtype=numpy.int64), \
+        numpy.frombuffer(precisions, dtype=numpy.int8), numpy.frombuffer(valid, dtype=numpy.bool_)
@@ -6,6 +6,7 @@ from fractions import Fraction
 from tkinter import NORMAL
 
 import classes
+import classes.timing.timestamp as timing_timestamp
 
 # Time Stamper: Run a timer and write automatically timestamped notes.
 # Copyright (C) 2022 Benjamin Fertig
@@ -26,16 +27,6 @@ import classes
 # Contact: github.cqrde@simplelogin.com
 
 
-def attempt_media_player_release():
-    """This method tries to release the current media player. If this method
-    is unable to release the current media player, then nothing will happen."""
-
-    try:
-        classes.time_stamper.media_player.release()
-    except (AttributeError, OSError):
-        pass
-
-
 def make_playback_button_images_visible():
     """This method makes the images for the play, rewind and fast-forward buttons visible."""
 
@@ -261,6 +252,43 @@ def h_m_s_to_seconds(hours=0, minutes=0, seconds=0, subseconds=0):
         int(seconds or 0) + (int(subseconds or 0) / 100)
 
 
+def h_m_s_to_centiseconds(hours=None, minutes=None, seconds=None, subseconds=None):
+    """This method converts a time in hours, minutes, seconds and subseconds (which would
+    preferably be strings, as returned by timestamp_to_h_m_s) to an integer number of
+    centiseconds. Subseconds are interpreted as the digits following a decimal point, so
+    "5" and "50" both represent 50 centiseconds. Because the result is exact, it can be used
+    to order timestamps of differing precision without first making their formats consistent."""
+
+    return (int(hours or 0) * 360000) + (int(minutes or 0) * 6000) + \
+        (int(seconds or 0) * 100) + int(pad_number(subseconds, 2, False)[:2])
+
+
+def make_h_m_s_precise(h_m_s, precision):
+    """This method returns a copy of h_m_s (an [hours, minutes, seconds, subseconds] list, as
+    returned by timestamp_to_h_m_s) that is at least as precise as the precision code precision
+    (see TimeStamperTimestamp). The hours and the minutes are set to "00" if they are missing
+    but the precision includes them, and the subseconds are padded with zeros to the number of
+    subsecond digits in the precision. These are the rules by which the timestamps of notes
+    are made consistent when notes are reconciled or merged."""
+
+    hours, minutes, seconds, subseconds = h_m_s
+    timestamp_class = timing_timestamp.TimeStamperTimestamp
+
+    # Include the hours and the minutes if the precision includes them.
+    if precision & timestamp_class.PRECISION_HOURS and hours is None:
+        hours = "00"
+    if precision & (timestamp_class.PRECISION_HOURS | timestamp_class.PRECISION_MINUTES) \
+        and minutes is None:
+        minutes = "00"
+
+    # Make the decimal as precise as the precision requires.
+    subsecond_digits = precision & timestamp_class.PRECISION_SUBSECONDS
+    if subsecond_digits > 0 and (subseconds is None or len(subseconds) < subsecond_digits):
+        subseconds = pad_number(subseconds if subseconds else "0", subsecond_digits, False)
+
+    return [hours, minutes, seconds, subseconds]
+
+
 def h_m_s_to_timestamp(hours=None, minutes=None, \
     seconds=None, subseconds=None, include_brackets=True):
     """This method converts a time in hours, minutes, seconds and subseconds to a timestamp. All
@@ -320,30 +348,12 @@ def h_m_s_to_timestamp(hours=None, minutes=None, \
 def seconds_to_h_m_s(seconds_exact, pad=0, include_subseconds=True):
     """This method converts a time in seconds to a time in hours, minutes, seconds and
     subseconds. The optional integer argument pad, which is set to zero by default, provides
-    the length to which the returned hours, minutes, seconds and subseconds should be padded."""
-
-    # Convert the seconds to hours, minutes, seconds and subseconds.
-    hours = int(seconds_exact // 3600)
-    seconds_exact = round(seconds_exact - (hours * 3600), 2)
-    minutes = int(seconds_exact // 60)
-    seconds_exact = round(seconds_exact - (minutes * 60), 2)
-    seconds = int(seconds_exact)
-    if include_subseconds:
-        seconds_exact = round((seconds_exact % 1) * 100, 0)
-        subseconds = int(seconds_exact)
-
-    # Pad the timer's values with zeros if a pad value is passed as an argument.
-    if pad > 0:
-        hours = pad_number(hours, pad, True)
-        minutes = pad_number(minutes, pad, True)
-        seconds = pad_number(seconds, pad, True)
-        if include_subseconds:
-            subseconds = pad_number(subseconds, pad, True)
-
-    if include_subseconds:
-        return [str(hours), str(minutes), str(seconds), str(subseconds)]
+    the length to which the returned hours, minutes, seconds and subseconds should be padded.
+    The time is rounded to the nearest centisecond once and then split using whole numbers."""
 
-    return [str(hours), str(minutes), str(seconds)]
+    return list(timing_timestamp.split_centiseconds(\
+        timing_timestamp.TimeStamperTimestamp.from_seconds(seconds_exact).centiseconds, \
+        pad, include_subseconds))
 
 
 def seconds_to_timestamp(seconds, pad=0, force_include_hours=True, \
@@ -352,11 +362,12 @@ def seconds_to_timestamp(seconds, pad=0, force_include_hours=True, \
     the following format: [hours:minutes:seconds:subseconds]"""
 
     # Convert the seconds into hours, minutes, seconds and (potentially) subseconds.
-    h_m_s = seconds_to_h_m_s(seconds, pad=pad, include_subseconds=include_subseconds)
+    centiseconds = timing_timestamp.TimeStamperTimestamp.from_seconds(seconds).centiseconds
+    h_m_s = list(timing_timestamp.split_centiseconds(centiseconds, pad, include_subseconds))
 
     # If the time is under one hour and it was specified that the
     # inclusion of hours should not be forced, omit the hours.
-    if seconds < 3600 and not force_include_hours:
+    if centiseconds < 360000 and not force_include_hours:
         h_m_s[0] = None
 
     # Convert the time to a timestamp and return it.